@@ -0,0 +1,409 @@
+"""Persistent cache of module results.
+
+Results are stored per module, keyed by the path and content of the module, the pydoctest version and
+the configuration values that change results. Each result also records the project modules it depends on,
+those it imports and those its docstring types were resolved from, and is invalidated when any of them change.
+Cached results are replayed without importing the module.
+
+Results of functions are also stored per module in FUNCTIONS_DIRECTORY_NAME, so when a module changed, only the functions
+that changed are validated again. They are keyed by the source and docstring of the function, its signature and the
+environment of the module, i.e. its source without function definitions and the project modules it depends on.
+
+The cache is capped in size, evicting the least recently used results first.
+"""
+
+import os
+import ast
+import glob
+import pickle
+import hashlib
+
+from types import FunctionType, ModuleType
+from typing import Any, Dict, List, Optional, Set
+
+from pydoctest import logging
+from pydoctest.version import VERSION
+from pydoctest.configuration import Configuration
+from pydoctest.dependencies import ImportGraph
+from pydoctest.exceptions import UnknownTypeException
+from pydoctest.validation import FunctionDefinition, FunctionResultCache, FunctionValidationResult, ModuleValidationResult, Range, ResultType
+
+FUNCTIONS_DIRECTORY_NAME = 'functions'
+
+__pydoctest_fingerprint: Optional[str] = None
+
+
+def get_pydoctest_fingerprint() -> str:
+    """Returns a hash of the pydoctest version and source, so results from other versions are never replayed.
+    The source is included so a development checkout does not replay results of older code.
+
+    Returns:
+        str: The fingerprint.
+    """
+    global __pydoctest_fingerprint
+    if __pydoctest_fingerprint is None:
+        digest = hashlib.sha256(VERSION.encode())
+        package_directory = os.path.dirname(os.path.abspath(__file__))
+        for path in sorted(glob.glob(os.path.join(package_directory, '**', '*.py'), recursive=True)):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        __pydoctest_fingerprint = digest.hexdigest()
+    return __pydoctest_fingerprint
+
+
+def get_file_hash(path: str) -> Optional[str]:
+    """Returns the hash of the file content.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        Optional[str]: The hash, or None if the file could not be read.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def dump_without_functions(node: Any) -> str:
+    """Returns a dump of the node like ast.dump, leaving out function definitions.
+
+    Args:
+        node (Any): A node, a list of nodes or a field value.
+
+    Returns:
+        str: The dump.
+    """
+    if isinstance(node, ast.AST):
+        fields = ', '.join(f"{name}={dump_without_functions(value)}" for name, value in ast.iter_fields(node))
+        return f"{type(node).__name__}({fields})"
+    if isinstance(node, list):
+        return f"[{', '.join(dump_without_functions(n) for n in node if not isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)))}]"
+    return repr(node)
+
+
+def get_environment_hash(tree: ast.Module) -> str:
+    """Returns a hash of the module without its function definitions, i.e. the names and imports types are resolved from.
+    Line numbers are not included, so moving code does not change it.
+
+    Args:
+        tree (ast.Module): The parsed module.
+
+    Returns:
+        str: The hash.
+    """
+    return hashlib.sha256(dump_without_functions(tree).encode()).hexdigest()
+
+
+class FunctionCache(FunctionResultCache):
+    def __init__(self, environment_hash: Optional[str], entries: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Creates a cache of the function results of a module.
+
+        Args:
+            environment_hash (Optional[str]): Hash of what types in the module are resolved from, see get_environment_hash.
+                If None, nothing is cached.
+            entries (Optional[Dict[str, Dict[str, Any]]], optional): The results stored by an earlier run, by key.
+        """
+        self.environment_hash = environment_hash
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        # The entries of the functions seen since, so removed functions are not kept
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, definition: FunctionDefinition) -> Optional[str]:
+        """Returns the key of the function result.
+
+        Args:
+            definition (FunctionDefinition): The function.
+
+        Returns:
+            Optional[str]: The key, or None if the function can not be cached.
+        """
+        if self.environment_hash is None:
+            return None
+        try:
+            key = '\n'.join([ definition.mode, definition.get_source(), definition.get_docstring() or '', str(definition.get_signature()), self.environment_hash ])
+        except (OSError, TypeError, ValueError, UnknownTypeException):
+            return None
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, definition: FunctionDefinition, fn: FunctionType, module_type: ModuleType) -> Optional[FunctionValidationResult]:
+        """Returns the cached result of the function, if it has not changed since it was stored.
+        Ranges are stored relative to the function, so results are reused when the function moved.
+
+        Args:
+            definition (FunctionDefinition): The function to look up.
+            fn (FunctionType): The function (or a stand-in for it) stored on the result.
+            module_type (ModuleType): The module from which the function was extracted.
+
+        Returns:
+            Optional[FunctionValidationResult]: The result, if cached.
+        """
+        key = self.get_key(definition)
+        if key is None or key not in self.entries:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry = self.entries[key]
+        self.results[key] = entry
+
+        result = FunctionValidationResult(fn, module_type)
+        result.result = ResultType(entry['result'])
+        result.fail_reason = entry['fail_reason']
+        result.mode = entry['mode']
+        result.type_paths = entry['type_paths']
+        if entry['range'] is not None:
+            first_line = definition.get_first_line()
+            start_line, end_line, start_character, end_character = entry['range']
+            result.range = Range(first_line + start_line, first_line + end_line, start_character, end_character)
+        return result
+
+    def store(self, definition: FunctionDefinition, result: FunctionValidationResult) -> None:
+        """Stores the result of validating the function. It is written to disk by save.
+
+        Args:
+            definition (FunctionDefinition): The function that was validated.
+            result (FunctionValidationResult): The result of validating the function.
+        """
+        key = self.get_key(definition)
+        if key is None:
+            return
+
+        relative_range = None
+        if result.range is not None:
+            first_line = definition.get_first_line()
+            relative_range = (result.range.start_line - first_line, result.range.end_line - first_line, result.range.start_character, result.range.end_character)
+
+        self.results[key] = {
+            'result': int(result.result),
+            'fail_reason': result.fail_reason,
+            'mode': result.mode,
+            'type_paths': result.type_paths,
+            'range': relative_range
+        }
+
+    def is_changed(self) -> bool:
+        """Returns whether the functions seen differ from the functions loaded, so the cache has to be saved.
+
+        Returns:
+            bool: If the cache changed.
+        """
+        return self.results.keys() != self.entries.keys()
+
+
+class ResultCache():
+    def __init__(self, config: Configuration) -> None:
+        """Creates a cache of module results in the cache directory of the configuration.
+
+        Args:
+            config (Configuration): The configuration in use.
+        """
+        self.directory = config.get_cache_directory()
+        self.max_size = config.cache_max_size_mb * 1024 * 1024
+        self.configuration_hash = config.get_validation_hash()
+        self.hits = 0
+        self.misses = 0
+        self.import_graph = ImportGraph(config.working_directory)
+        self.__file_hashes: Dict[str, Optional[str]] = {}
+
+    def get_file_hash(self, path: str) -> Optional[str]:
+        """Returns the hash of the file content, reading each file once per run.
+
+        Args:
+            path (str): Path to the file.
+
+        Returns:
+            Optional[str]: The hash, or None if the file could not be read.
+        """
+        if path not in self.__file_hashes:
+            self.__file_hashes[path] = get_file_hash(path)
+        return self.__file_hashes[path]
+
+    def get_dependencies(self, module_path: str, result: ModuleValidationResult) -> Dict[str, Optional[str]]:
+        """Returns the project modules the result depends on, with the hashes of their content.
+
+        Args:
+            module_path (str): Path to a module.
+            result (ModuleValidationResult): The result of validating the module.
+
+        Returns:
+            Dict[str, Optional[str]]: The hash of each module, by path.
+        """
+        paths: Set[str] = set(self.import_graph.get_dependencies(module_path))
+        function_results = result.function_results + [r for c_r in result.class_results for r in c_r.function_results]
+        for function_result in function_results:
+            paths.update(p for p in function_result.type_paths if self.import_graph.is_project_file(p))
+        paths.discard(os.path.abspath(module_path))
+        return { path: self.get_file_hash(path) for path in sorted(paths) }
+
+    def get_key(self, module_path: str) -> Optional[str]:
+        """Returns the key of the module result.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            Optional[str]: The key, or None if the module could not be read.
+        """
+        content_hash = self.get_file_hash(os.path.abspath(module_path))
+        if content_hash is None:
+            return None
+
+        key = '\n'.join([ os.path.abspath(module_path), content_hash, get_pydoctest_fingerprint(), self.configuration_hash ])
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get_entry_path(self, key: str) -> str:
+        """Returns the path of the file storing the result.
+
+        Args:
+            key (str): The key of the result.
+
+        Returns:
+            str: The path.
+        """
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, module_path: str) -> Optional[ModuleValidationResult]:
+        """Returns the cached result of the module, if neither the module nor its dependencies have changed
+        since it was stored.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            Optional[ModuleValidationResult]: The result, if cached.
+        """
+        key = self.get_key(module_path)
+        if key is None:
+            return None
+
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            self.misses += 1
+            return None
+
+        for path, content_hash in entry['dependencies'].items():
+            if self.get_file_hash(path) != content_hash:
+                logging.log(f'Dependency changed for module: {module_path} - dependency: {path}')
+                self.misses += 1
+                return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        result = entry['result']
+
+        self.hits += 1
+        logging.log(f'Using cached result for module: {module_path}')
+        return result
+
+    def store(self, module_path: str, result: ModuleValidationResult) -> None:
+        """Stores the result of the module, along with the modules it depends on. The result is detached from the module.
+
+        Args:
+            module_path (str): Path to a module.
+            result (ModuleValidationResult): The result of validating the module.
+        """
+        key = self.get_key(module_path)
+        if key is None:
+            return
+
+        entry = { 'dependencies': self.get_dependencies(module_path, result), 'result': result }
+        result.detach()
+        entry_path = self.get_entry_path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{entry_path}.{os.getpid()}", 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(f"{entry_path}.{os.getpid()}", entry_path)
+        except OSError as e:
+            logging.log(f'Failed to cache result for module: {module_path} - error: {str(e)}')
+
+    def evict(self) -> None:
+        """Removes the least recently used results until the cache is within its size limit.
+        """
+        entries: List[os.DirEntry] = []
+        for directory in [self.directory, os.path.join(self.directory, FUNCTIONS_DIRECTORY_NAME)]:
+            try:
+                entries.extend(e for e in os.scandir(directory) if e.name.endswith('.pickle'))
+            except OSError:
+                pass
+
+        sizes: Dict[str, int] = { e.path: e.stat().st_size for e in entries }
+        total_size = sum(sizes.values())
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(entry.path)
+                total_size -= sizes[entry.path]
+            except OSError:
+                pass
+
+    def get_function_cache_path(self, module_path: str) -> str:
+        """Returns the path of the file storing the function results of the module.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            str: The path.
+        """
+        key = '\n'.join([ os.path.abspath(module_path), get_pydoctest_fingerprint(), self.configuration_hash ])
+        return os.path.join(self.directory, FUNCTIONS_DIRECTORY_NAME, f"{hashlib.sha256(key.encode()).hexdigest()}.pickle")
+
+    def load_function_cache(self, module_path: str) -> FunctionCache:
+        """Loads the function results of the module stored by the last run. The environment includes the
+        project modules the module depends on.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            FunctionCache: The function cache.
+        """
+        environment_hash = None
+        try:
+            with open(module_path, 'rb') as f:
+                tree = ast.parse(f.read(), filename=module_path)
+            digest = hashlib.sha256(get_environment_hash(tree).encode())
+            for path in self.import_graph.get_dependencies(module_path):
+                digest.update(f"{path}:{self.get_file_hash(path)}".encode())
+            environment_hash = digest.hexdigest()
+        except (OSError, SyntaxError, ValueError):
+            pass
+
+        entries = None
+        try:
+            with open(self.get_function_cache_path(module_path), 'rb') as f:
+                entries = pickle.load(f)
+        except Exception:
+            pass
+        return FunctionCache(environment_hash, entries)
+
+    def save_function_cache(self, module_path: str, function_cache: FunctionCache) -> None:
+        """Writes the function results of the module, if they changed.
+
+        Args:
+            module_path (str): Path to a module.
+            function_cache (FunctionCache): The function cache.
+        """
+        if not function_cache.is_changed():
+            return
+        path = self.get_function_cache_path(module_path)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.{os.getpid()}", 'wb') as f:
+                pickle.dump(function_cache.results, f)
+            os.replace(f"{path}.{os.getpid()}", path)
+        except OSError as e:
+            logging.log(f'Failed to cache function results for module: {module_path} - error: {str(e)}')
@@ -1,14 +1,14 @@
 import os
 import sys
 import json
+import hashlib
 from typing import Any, Dict, List, Optional
 from enum import IntEnum
 
 from pydoctest.logging import log
 from pydoctest.parsers.parser import Parser
-from pydoctest.parsers.google_parser import GoogleParser
-from pydoctest.parsers.numpy_parser import NumpyParser
-from pydoctest.parsers.sphinx_parser import SphinxParser
+from pydoctest.parsers.registry import PARSERS, get_parser
+from pydoctest.utilities import pattern_matches
 
 
 class Verbosity(IntEnum):
@@ -17,11 +17,25 @@ class Verbosity(IntEnum):
     SHOW_ALL = 2
 
 
-PARSERS = {
-    'google': GoogleParser,
-    'numpy': NumpyParser,
-    'sphinx': SphinxParser
-}
+# Directory in the working directory to store cached results in, unless configured
+CACHE_DIRECTORY_NAME = '.pydoctest_cache'
+
+# File in the cache directory to save the symbol index in
+SYMBOL_INDEX_FILE_NAME = 'symbols.json'
+
+# File in the cache directory to save the modules imported by workers in, see preload_observed_modules
+PRELOAD_FILE_NAME = 'preload.json'
+
+# Configuration values which change the result of validating a module, used for caching results
+VALIDATION_KEYS = [
+    'parser', 'parser_paths', 'mode', 'fail_on_missing_docstring', 'fail_on_missing_summary', 'fail_on_raises_section',
+    'exclude_classes', 'exclude_methods', 'exclude_functions', 'type_search_limit', 'cache_symbol_index',
+    'import_types'
+]
+
+# 'import' executes modules to validate them, 'static' only parses their source.
+# 'hybrid' parses them, and only imports modules with types that could not be resolved statically.
+MODES = [ 'import', 'static', 'hybrid' ]
 
 
 class Configuration():
@@ -40,6 +54,15 @@ class Configuration():
         # Doctype parser to use, defaults to Google
         self.parser = "google"
 
+        # Parsers to use for modules matching the patterns instead, e.g. { "legacy/**/*.py": "sphinx" }. The first matching pattern is used.
+        self.parser_paths: Dict[str, str] = {}
+
+        # How modules are loaded for validation, see MODES
+        self.mode = "import"
+
+        # Number of processes to validate modules with, 0 means the number of CPUs
+        self.jobs = 0
+
         # Verbosity of reporter, currently only used by text-reporter
         self.verbosity = Verbosity.SHOW_FAILED
 
@@ -61,6 +84,46 @@ class Configuration():
         # List of patterns to exclude functions from being analyzed by
         self.exclude_functions: List[str] = []
 
+        # Cache results of modules between runs, and replay them if the module is unchanged. Everything pydoctest
+        # stores between runs, e.g. timings and the symbol index, is kept in the cache directory and requires this.
+        self.cache = False
+
+        # Directory to store cached results in, defaults to .pydoctest_cache in the working directory
+        self.cache_directory = ""
+
+        # Maximum size of the cache, the least recently used results are removed when exceeded
+        self.cache_max_size_mb = 100
+
+        # Maximum number of modules to search from each module, for types the module does not import
+        self.type_search_limit = 1000
+
+        # Save where the types found by searching are defined, so later runs do not have to search for them
+        self.cache_symbol_index = False
+
+        # Import modules named by docstring types, e.g. "numpy.ndarray". If disabled, types are only resolved from modules already imported
+        self.import_types = True
+
+        # Modules with at least this many docstrings have them split in one batch before validating, 0 disables batching
+        self.batch_parse_threshold = 500
+
+        # Modules to import before starting parallel workers, which then share them instead of importing them each, e.g. [ "numpy" ]
+        self.preload_modules: List[str] = []
+
+        # Also preload the modules outside the project, which the workers of the previous run imported
+        self.preload_observed_modules = False
+
+        # Parallel workers are replaced after validating this many modules, 0 means never
+        self.worker_max_modules = 0
+
+        # Parallel workers are replaced when using more memory than this, in MB, 0 means no limit
+        self.worker_max_memory_mb = 0
+
+        # Modules taking longer than this to import and validate, in seconds, are interrupted and failed, 0 means no limit
+        self.module_timeout = 0.0
+
+        # Remove the modules imported while validating each module after validating it, which validates modules in one process
+        self.isolate_modules = False
+
     @staticmethod
     def get_default_configuration(root_dir: Optional[str] = None) -> 'Configuration':
         """Returns a configuration with default values.
@@ -115,15 +178,85 @@ class Configuration():
         return obj
 
     def get_parser(self) -> Parser:
-        """Checks if the desired Parser exists and returns it.
+        """Checks if the desired Parser exists and returns it, see pydoctest.parsers.registry.
+        Raises an Exception if parser from Configuration doesn't exist.
+
+        Returns:
+            Parser: A supported Parser, shared within the process.
+        """
+        return get_parser(self.parser)
+
+    def get_parser_for_path(self, module_path: str) -> Parser:
+        """Returns the parser of the first pattern in parser_paths matching the module, or the configured parser.
+        Raises an Exception if the parser doesn't exist.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            Parser: A supported Parser, shared within the process.
+        """
+        for pattern, parser in self.parser_paths.items():
+            if pattern_matches(os.path.join(self.working_directory, pattern), module_path):
+                return get_parser(parser)
+        return self.get_parser()
+
+    def get_mode(self) -> str:
+        """Checks if the desired mode exists and returns it.
 
         Raises:
-            Exception: If parser from Configuration doesn't exist.
+            Exception: If mode from Configuration doesn't exist.
 
         Returns:
-            Parser: A supported Parser.
+            str: A supported mode.
         """
-        if self.parser in PARSERS.keys():
-            return PARSERS[self.parser]()
+        if self.mode in MODES:
+            return self.mode
         else:
-            raise Exception(f"Unknown parser: {self.parser}. Please use one of the following: {', '.join(PARSERS.keys())}")
+            raise Exception(f"Unknown mode: {self.mode}. Please use one of the following: {', '.join(MODES)}")
+
+    def get_jobs(self) -> int:
+        """Returns the number of processes to validate modules with.
+
+        Returns:
+            int: The configured number of jobs, or the number of CPUs if not configured. 1 if isolate_modules is set.
+        """
+        if self.isolate_modules:
+            # Modules are only isolated when validated in this process, see PyDoctestService.validate_module_serially
+            return 1
+        if self.jobs > 0:
+            return self.jobs
+        return os.cpu_count() or 1
+
+    def get_cache_directory(self) -> str:
+        """Returns the directory to store cached results in.
+
+        Returns:
+            str: The configured cache directory, or .pydoctest_cache in the working directory if not configured.
+        """
+        return os.path.join(self.working_directory, self.cache_directory or CACHE_DIRECTORY_NAME)
+
+    def get_symbol_index_path(self) -> str:
+        """Returns the path of the file the symbol index is saved in, if cache_symbol_index is set.
+
+        Returns:
+            str: The path.
+        """
+        return os.path.join(self.get_cache_directory(), SYMBOL_INDEX_FILE_NAME)
+
+    def get_preload_path(self) -> str:
+        """Returns the path of the file the modules imported by workers are saved in, if preload_observed_modules is set.
+
+        Returns:
+            str: The path.
+        """
+        return os.path.join(self.get_cache_directory(), PRELOAD_FILE_NAME)
+
+    def get_validation_hash(self) -> str:
+        """Returns a hash of the configuration values which change the result of validating a module.
+
+        Returns:
+            str: The hash.
+        """
+        values = { key: getattr(self, key) for key in VALIDATION_KEYS }
+        return hashlib.sha256(json.dumps(values, sort_keys=True).encode()).hexdigest()
@@ -0,0 +1,359 @@
+"""Resident daemon, which keeps a warm process per project directory.
+
+The daemon listens on a Unix socket derived from its directory. The command line forwards invocations in
+the same directory to it, and prints the output and exits with the exit code the daemon returns. Modules
+imported while validating stay loaded between requests, except for project modules whose files changed,
+which are removed from sys.modules together with the modules depending on them.
+"""
+
+import io
+import os
+import sys
+import json
+import stat
+import socket
+import hashlib
+import tempfile
+import contextlib
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydoctest import logging
+from pydoctest.cache import get_pydoctest_fingerprint
+from pydoctest.dependencies import ImportGraph
+from pydoctest.main import get_argument_parser, run
+from pydoctest.utilities import evict_modules
+
+DEFAULT_IDLE_TIMEOUT_SECONDS = 900.0
+CONNECT_TIMEOUT_SECONDS = 0.5
+
+
+def get_socket_directory() -> str:
+    """Returns the directory the sockets of the daemons of the user are placed in.
+    It is in the temporary directory, since socket paths are limited to around 100 characters.
+
+    Returns:
+        str: The path to the directory.
+    """
+    return os.path.join(tempfile.gettempdir(), f"pydoctest-{os.getuid()}")
+
+
+def get_socket_path(working_directory: str) -> str:
+    """Returns the path of the socket of the daemon serving the directory.
+
+    Args:
+        working_directory (str): The directory served by the daemon.
+
+    Returns:
+        str: The path to the socket.
+    """
+    directory_hash = hashlib.sha256(os.path.abspath(working_directory).encode()).hexdigest()[:16]
+    return os.path.join(get_socket_directory(), f"{directory_hash}.sock")
+
+
+def is_private_directory(path: str) -> bool:
+    """Returns whether the path is a directory owned by the user, which no other user can access.
+
+    Args:
+        path (str): The path to the directory.
+
+    Returns:
+        bool: If the directory is private.
+    """
+    try:
+        status = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(status.st_mode) and status.st_uid == os.getuid() and status.st_mode & 0o077 == 0
+
+
+def is_own_socket(socket_path: str) -> bool:
+    """Returns whether the socket exists, and was created by the user in the private socket directory.
+    Other users could otherwise place a socket at the predictable path, to receive the requests.
+
+    Args:
+        socket_path (str): The path to the socket.
+
+    Returns:
+        bool: If the socket is owned by the user.
+    """
+    if not is_private_directory(os.path.dirname(socket_path)):
+        return False
+    try:
+        status = os.lstat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(status.st_mode) and status.st_uid == os.getuid()
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]) -> None:
+    """Sends the message as JSON, and closes the sending side of the connection.
+
+    Args:
+        connection (socket.socket): The connection.
+        message (Dict[str, Any]): The message.
+    """
+    connection.sendall(json.dumps(message).encode())
+    connection.shutdown(socket.SHUT_WR)
+
+
+def receive_message(connection: socket.socket) -> Dict[str, Any]:
+    """Receives a JSON message, sent until the other side closed sending.
+
+    Args:
+        connection (socket.socket): The connection.
+
+    Returns:
+        Dict[str, Any]: The message.
+    """
+    chunks = []
+    while True:
+        chunk = connection.recv(64 * 1024)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return json.loads(b''.join(chunks).decode())
+
+
+def send_request(working_directory: str, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Sends the request to the daemon serving the directory.
+
+    Args:
+        working_directory (str): The directory served by the daemon.
+        request (Dict[str, Any]): The request.
+
+    Returns:
+        Optional[Dict[str, Any]]: The response, or None if no daemon is running.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    socket_path = get_socket_path(working_directory)
+    if not is_own_socket(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(CONNECT_TIMEOUT_SECONDS)
+            connection.connect(socket_path)
+            # Validating may take long, only connecting is limited
+            connection.settimeout(None)
+            send_message(connection, request)
+            return receive_message(connection)
+    except (OSError, ValueError) as e:
+        logging.log(f'Failed to reach daemon: {socket_path} - error: {str(e)}')
+        return None
+
+
+def forward_request(working_directory: str, argv: List[str]) -> Optional[Tuple[str, int]]:
+    """Forwards the command line arguments to the daemon serving the directory, if one is running.
+
+    Args:
+        working_directory (str): The directory pydoctest is run in.
+        argv (List[str]): The command line arguments.
+
+    Returns:
+        Optional[Tuple[str, int]]: The output and exit code, or None if the request should run in this process.
+    """
+    if not hasattr(socket, 'AF_UNIX') or not is_own_socket(get_socket_path(working_directory)):
+        return None
+
+    response = send_request(working_directory, { 'argv': argv, 'fingerprint': get_pydoctest_fingerprint() })
+    if response is None or 'error' in response:
+        if response is not None:
+            logging.log(f"Daemon refused request - error: {response['error']}")
+        return None
+    return response['output'], response['exit_code']
+
+
+def stop_daemon(working_directory: str) -> bool:
+    """Stops the daemon serving the directory.
+
+    Args:
+        working_directory (str): The directory served by the daemon.
+
+    Returns:
+        bool: If a daemon was stopped.
+    """
+    return send_request(working_directory, { 'stop': True }) is not None
+
+
+class Daemon():
+    def __init__(self, working_directory: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS) -> None:
+        """Creates a daemon serving requests for the directory.
+
+        Args:
+            working_directory (str): The directory to serve, requests are run in it.
+            idle_timeout (float, optional): Seconds without requests before shutting down.
+        """
+        self.working_directory = os.path.abspath(working_directory)
+        self.idle_timeout = idle_timeout
+        self.socket_path = get_socket_path(self.working_directory)
+        self.fingerprint = get_pydoctest_fingerprint()
+        # Modification times of the project modules in sys.modules, by path
+        self.module_times: Dict[str, int] = {}
+
+    def serve(self) -> None:
+        """Serves requests, one at a time, until stopped or idle for longer than the idle timeout.
+
+        Raises:
+            RuntimeError: Raised if a daemon is already serving the directory, or the socket directory is not private.
+        """
+        if send_request(self.working_directory, { 'ping': True }) is not None:
+            raise RuntimeError(f"A daemon is already running for: {self.working_directory}")
+        socket_directory = os.path.dirname(self.socket_path)
+        os.makedirs(socket_directory, mode=0o700, exist_ok=True)
+        if not is_private_directory(socket_directory):
+            # Other users could replace the socket, or send requests run as this user
+            raise RuntimeError(f"The socket directory is not private to the user: {socket_directory}")
+        if os.path.lexists(self.socket_path):
+            # Left behind by a daemon that did not shut down
+            os.remove(self.socket_path)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(self.socket_path)
+            try:
+                server.listen()
+                server.settimeout(self.idle_timeout)
+                logging.log(f'Daemon listening on: {self.socket_path}')
+                while True:
+                    try:
+                        connection, _ = server.accept()
+                    except socket.timeout:
+                        logging.log('Daemon shutting down after being idle')
+                        return
+                    with connection:
+                        connection.settimeout(None)
+                        if not self.handle_connection(connection):
+                            return
+            finally:
+                os.remove(self.socket_path)
+
+    def handle_connection(self, connection: socket.socket) -> bool:
+        """Handles a request from a client.
+
+        Args:
+            connection (socket.socket): The connection to the client.
+
+        Returns:
+            bool: If the daemon should keep serving.
+        """
+        try:
+            request = receive_message(connection)
+        except (OSError, ValueError) as e:
+            logging.log(f'Failed to read request - error: {str(e)}')
+            return True
+
+        if request.get('stop'):
+            send_message(connection, { 'stopped': True })
+            return False
+        if request.get('ping'):
+            send_message(connection, { 'pong': True })
+            return True
+        if request.get('fingerprint') != self.fingerprint:
+            # The client runs another version of pydoctest
+            send_message(connection, { 'error': 'Daemon runs another version of pydoctest' })
+            return True
+
+        output, exit_code = self.run(request['argv'])
+        try:
+            send_message(connection, { 'output': output, 'exit_code': exit_code })
+        except OSError as e:
+            logging.log(f'Failed to send response - error: {str(e)}')
+        return True
+
+    def run(self, argv: List[str]) -> Tuple[str, int]:
+        """Runs pydoctest with the command line arguments, capturing the output.
+
+        Args:
+            argv (List[str]): The command line arguments.
+
+        Returns:
+            Tuple[str, int]: The output and exit code.
+        """
+        self.reload_changed_modules()
+        debug = logging.DEBUG
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                args = get_argument_parser().parse_args(argv)
+                # Modules stay loaded between requests only when validated in this process, and starting a
+                # pool of workers for every request would cost more than validating serially
+                args.jobs = 1
+                exit_code = run(args)
+            except SystemExit as e:
+                # Raised by argparse for invalid arguments
+                exit_code = e.code if isinstance(e.code, int) else 1
+        logging.set_verbose(debug)
+        self.record_modules()
+        return output.getvalue(), exit_code
+
+    def get_project_modules(self) -> Set[str]:
+        """Returns the paths of the project modules in sys.modules.
+
+        Returns:
+            Set[str]: Paths to the modules.
+        """
+        paths = set()
+        prefix = os.path.join(self.working_directory, '')
+        for module in list(sys.modules.values()):
+            path = getattr(module, '__file__', None)
+            if isinstance(path, str) and os.path.abspath(path).startswith(prefix):
+                paths.add(os.path.abspath(path))
+        return paths
+
+    def record_modules(self) -> None:
+        """Records the modification times of the project modules in sys.modules.
+        """
+        self.module_times = {}
+        for path in self.get_project_modules():
+            try:
+                self.module_times[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+
+    def reload_changed_modules(self) -> None:
+        """Removes the project modules whose files changed since the last request from sys.modules, along with
+        the modules importing them, so they are imported again.
+        """
+        changed = set()
+        for path, mtime in self.module_times.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    changed.add(path)
+            except OSError:
+                changed.add(path)
+        if not changed:
+            return
+
+        import_graph = ImportGraph(self.working_directory)
+        dependents = set(p for p in self.module_times if changed.intersection(import_graph.get_dependencies(p)))
+        logging.log(f'Reloading {len(changed | dependents)} changed module(s)')
+        evict_modules(changed | dependents)
+
+
+def run_daemon(working_directory: str, idle_timeout: Optional[float] = None) -> int:
+    """Runs the daemon for the directory until it is stopped or idle.
+
+    Args:
+        working_directory (str): The directory to serve.
+        idle_timeout (Optional[float], optional): Seconds without requests before shutting down.
+
+    Returns:
+        int: The exit code.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        print("The daemon requires Unix sockets, which are not available on this platform")
+        return 1
+
+    # Imports will not work, unless we pretend this script is executed in the current directory.
+    if '' not in sys.path:
+        sys.path.insert(0, '')
+
+    try:
+        Daemon(working_directory, idle_timeout or DEFAULT_IDLE_TIMEOUT_SECONDS).serve()
+    except RuntimeError as e:
+        print(str(e))
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
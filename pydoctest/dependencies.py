@@ -0,0 +1,137 @@
+"""Import graph of the modules in a project.
+
+Imports are found by parsing the modules, so nothing is imported. Only modules inside the project root
+are part of the graph, since changes to installed packages are not tracked.
+"""
+
+import os
+import sys
+import ast
+
+from typing import Dict, List, Optional, Set
+
+from pydoctest import logging
+
+
+class ImportGraph():
+    def __init__(self, root: str) -> None:
+        """Creates an import graph of the modules in the project root.
+
+        Args:
+            root (str): The project root, usually the working directory.
+        """
+        self.root = os.path.abspath(root or '.')
+        self.__imports: Dict[str, List[str]] = {}
+
+    def is_project_file(self, path: str) -> bool:
+        """Returns whether the file is inside the project root.
+
+        Args:
+            path (str): Path to a file.
+
+        Returns:
+            bool: If the file is part of the project.
+        """
+        return os.path.abspath(path).startswith(os.path.join(self.root, ''))
+
+    def find_module_file(self, module_name: str, module_path: str) -> Optional[str]:
+        """Returns the file of the module in the project, searching from the project root, the directory of the
+        importing module, and the entries of sys.path inside the project.
+
+        Args:
+            module_name (str): The absolute name of the module, e.g. "a.b.c".
+            module_path (str): Path to the importing module.
+
+        Returns:
+            Optional[str]: The path to the module, if it is part of the project.
+        """
+        search_paths = [self.root, os.path.dirname(module_path)] + [os.path.abspath(p) for p in sys.path if self.is_project_file(os.path.join(p, '_'))]
+        parts = module_name.split('.')
+        for search_path in search_paths:
+            base = os.path.join(search_path, *parts)
+            for candidate in [f"{base}.py", os.path.join(base, '__init__.py')]:
+                if os.path.isfile(candidate) and self.is_project_file(candidate):
+                    return os.path.abspath(candidate)
+        return None
+
+    def get_imports(self, module_path: str) -> List[str]:
+        """Returns the project modules imported directly by the module, including the packages they are in.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            List[str]: Paths to the imported modules.
+        """
+        module_path = os.path.abspath(module_path)
+        if module_path in self.__imports:
+            return self.__imports[module_path]
+
+        try:
+            with open(module_path, 'rb') as f:
+                tree = ast.parse(f.read(), filename=module_path)
+        except (OSError, SyntaxError, ValueError) as e:
+            logging.log(f'Failed to parse imports of module: {module_path} - error: {str(e)}')
+            self.__imports[module_path] = []
+            return []
+
+        module_names: List[str] = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                module_names.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level > 0:
+                    directory = os.path.dirname(module_path)
+                    for _ in range(node.level - 1):
+                        directory = os.path.dirname(directory)
+                    # Relative imports are resolved as paths from the directory of the module
+                    relative = os.path.relpath(directory, self.root).replace(os.sep, '.')
+                    prefix = '' if relative == '.' else f"{relative}."
+                    base = f"{prefix}{node.module}" if node.module else prefix.rstrip('.')
+                else:
+                    base = node.module or ''
+                if base:
+                    module_names.append(base)
+                # The imported names may be submodules
+                module_names.extend(f"{base}.{alias.name}" if base else alias.name for alias in node.names if alias.name != '*')
+
+        imports: Set[str] = set()
+        for module_name in module_names:
+            parts = module_name.split('.')
+            # Importing a.b.c also executes the packages a and a.b
+            for i in range(1, len(parts) + 1):
+                module_file = self.find_module_file('.'.join(parts[:i]), module_path)
+                if module_file is not None and module_file != module_path:
+                    imports.add(module_file)
+
+        self.__imports[module_path] = sorted(imports)
+        return self.__imports[module_path]
+
+    def invalidate(self, module_paths: Set[str]) -> None:
+        """Forgets the imports of the modules, so they are parsed again after they changed.
+
+        Args:
+            module_paths (Set[str]): Paths to the modules.
+        """
+        for module_path in module_paths:
+            self.__imports.pop(os.path.abspath(module_path), None)
+
+    def get_dependencies(self, module_path: str) -> List[str]:
+        """Returns the project modules imported by the module, directly or through other modules.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            List[str]: Paths to the imported modules.
+        """
+        module_path = os.path.abspath(module_path)
+        visited: Set[str] = set([module_path])
+        queue = [module_path]
+        while queue:
+            for imported in self.get_imports(queue.pop()):
+                if imported not in visited:
+                    visited.add(imported)
+                    queue.append(imported)
+        visited.remove(module_path)
+        return sorted(visited)
@@ -4,3 +4,8 @@ class ParseException(Exception):
 
 class UnknownTypeException(Exception):
     pass
+
+
+class ModuleTimeoutException(BaseException):
+    # A BaseException, so it is not caught as an error of the module being validated
+    pass
@@ -0,0 +1,137 @@
+"""Evaluation of type expressions, e.g. docstring types and annotations.
+
+Expressions are parsed with ast and compiled into closures, instead of being passed to eval. Only names,
+attributes, subscripts, tuples, lists, constants and | unions are allowed, so evaluating a docstring never
+calls or executes anything but attribute access and subscripting. Compiled expressions are cached by their
+type string, and by their ast, so equivalent strings are compiled once.
+"""
+
+import sys
+import ast
+import builtins
+
+from typing import Any, Callable, Dict, List, Mapping
+
+from pydoctest.exceptions import UnknownTypeException
+
+# A compiled expression, called with a function resolving names to objects
+TypeExpression = Callable[[Callable[[str], Any]], Any]
+
+if sys.version_info < (3, 8):
+    CONSTANT_NODES: Any = (ast.Str, ast.Num, ast.NameConstant, ast.Ellipsis)
+else:
+    CONSTANT_NODES = (ast.Constant,)
+
+BUILTINS = vars(builtins)
+
+__expressions: Dict[str, TypeExpression] = {}
+__compiled: Dict[str, TypeExpression] = {}
+
+
+def compile_type_node(node: ast.AST) -> TypeExpression:
+    """Compiles the expression into a function evaluating it.
+
+    Args:
+        node (ast.AST): The expression.
+
+    Raises:
+        UnknownTypeException: If the expression contains anything but names, attributes, subscripts, tuples, lists, constants and | unions.
+
+    Returns:
+        TypeExpression: The compiled expression.
+    """
+    if isinstance(node, ast.Expression):
+        return compile_type_node(node.body)
+
+    if isinstance(node, ast.Name) and not node.id.startswith('__'):
+        name = node.id
+        return lambda resolve: resolve(name)
+
+    if isinstance(node, ast.Attribute) and not node.attr.startswith('_'):
+        value, attribute = compile_type_node(node.value), node.attr
+        return lambda resolve: getattr(value(resolve), attribute)
+
+    if isinstance(node, ast.Subscript):
+        value, index = compile_type_node(node.value), compile_type_node(node.slice)
+        return lambda resolve: value(resolve)[index(resolve)]
+
+    if sys.version_info < (3, 9) and isinstance(node, ast.Index):
+        return compile_type_node(node.value)  # type: ignore
+
+    if isinstance(node, (ast.Tuple, ast.List)):
+        items = [compile_type_node(item) for item in node.elts]
+        if isinstance(node, ast.Tuple):
+            return lambda resolve: tuple(item(resolve) for item in items)
+        return lambda resolve: [item(resolve) for item in items]
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        left, right = compile_type_node(node.left), compile_type_node(node.right)
+        return lambda resolve: left(resolve) | right(resolve)
+
+    if isinstance(node, CONSTANT_NODES):
+        constant = ast.literal_eval(node)
+        return lambda resolve: constant
+
+    raise UnknownTypeException(f"Not a type expression: {ast.dump(node)}")
+
+
+def get_type_expression(type_string: str) -> TypeExpression:
+    """Returns the compiled type expression, compiling it on first use.
+    Raises SyntaxError if the type string is not an expression, and UnknownTypeException if it is not a type expression.
+
+    Args:
+        type_string (str): String version of a type, e.g. "Optional[str]"
+
+    Returns:
+        TypeExpression: The compiled expression.
+    """
+    expression = __expressions.get(type_string)
+    if expression is None:
+        tree = ast.parse(type_string.strip(), mode='eval')
+        key = ast.dump(tree)
+        if key not in __compiled:
+            __compiled[key] = compile_type_node(tree)
+        expression = __expressions[type_string] = __compiled[key]
+    return expression
+
+
+class NamespaceResolver():
+    def __init__(self, namespaces: List[Mapping[str, Any]]) -> None:
+        """Resolves names from the first namespace binding them, passed to compiled type expressions.
+
+        Args:
+            namespaces (List[Mapping[str, Any]]): The namespaces, in the order they are searched.
+        """
+        self.namespaces = namespaces
+
+    def __call__(self, name: str) -> Any:
+        """Returns the object bound to the name.
+
+        Args:
+            name (str): The name.
+
+        Raises:
+            NameError: Raised if no namespace binds the name, like eval does.
+
+        Returns:
+            Any: The object.
+        """
+        for namespace in self.namespaces:
+            try:
+                return namespace[name]
+            except KeyError:
+                pass
+        raise NameError(f"name '{name}' is not defined")
+
+
+def evaluate_type_expression(type_string: str, namespaces: List[Mapping[str, Any]]) -> Any:
+    """Evaluates the type string, resolving names from the namespaces and finally builtins, like eval does.
+
+    Args:
+        type_string (str): String version of a type, e.g. "Optional[str]"
+        namespaces (List[Mapping[str, Any]]): The namespaces, in the order they are searched, e.g. the module's.
+
+    Returns:
+        Any: The type.
+    """
+    return get_type_expression(type_string)(NamespaceResolver(namespaces + [BUILTINS]))
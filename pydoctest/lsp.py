@@ -0,0 +1,356 @@
+"""Language server, speaking the Language Server Protocol over stdin and stdout.
+
+Open documents are validated from their unsaved text with the static engine, on every change. Between changes,
+the namespace of the module is reused as long as the module apart from its function definitions is unchanged,
+and results of unchanged functions are replayed from an in-memory FunctionCache, so only edited functions are
+validated again.
+"""
+
+import os
+import sys
+import ast
+import json
+import urllib.parse
+import urllib.request
+
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from pydoctest import logging
+from pydoctest.version import VERSION
+from pydoctest.cache import FunctionCache, get_environment_hash
+from pydoctest.configuration import Configuration
+from pydoctest.main import DEFAULT_EXCLUDE_PATHS, get_configuration
+from pydoctest.static import FunctionNode, get_function_nodes, load_static_module, validate_loaded_static_module
+from pydoctest.utilities import StaticModule, is_excluded_path
+from pydoctest.validation import FunctionValidationResult, ModuleValidationResult, Range, ResultType
+
+# Error codes from the specification, for requests the server does not support, and requests that failed
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+DIAGNOSTIC_SEVERITY_ERROR = 1
+TEXT_DOCUMENT_SYNC_FULL = 1
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Reads a message, framed by a Content-Length header.
+
+    Args:
+        stream (BinaryIO): The stream to read from.
+
+    Returns:
+        Optional[Dict[str, Any]]: The message, or None if the stream ended.
+    """
+    content_length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode('ascii').partition(':')
+        if name.strip().lower() == 'content-length':
+            content_length = int(value.strip())
+
+    if content_length is None:
+        return None
+    return json.loads(stream.read(content_length).decode('utf-8'))
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    """Writes a message, framed by a Content-Length header.
+
+    Args:
+        stream (BinaryIO): The stream to write to.
+        message (Dict[str, Any]): The message.
+    """
+    body = json.dumps(message).encode('utf-8')
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+    stream.flush()
+
+
+def uri_to_path(uri: str) -> str:
+    """Returns the path of a file URI.
+
+    Args:
+        uri (str): The URI, e.g. file:///home/project/module.py.
+
+    Returns:
+        str: The path.
+    """
+    return urllib.request.url2pathname(urllib.parse.urlparse(uri).path)
+
+
+def get_utf16_column(line: str, column: int) -> int:
+    """Returns the column in UTF-16 code units, which positions in the protocol are counted in.
+
+    Args:
+        line (str): The line.
+        column (int): The column in characters.
+
+    Returns:
+        int: The column in UTF-16 code units.
+    """
+    return len(line[:column].encode('utf-16-le')) // 2
+
+
+def get_function_qualnames(tree: ast.Module) -> Dict[str, FunctionNode]:
+    """Returns the top-level functions and the methods of top-level classes, by qualified name.
+
+    Args:
+        tree (ast.Module): The parsed module.
+
+    Returns:
+        Dict[str, FunctionNode]: The functions.
+    """
+    functions: Dict[str, FunctionNode] = dict(get_function_nodes(tree.body, recurse=True))
+    for statement in tree.body:
+        if isinstance(statement, ast.ClassDef):
+            for name, node in get_function_nodes(statement.body, recurse=True).items():
+                functions[f"{statement.name}.{name}"] = node
+    return functions
+
+
+def get_diagnostic_range(result: FunctionValidationResult, source_lines: List[str], functions: Dict[str, FunctionNode]) -> Optional[Range]:
+    """Returns the range to show the failure of the function at, with columns spanning the text of the lines unless
+    the range has columns. Failures without a range, e.g. unresolved signatures, are shown at the name of the function.
+
+    Args:
+        result (FunctionValidationResult): The result of the function.
+        source_lines (List[str]): The source lines of the module.
+        functions (Dict[str, FunctionNode]): The functions of the module, by qualified name.
+
+    Returns:
+        Optional[Range]: The range, with one-indexed lines like other ranges, if found.
+    """
+    if result.range is not None and 0 < result.range.start_line <= result.range.end_line <= len(source_lines):
+        if result.range.end_character > 0:
+            # Docstring ranges have the columns of the quotes
+            return result.range
+        start_line = source_lines[result.range.start_line - 1]
+        end_line = source_lines[result.range.end_line - 1]
+        start_character = len(start_line) - len(start_line.lstrip())
+        return Range(result.range.start_line, result.range.end_line, start_character, len(end_line.rstrip()))
+
+    node = functions.get(result.function.__qualname__)
+    if node is None or node.lineno > len(source_lines):
+        return None
+    line = source_lines[node.lineno - 1]
+    start_character = line.find(node.name, node.col_offset)
+    if start_character == -1:
+        return Range(node.lineno, node.lineno, 0, len(line.rstrip()))
+    return Range(node.lineno, node.lineno, start_character, start_character + len(node.name))
+
+
+class DocumentState():
+    def __init__(self) -> None:
+        """Holds what is reused between changes of an open document.
+        """
+        self.environment_hash: Optional[str] = None
+        self.module: Optional[StaticModule] = None
+        self.function_cache: Optional[FunctionCache] = None
+
+
+class LanguageServer():
+    def __init__(self, input_stream: BinaryIO, output_stream: BinaryIO, working_directory: str) -> None:
+        """Creates a language server, reading messages from input_stream and writing messages to output_stream.
+
+        Args:
+            input_stream (BinaryIO): The stream to read messages from.
+            output_stream (BinaryIO): The stream to write messages to.
+            working_directory (str): The directory to find the configuration in, unless the client sends a root.
+        """
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.working_directory = working_directory
+        self.config: Optional[Configuration] = None
+        self.documents: Dict[str, DocumentState] = {}
+        self.texts: Dict[str, str] = {}
+        self.is_shutdown = False
+
+    def serve(self) -> int:
+        """Handles messages until the client sends exit, or the input ends.
+
+        Returns:
+            int: The exit code, 0 if the client asked the server to shut down before exiting.
+        """
+        while True:
+            message = read_message(self.input_stream)
+            if message is None:
+                return 1
+            if message.get('method') == 'exit':
+                return 0 if self.is_shutdown else 1
+            self.handle_message(message)
+
+    def handle_message(self, message: Dict[str, Any]) -> None:
+        """Handles a request or notification. If handling it fails, requests are answered with an error, and the
+        server keeps serving.
+
+        Args:
+            message (Dict[str, Any]): The message.
+        """
+        try:
+            self.dispatch_message(message)
+        except Exception as e:
+            logging.log(f"Failed to handle message: {message.get('method')} - error: {str(e)}")
+            if 'id' in message and message.get('method') is not None:
+                write_message(self.output_stream, { 'jsonrpc': '2.0', 'id': message['id'], 'error': { 'code': INTERNAL_ERROR, 'message': str(e) } })
+
+    def dispatch_message(self, message: Dict[str, Any]) -> None:
+        """Handles a request or notification by its method, responding to requests.
+
+        Args:
+            message (Dict[str, Any]): The message.
+        """
+        method = message.get('method')
+        params = message.get('params') or {}
+        result: Any = None
+
+        if method == 'initialize':
+            root_uri = params.get('rootUri')
+            self.working_directory = uri_to_path(root_uri) if root_uri else params.get('rootPath') or self.working_directory
+            self.config = get_configuration(self.working_directory)
+            result = {
+                'capabilities': {
+                    'textDocumentSync': { 'openClose': True, 'change': TEXT_DOCUMENT_SYNC_FULL, 'save': { 'includeText': False } }
+                },
+                'serverInfo': { 'name': 'pydoctest', 'version': VERSION }
+            }
+        elif method == 'shutdown':
+            self.is_shutdown = True
+        elif method == 'textDocument/didOpen':
+            document = params['textDocument']
+            self.update_document(document['uri'], document['text'])
+        elif method == 'textDocument/didChange':
+            changes = params['contentChanges']
+            if changes:
+                # Full synchronization, the last change holds the whole text
+                self.update_document(params['textDocument']['uri'], changes[-1]['text'])
+        elif method == 'textDocument/didClose':
+            uri = params['textDocument']['uri']
+            self.documents.pop(uri, None)
+            self.texts.pop(uri, None)
+            self.publish_diagnostics(uri, [])
+        elif method in ['textDocument/didSave', 'workspace/didChangeWatchedFiles']:
+            # Modules the open documents import may have changed
+            self.documents = {}
+            for uri, text in list(self.texts.items()):
+                self.update_document(uri, text)
+        elif 'id' in message and method is not None:
+            write_message(self.output_stream, { 'jsonrpc': '2.0', 'id': message['id'], 'error': { 'code': METHOD_NOT_FOUND, 'message': f"Unsupported method: {method}" } })
+            return
+
+        if 'id' in message and method is not None:
+            write_message(self.output_stream, { 'jsonrpc': '2.0', 'id': message['id'], 'result': result })
+
+    def get_config(self) -> Configuration:
+        """Returns the configuration of the workspace.
+
+        Returns:
+            Configuration: The configuration.
+        """
+        if self.config is None:
+            self.config = get_configuration(self.working_directory)
+        return self.config
+
+    def update_document(self, uri: str, text: str) -> None:
+        """Validates the text of the document and publishes the diagnostics.
+
+        Args:
+            uri (str): The URI of the document.
+            text (str): The text of the document.
+        """
+        self.texts[uri] = text
+        diagnostics = self.validate_document(uri, text)
+        if diagnostics is not None:
+            self.publish_diagnostics(uri, diagnostics)
+
+    def validate_document(self, uri: str, text: str) -> Optional[List[Dict[str, Any]]]:
+        """Validates the text of the document, reusing the namespace and function results of the last change.
+
+        Args:
+            uri (str): The URI of the document.
+            text (str): The text of the document.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The diagnostics, or None if the text could not be parsed, e.g. while typing.
+        """
+        config = self.get_config()
+        path = uri_to_path(uri)
+        exclude_paths = [os.path.join(config.working_directory, p) for p in config.exclude_paths + DEFAULT_EXCLUDE_PATHS]
+        if not path.endswith('.py') or is_excluded_path(path, exclude_paths):
+            return []
+
+        try:
+            tree = ast.parse(text, filename=path)
+        except (SyntaxError, ValueError):
+            return None
+
+        state = self.documents.setdefault(uri, DocumentState())
+        environment_hash = get_environment_hash(tree)
+        if state.module is None or state.function_cache is None or state.environment_hash != environment_hash:
+            try:
+                state.module = load_static_module(path, text)
+            except Exception as e:
+                logging.log(f'Failed to load document: {uri} - error: {str(e)}')
+                return None
+            state.environment_hash = environment_hash
+            state.function_cache = FunctionCache(environment_hash)
+        else:
+            setattr(state.module, '__tree__', tree)
+            setattr(state.module, '__source_lines__', text.splitlines(keepends=True))
+            # Only the unresolved types of this validation are kept
+            state.module.__unresolved_types__ = []
+
+        result = validate_loaded_static_module(state.module, ModuleValidationResult(path), config, cache=state.function_cache, parser=config.get_parser_for_path(path))
+        logging.log(f'Cached functions: {state.function_cache.hits} hit(s), {state.function_cache.misses} miss(es) in document: {uri}')
+        # Keep the results of the functions in this text, for the next change
+        state.function_cache = FunctionCache(environment_hash, state.function_cache.results)
+
+        source_lines: List[str] = getattr(state.module, '__source_lines__')
+        functions = get_function_qualnames(tree)
+        function_results = result.function_results + [r for c_r in result.class_results for r in c_r.function_results]
+        diagnostics = []
+        for function_result in function_results:
+            if function_result.result != ResultType.FAILED:
+                continue
+            diagnostic_range = get_diagnostic_range(function_result, source_lines, functions)
+            if diagnostic_range is None:
+                continue
+            start_line = source_lines[diagnostic_range.start_line - 1]
+            end_line = source_lines[diagnostic_range.end_line - 1]
+            diagnostics.append({
+                'range': {
+                    # Lines are zero-indexed in the protocol
+                    'start': { 'line': diagnostic_range.start_line - 1, 'character': get_utf16_column(start_line, diagnostic_range.start_character) },
+                    'end': { 'line': diagnostic_range.end_line - 1, 'character': get_utf16_column(end_line, diagnostic_range.end_character) }
+                },
+                'severity': DIAGNOSTIC_SEVERITY_ERROR,
+                'source': 'pydoctest',
+                'message': function_result.fail_reason
+            })
+        return diagnostics
+
+    def publish_diagnostics(self, uri: str, diagnostics: List[Dict[str, Any]]) -> None:
+        """Sends the diagnostics of the document to the client.
+
+        Args:
+            uri (str): The URI of the document.
+            diagnostics (List[Dict[str, Any]]): The diagnostics.
+        """
+        write_message(self.output_stream, { 'jsonrpc': '2.0', 'method': 'textDocument/publishDiagnostics', 'params': { 'uri': uri, 'diagnostics': diagnostics } })
+
+
+def run_language_server(working_directory: str) -> int:
+    """Runs the language server on stdin and stdout until the client exits.
+
+    Args:
+        working_directory (str): The directory to find the configuration in, unless the client sends a root.
+
+    Returns:
+        int: The exit code.
+    """
+    output = sys.stdout.buffer
+    # Logging prints to stdout, which is reserved for messages
+    sys.stdout = sys.stderr
+    return LanguageServer(sys.stdin.buffer, output, working_directory).serve()
@@ -1,4 +1,5 @@
 from enum import Enum
+import gc
 import sys
 import os
 import argparse
@@ -12,7 +13,7 @@ from importlib.abc import Loader
 from importlib.machinery import ModuleSpec
 
 from types import FunctionType, ModuleType
-from typing import List, Optional, Type
+from typing import Any, List, Optional, Type, cast
 
 from pydoctest import logging
 from pydoctest.version import VERSION
@@ -20,8 +21,15 @@ from pydoctest.configuration import Configuration, Verbosity
 from pydoctest.reporters.reporter import Reporter
 from pydoctest.reporters.json_reporter import JSONReporter
 from pydoctest.reporters.text_reporter import TextReporter
-from pydoctest.validation import ModuleValidationResult, Result, ResultType, ValidationResult, validate_class, validate_function
-from pydoctest.utilities import is_excluded_class, is_excluded_function, parse_cli_list, is_excluded_path
+from pydoctest.validation import FunctionValidationResult, ModuleValidationResult, Result, ResultType, ValidationResult, get_class_methods, parse_docstrings, validate_class, validate_function
+from pydoctest.cache import FunctionCache, ResultCache
+from pydoctest.parallel import validate_modules_in_parallel
+from pydoctest.static import validate_static_module
+from pydoctest.parsers.parser import Parser, clear_parsed_docstrings
+from pydoctest.parsers.registry import get_parser
+from pydoctest.symbols import SymbolIndex, set_symbol_index
+from pydoctest.watchdog import run_with_timeout
+from pydoctest.utilities import get_loaded_module, get_module_name, register_module, restore_modules, unregister_module, is_excluded_class, is_excluded_function, parse_cli_list, is_excluded_path, get_type_cache
 
 # We always want to exclude setup.py
 DEFAULT_EXCLUDE_PATHS = [ "**/setup.py" ]
@@ -41,6 +49,10 @@ class PyDoctestService():
             config (Configuration): The configuration to use for testing.
         """
         self.config = config
+        self.cache: Optional[ResultCache] = None
+
+        # The parser validating docstrings, shared by all functions of the run, unless parser_paths selects another
+        self.parser = config.get_parser()
 
     def validate(self, modules: Optional[List[str]] = None) -> ValidationResult:
         """Validate the found modules using the provided reporter.
@@ -53,13 +65,46 @@ class PyDoctestService():
         """
         logging.log('Starting validating')
         result = ValidationResult()
+        index = self.create_symbol_index()
 
         if modules is None:
             modules = self.discover_modules()
             logging.log(f'Found {len(modules)} modules')
 
-        for module in modules:
-            module_result = self.validate_module(module)
+        # A new cache per run, since it remembers the hashes of the files it has read
+        cache = self.cache = ResultCache(self.config) if self.config.cache else None
+        cached_results = { module: cache.get(module) for module in modules } if cache else {}
+        uncached_modules = [module for module in modules if cached_results.get(module) is None]
+
+        jobs = self.config.get_jobs()
+        if jobs > 1 and len(uncached_modules) > 1:
+            # The peak memory of the workers is only collected to be logged
+            worker_memory = result.worker_memory if logging.DEBUG else None
+            validated_results = validate_modules_in_parallel(self.config, uncached_modules, jobs, worker_memory)
+        else:
+            validated_results = [self.validate_module_serially(module) for module in uncached_modules]
+
+        for module, module_result in zip(uncached_modules, validated_results):
+            cached_results[module] = module_result
+            # Failing to load a module depends on the environment, not just the module, so it is not cached
+            if cache and module_result.fail_reason == "":
+                cache.store(module, module_result)
+
+        if cache:
+            logging.log(f'Cached results: {cache.hits} hit(s), {cache.misses} miss(es)')
+            cache.evict()
+
+        if len(result.worker_memory) > 0:
+            peak = max(result.worker_memory)
+            mean = sum(result.worker_memory) / len(result.worker_memory)
+            logging.log(f'Peak memory of {len(result.worker_memory)} worker(s): {peak:.1f} MB (max), {mean:.1f} MB (mean)')
+
+        logging.log(index.get_statistics())
+        logging.log(get_type_cache().get_statistics())
+        if self.config.cache and self.config.cache_symbol_index:
+            index.save(self.config.get_symbol_index_path())
+
+        for module_result in [cast(ModuleValidationResult, cached_results[module]) for module in modules]:
             if module_result.result == ResultType.FAILED:
                 result.result = ResultType.FAILED
             result.module_results.append(module_result)
@@ -69,6 +114,22 @@ class PyDoctestService():
 
         return result
 
+    def create_symbol_index(self) -> SymbolIndex:
+        """Creates the symbol index used for resolving types in this run, loading the saved index if configured.
+
+        Returns:
+            SymbolIndex: The index.
+        """
+        index = SymbolIndex(self.config.type_search_limit, self.config.import_types)
+        if self.config.cache and self.config.cache_symbol_index:
+            index.load(self.config.get_symbol_index_path())
+        set_symbol_index(index)
+
+        # Types resolved from the previous index may be stale
+        get_type_cache().clear_modules()
+        clear_parsed_docstrings()
+        return index
+
     def validate_module(self, module_path: str) -> ModuleValidationResult:
         """Validates the module, given its path.
 
@@ -79,47 +140,200 @@ class PyDoctestService():
             ModuleValidationResult: Result of validating the module.
         """
         logging.log(f'Validating module: {module_path}')
-        result = ModuleValidationResult(module_path)
+        function_cache = self.get_function_cache(module_path)
 
-        module_name = os.path.basename(module_path)
-        module_spec: Optional[ModuleSpec] = importlib.util.spec_from_file_location(module_name, module_path)
+        mode = self.config.get_mode()
+        if mode == 'static':
+            result = validate_static_module(module_path, self.config, cache=function_cache, parser=self.get_parser(module_path))
+        elif mode == 'hybrid':
+            result = self.validate_module_hybrid(module_path, function_cache)
+        else:
+            result = self.validate_module_import(module_path, function_cache)
 
-        if not os.path.exists(module_path) or module_spec is None or not isinstance(module_spec.loader, Loader):
-            result.result = ResultType.NOT_RUN
-            result.fail_reason = f"Failed to load file from location: {module_path}"
-            return result
+        if self.cache is not None and function_cache is not None:
+            logging.log(f'Cached functions: {function_cache.hits} hit(s), {function_cache.misses} miss(es) in module: {module_path}')
+            self.cache.save_function_cache(module_path, function_cache)
+        return result
 
+    def validate_module_serially(self, module_path: str) -> ModuleValidationResult:
+        """Validates the module in this process, failing it if it exceeds module_timeout, see pydoctest.watchdog.
+        With isolate_modules, the modules imported while validating it are removed afterwards, see restore_modules.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            ModuleValidationResult: Result of validating the module.
+        """
+        if not self.config.isolate_modules:
+            return run_with_timeout(module_path, self.config.module_timeout, lambda: self.validate_module(module_path))
+
+        snapshot = set(sys.modules.keys())
         try:
-            module_type = importlib.util.module_from_spec(module_spec)
-            module_spec.loader.exec_module(module_type)
-        except ModuleNotFoundError as e:
-            result.result = ResultType.FAILED
-            result.fail_reason = f"Failed to load module dependant module: {str(e)}"
+            result = run_with_timeout(module_path, self.config.module_timeout, lambda: self.validate_module(module_path))
+            # The result only keeps the names of functions and modules, so the modules can be collected
+            result.detach()
             return result
-        except Exception as e:
-            result.result = ResultType.FAILED
-            result.fail_reason = f"Failed to load module (possibly due to syntax errors): {module_path} - error: {str(e)}"
+        finally:
+            shared_packages = set([ 'pydoctest' ] + [name.split('.')[0] for name in self.config.preload_modules])
+            removed = restore_modules(snapshot, shared_packages)
+            # Parsed docstrings are memoized by module
+            clear_parsed_docstrings()
+            gc.collect()
+            logging.log(f'Removed {len(removed)} module(s) imported while validating module: {module_path}')
+
+    def get_parser(self, module_path: str) -> Parser:
+        """Returns the parser of the module, selected by parser_paths or the configured parser.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            Parser: The parser.
+        """
+        if not self.config.parser_paths:
+            return self.parser
+        return self.config.get_parser_for_path(module_path)
+
+    def get_function_cache(self, module_path: str) -> Optional[FunctionCache]:
+        """Returns the cache of function results of the module, if caching is enabled.
+
+        Args:
+            module_path (str): Path to a module.
+
+        Returns:
+            Optional[FunctionCache]: The function cache.
+        """
+        if not self.config.cache:
+            return None
+        if self.cache is None:
+            self.cache = ResultCache(self.config)
+        return self.cache.load_function_cache(module_path)
+
+    def validate_module_import(self, module_path: str, cache: Optional[FunctionCache] = None) -> ModuleValidationResult:
+        """Validates the module by importing it.
+
+        Args:
+            module_path (str): Path to a module.
+            cache (Optional[FunctionCache], optional): Cache of function results, used for functions that have not changed.
+
+        Returns:
+            ModuleValidationResult: Result of validating the module.
+        """
+        result = ModuleValidationResult(module_path)
+        module_type = self.import_module(module_path, result)
+        if module_type is None:
             return result
 
-        # Validate top-level functions in module
+        parser = self.get_parser(module_path)
         fns = self.get_global_functions(module_type)
+        classes = self.get_classes(module_type)
+        if 0 < self.config.batch_parse_threshold <= len(fns) + sum(len(vars(cl)) for cl in classes):
+            methods = [method for cl in classes for method in get_class_methods(cl, self.config, module_type)]
+            parse_docstrings([inspect.getdoc(fn) for fn in fns + methods], self.config, module_type, parser)
+
+        # Validate top-level functions in module
         for fn in fns:
-            function_result = validate_function(fn, self.config, module_type)
+            function_result = validate_function(fn, self.config, module_type, cache, parser)
             if function_result.result == ResultType.FAILED:
                 result.result = ResultType.FAILED
             result.function_results.append(function_result)
 
         # Validate top-level classes in module
-        classes = self.get_classes(module_type)
-
         for cl in classes:
-            class_result = validate_class(cl, self.config, module_type)
+            class_result = validate_class(cl, self.config, module_type, cache, parser)
             if class_result.result == ResultType.FAILED:
                 result.result = ResultType.FAILED
             result.class_results.append(class_result)
 
         return result
 
+    def validate_module_hybrid(self, module_path: str, cache: Optional[FunctionCache] = None) -> ModuleValidationResult:
+        """Validates the module statically, and imports it only if some functions use types that could not be resolved statically.
+        Those functions are then validated again from the imported module.
+
+        Args:
+            module_path (str): Path to a module.
+            cache (Optional[FunctionCache], optional): Cache of function results, used for functions that have not changed.
+
+        Returns:
+            ModuleValidationResult: Result of validating the module.
+        """
+        unresolved: List[FunctionValidationResult] = []
+        parser = self.get_parser(module_path)
+        result = validate_static_module(module_path, self.config, unresolved, cache, parser)
+        if len(unresolved) == 0:
+            return result
+
+        logging.log(f'Importing module for {len(unresolved)} function(s) with unresolved types: {module_path}')
+        module_type = self.import_module(module_path, result)
+        if module_type is None:
+            return result
+
+        def revalidate(function_results: List[FunctionValidationResult]) -> None:
+            for i, function_result in enumerate(function_results):
+                if function_result not in unresolved:
+                    continue
+                fn: Any = module_type
+                for name in function_result.function.__qualname__.split('.'):
+                    fn = getattr(fn, name, None)
+                if inspect.isfunction(fn):
+                    function_results[i] = validate_function(cast(FunctionType, fn), self.config, module_type, cache, parser)
+
+        revalidate(result.function_results)
+        for class_result in result.class_results:
+            revalidate(class_result.function_results)
+            failed = any(r.result == ResultType.FAILED for r in class_result.function_results)
+            class_result.result = ResultType.FAILED if failed else ResultType.OK
+
+        failed = any(r.result == ResultType.FAILED for r in result.function_results) or any(c.result == ResultType.FAILED for c in result.class_results)
+        result.result = ResultType.FAILED if failed else ResultType.NOT_RUN
+        return result
+
+    def import_module(self, module_path: str, result: ModuleValidationResult) -> Optional[ModuleType]:
+        """Imports the module, given its path. If it fails, the reason is recorded on the result.
+
+        Args:
+            module_path (str): Path to a module.
+            result (ModuleValidationResult): The result of validating the module.
+
+        Returns:
+            Optional[ModuleType]: The module, if it was imported.
+        """
+        module_name = get_module_name(module_path)
+        loaded_module = get_loaded_module(module_name, module_path)
+        if loaded_module is not None:
+            # Already executed, e.g. when imported by a module validated earlier in this run
+            return loaded_module
+
+        module_spec: Optional[ModuleSpec] = importlib.util.spec_from_file_location(module_name, module_path)
+
+        if not os.path.exists(module_path) or module_spec is None or not isinstance(module_spec.loader, Loader):
+            result.result = ResultType.NOT_RUN
+            result.fail_reason = f"Failed to load file from location: {module_path}"
+            return None
+
+        module_type = importlib.util.module_from_spec(module_spec)
+        registered = register_module(module_name, module_type)
+        try:
+            module_spec.loader.exec_module(module_type)
+            return module_type
+        except ModuleNotFoundError as e:
+            result.result = ResultType.FAILED
+            result.fail_reason = f"Failed to load module dependant module: {str(e)}"
+        except Exception as e:
+            result.result = ResultType.FAILED
+            result.fail_reason = f"Failed to load module (possibly due to syntax errors): {module_path} - error: {str(e)}"
+        except BaseException:
+            # E.g. interrupted by the module timeout, the partially executed module is not kept
+            if registered:
+                unregister_module(module_name, module_type)
+            raise
+
+        if registered:
+            unregister_module(module_name, module_type)
+        return None
+
     def get_global_functions(self, module: ModuleType) -> List[FunctionType]:
         """Gets the global functions of the module.
 
@@ -224,39 +438,87 @@ def get_reporter(config: Configuration, reporter: Optional[str] = None) -> Repor
         raise Exception(f"Unknown reporter: {reporter}. Please use one of the following: {', '.join(REPORTERS.keys())}")
 
 
-def main() -> None:  # pragma: no cover
-    """Main function invoked when running script.
+def get_output(reporter: Reporter, config: Configuration, result: ValidationResult) -> str:
+    """Returns the output of the reporter, followed by a summary of the counts for the text reporter.
+
+    Args:
+        reporter (Reporter): The reporter to use.
+        config (Configuration): The configuration currently used.
+        result (ValidationResult): The result of running pydoctest.
+
+    Returns:
+        str: The output.
+    """
+    output = reporter.get_output(result)
+
+    if isinstance(reporter, TextReporter) and config.verbosity != Verbosity.QUIET:
+        counts = result.get_counts()
+        output += f"Tested {counts.get_total()} function(s) across {counts.module_count} module(s).\n"
+        output += f"Succeeded: {counts.functions_succeeded}, Failed: {counts.functions_failed}, Skipped: {counts.functions_skipped}"
+    return output
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    """Returns the parser of the command line arguments.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
     """
     # TODO: Could allow arguments directly to pydoctest for overriding .json config arguments
     parser = argparse.ArgumentParser()
+    parser.add_argument("command", nargs='?', choices=['daemon', 'lsp'], help="'daemon' starts a resident process that later invocations in this directory are forwarded to, 'lsp' starts a language server on stdin and stdout")
     parser.add_argument("--config", help="Path to config JSON file, e.g. pydoctest.json")
     parser.add_argument("--reporter", help="Reporter to use, either 'json' or 'text'")
     parser.add_argument("--verbosity", help="0 = quiet, 1 = show failed, 2 = show all")
     parser.add_argument("--debug", help="Verbose logging", action='store_true')
     parser.add_argument("--version", help="Show version", action='store_true')
     parser.add_argument("--file", help="Analyze single file")
-    parser.add_argument("--parser", help="Docstring format, either: google|sphinx|numpy")
+    parser.add_argument("--parser", help="Docstring format, either: google|sphinx|numpy|auto")
+    parser.add_argument("--mode", help="How modules are loaded, either: import|static|hybrid")
+    parser.add_argument("--jobs", help="Number of processes to validate modules with, defaults to the number of CPUs")
+    parser.add_argument("--cache", help="Cache results, timings and other data between runs in the cache directory", action='store_true')
+    parser.add_argument("--no-cache", help="Do not read or write anything in the cache directory, even if enabled by the config", action='store_true')
+    parser.add_argument("--cache-dir", help="Directory to store cached results in, defaults to .pydoctest_cache")
+    parser.add_argument("--no-type-imports", help="Only resolve docstring types from modules already imported, never importing modules named by them", action='store_true')
+    parser.add_argument("--watch", help="Validate again when files change, until interrupted", action='store_true')
+    parser.add_argument("--no-daemon", help="Do not forward to a running daemon", action='store_true')
+    parser.add_argument("--preload-modules", help="Modules to import once before starting parallel workers, e.g. \"numpy, pandas\"")
+    parser.add_argument("--worker-max-modules", help="Number of modules after which a parallel worker is replaced by a new process")
+    parser.add_argument("--worker-max-memory", help="Memory in MB above which a parallel worker is replaced by a new process")
+    parser.add_argument("--isolate-modules", help="Remove the modules imported while validating each module after validating it, validating modules in a single process", action='store_true')
+    parser.add_argument("--module-timeout", help="Seconds a module may take to import and validate, before it is interrupted and failed")
+    parser.add_argument("--idle-timeout", help="Seconds without requests before the daemon shuts down, defaults to 900")
+    parser.add_argument("--stop", help="Stop the daemon running in this directory", action='store_true')
 
     parser.add_argument("--include-paths", help="Patterns to include paths by, defaults to \"**/*.py\"")
     parser.add_argument("--exclude-paths", help="Patterns to exclude paths by, defaults to \"**/__init__.py, **/setup.py\"")
     parser.add_argument("--exclude-classes", help="Patterns to exclude classes by")
     parser.add_argument("--exclude-methods", help="Patterns to exclude methods by")
     parser.add_argument("--exclude-functions", help="Patterns to exclude functions by")
+    return parser
+
 
-    args = parser.parse_args()
+def run(args: argparse.Namespace) -> int:
+    """Runs pydoctest with the parsed command line arguments in the current directory, printing the output.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
 
+    Returns:
+        int: The exit code.
+    """
     try:
         if args.version:
             print(VERSION)
-            sys.exit(0)
+            return 0
 
-        if args.debug:
-            logging.set_verbose(True)
+        logging.set_verbose(args.debug)
 
         config = get_configuration(os.getcwd(), args.config)
 
         # Imports will not work, unless we pretend this script is executed in the current directory.
-        sys.path.insert(0, '')
+        if '' not in sys.path:
+            sys.path.insert(0, '')
 
         reporter = get_reporter(config, args.reporter)
 
@@ -266,6 +528,39 @@ def main() -> None:  # pragma: no cover
         if args.parser:
             config.parser = args.parser
 
+        if args.mode:
+            config.mode = args.mode
+
+        if args.jobs:
+            config.jobs = int(args.jobs)
+
+        if args.cache:
+            config.cache = True
+
+        if args.no_cache:
+            config.cache = False
+
+        if args.cache_dir:
+            config.cache_directory = os.path.abspath(args.cache_dir)
+
+        if args.no_type_imports:
+            config.import_types = False
+
+        if args.preload_modules:
+            config.preload_modules = parse_cli_list(args.preload_modules)
+
+        if args.worker_max_modules:
+            config.worker_max_modules = int(args.worker_max_modules)
+
+        if args.worker_max_memory:
+            config.worker_max_memory_mb = int(args.worker_max_memory)
+
+        if args.isolate_modules:
+            config.isolate_modules = True
+
+        if args.module_timeout:
+            config.module_timeout = float(args.module_timeout)
+
         if args.include_paths:
             config.include_paths = parse_cli_list(args.include_paths)
 
@@ -279,31 +574,65 @@ def main() -> None:  # pragma: no cover
         if args.exclude_functions:
             config.exclude_functions = parse_cli_list(args.exclude_functions)
 
-        # Check that parser exists before running.
+        # Check that parser and mode exists before running.
         config.get_parser()
+        for parser_name in config.parser_paths.values():
+            get_parser(parser_name)
+        config.get_mode()
 
         ds = PyDoctestService(config)
 
+        if args.watch:
+            # Imported here, since pydoctest.watch imports this module
+            from pydoctest.watch import watch
+            try:
+                watch(ds, lambda r: print(get_output(reporter, config, r), flush=True), [os.path.abspath(args.file)] if args.file else None)
+            except KeyboardInterrupt:
+                return 0
+
         if args.file:
             result = ds.validate([os.path.abspath(args.file)])
         else:
             result = ds.validate()
 
-        output = reporter.get_output(result)
-
-        if isinstance(reporter, TextReporter) and config.verbosity != Verbosity.QUIET:
-            counts = result.get_counts()
-            output += f"Tested {counts.get_total()} function(s) across {counts.module_count} module(s).\n"
-            output += f"Succeeded: {counts.functions_succeeded}, Failed: {counts.functions_failed}, Skipped: {counts.functions_skipped}"
-
-        print(output)
+        print(get_output(reporter, config, result))
 
         if result.result != ResultType.OK:
-            sys.exit(1)
+            return 1
+        return 0
     except Exception as e:
         print(traceback.format_exc())
         print(f"Error occurred: {str(e)}")
-        sys.exit(1)
+        return 1
+
+
+def main() -> None:  # pragma: no cover
+    """Main function invoked when running script.
+    """
+    args = get_argument_parser().parse_args()
+    logging.set_verbose(args.debug)
+
+    if args.command == 'daemon':
+        # Imported here, since pydoctest.daemon imports this module
+        from pydoctest.daemon import run_daemon, stop_daemon
+        if args.stop:
+            sys.exit(0 if stop_daemon(os.getcwd()) else 1)
+        sys.exit(run_daemon(os.getcwd(), float(args.idle_timeout) if args.idle_timeout else None))
+
+    if args.command == 'lsp':
+        # Imported here, since pydoctest.lsp imports this module
+        from pydoctest.lsp import run_language_server
+        sys.exit(run_language_server(os.getcwd()))
+
+    if not args.no_daemon and not args.watch:
+        from pydoctest.daemon import forward_request
+        response = forward_request(os.getcwd(), sys.argv[1:])
+        if response is not None:
+            output, exit_code = response
+            print(output, end='')
+            sys.exit(exit_code)
+
+    sys.exit(run(args))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,544 @@
+"""Validates modules in a pool of processes.
+
+Every worker holds its own PyDoctestService, with its own Configuration, and returns detached results,
+which are reassembled in the order the modules were given.
+
+Modules are scheduled longest-first, so one large module started last does not keep the other workers waiting.
+The time spent validating each module is recorded in TIMINGS_FILE_NAME in the cache directory, and used to
+estimate the cost on later runs. Modules without recorded timings are estimated by their file size. Without the
+cache, timings are neither read nor written.
+
+Heavy dependencies, e.g. numpy, can be imported once in the parent process before the workers are forked, so
+the workers inherit them copy-on-write instead of importing them each. The parent freezes the garbage collector
+first, so collections in the workers do not write to, and thereby copy, the pages of the inherited objects.
+The modules are configured with preload_modules, or observed: workers report the modules outside the project
+they imported, which are saved and preloaded on the next run.
+
+Since nothing is unloaded, workers grow with every module they import. Workers are recycled, i.e. replaced by
+a new process, after worker_max_modules modules, or when their memory exceeds worker_max_memory_mb. A worker
+exceeding the memory limit while validating a module is killed, and the module is retried once on a new worker.
+Workers exceeding module_timeout are killed too, failing the module without retrying it.
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import importlib
+import traceback
+import multiprocessing
+
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from types import ModuleType
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, cast
+
+from pydoctest import logging
+from pydoctest.configuration import Configuration
+from pydoctest.validation import ModuleValidationResult, ResultType
+from pydoctest.watchdog import get_timeout_result
+
+# File in the cache directory to record the seconds spent validating each module in
+TIMINGS_FILE_NAME = 'timings.json'
+
+# Seconds between checks of the memory of busy workers, if a memory limit is configured
+MEMORY_CHECK_INTERVAL = 0.2
+
+# Times a module is validated, before it is failed because its worker exited or exceeded the memory limit
+MAX_ATTEMPTS = 2
+
+# The service of the current worker process
+__worker_service: Optional[Any] = None
+
+# Names of the modules in sys.modules of the current worker process, which were reported or inherited
+__worker_modules: Set[str] = set()
+
+
+def initialize_worker(config: Configuration, debug: bool) -> None:
+    """Creates the service used by the worker process.
+
+    Args:
+        config (Configuration): The configuration to validate with.
+        debug (bool): Whether verbose logging is enabled.
+    """
+    # Imported here, since pydoctest.main imports this module
+    from pydoctest.main import PyDoctestService
+
+    global __worker_service
+    logging.set_verbose(debug)
+    __worker_service = PyDoctestService(config)
+    __worker_service.create_symbol_index()
+    __worker_modules.update(sys.modules.keys())
+
+
+def is_dependency_module(module: ModuleType, working_directory: str) -> bool:
+    """Returns whether the module is a dependency of the project, i.e. loaded from a file outside the project,
+    or from installed packages inside it, e.g. a virtual environment in the project directory.
+
+    Args:
+        module (ModuleType): The module.
+        working_directory (str): The project directory.
+
+    Returns:
+        bool: If the module is a dependency.
+    """
+    path = getattr(module, '__file__', None)
+    if not isinstance(path, str) or getattr(module, '__name__', '').startswith(('__', 'pydoctest')):
+        return False
+    path = os.path.abspath(path)
+    if not path.startswith(os.path.join(os.path.abspath(working_directory), '')):
+        return True
+    return 'site-packages' in path.split(os.sep) or 'dist-packages' in path.split(os.sep)
+
+
+def get_new_dependency_modules() -> List[str]:
+    """Returns the dependency modules the worker imported since it last reported them.
+
+    Returns:
+        List[str]: The module names.
+    """
+    assert __worker_service is not None, "Worker was not initialized"
+    working_directory = __worker_service.config.working_directory
+    names = [name for name in list(sys.modules.keys()) if name not in __worker_modules]
+    __worker_modules.update(names)
+    return [name for name in names if is_dependency_module(sys.modules[name], working_directory)]
+
+
+def validate_module_in_worker(task: Tuple[int, str]) -> Tuple[int, ModuleValidationResult, float, List[str]]:
+    """Validates the module in the worker process.
+
+    Args:
+        task (Tuple[int, str]): The index of the module in discovery order, and the path to it.
+
+    Returns:
+        Tuple[int, ModuleValidationResult, float, List[str]]: The index, the detached result, the seconds spent validating the module and the dependency modules it imported.
+    """
+    assert __worker_service is not None, "Worker was not initialized"
+    index, module_path = task
+    start = time.perf_counter()
+    result: ModuleValidationResult = __worker_service.validate_module(module_path)
+    result.detach()
+    return index, result, time.perf_counter() - start, get_new_dependency_modules()
+
+
+def get_memory_usage(pid: Optional[int] = None) -> Optional[float]:
+    """Returns the resident memory of the process. Where it can not be read from /proc, the peak memory of
+    this process is returned instead.
+
+    Args:
+        pid (Optional[int], optional): The process, defaults to this process.
+
+    Returns:
+        Optional[float]: The memory in MB, or None if it is unknown.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if pid is not None:
+        return None
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return None
+
+
+def run_worker(connection: Connection, config: Configuration, debug: bool) -> None:
+    """Validates the modules received on the connection, until it receives None or the worker is recycled.
+    The worker reports starting each module, after which the module timeout applies, and sends each result
+    with the memory of the worker, and whether it exits to be recycled.
+
+    Args:
+        connection (Connection): The connection to the parent process.
+        config (Configuration): The configuration to validate with.
+        debug (bool): Whether verbose logging is enabled.
+    """
+    initialize_worker(config, debug)
+    modules = 0
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        connection.send(('started', task[0]))
+        try:
+            index, result, seconds, imported_modules = validate_module_in_worker(task)
+        except Exception:
+            connection.send(('error', task[0], traceback.format_exc()))
+            break
+
+        modules += 1
+        memory = get_memory_usage()
+        recycle = (config.worker_max_modules > 0 and modules >= config.worker_max_modules) or \
+            (config.worker_max_memory_mb > 0 and memory is not None and memory > config.worker_max_memory_mb)
+        connection.send(('result', index, result, seconds, imported_modules, memory, recycle))
+        if recycle:
+            break
+    connection.close()
+
+
+class WorkerProcess():
+    def __init__(self, context: Any, config: Configuration) -> None:
+        """Starts a worker process, see run_worker.
+
+        Args:
+            context (Any): The multiprocessing context to start the process with.
+            config (Configuration): The configuration to validate with.
+        """
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=run_worker, args=(child_connection, config, logging.DEBUG), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+        # The module being validated, by its index and path
+        self.task: Optional[Tuple[int, str]] = None
+
+        # When the worker started validating the module, see module_timeout
+        self.started: Optional[float] = None
+
+        # The highest memory reported by, or measured of, the worker in MB
+        self.peak_memory = 0.0
+
+    def send(self, task: Optional[Tuple[int, str]]) -> None:
+        """Sends the module to validate, or None to stop the worker.
+
+        Args:
+            task (Optional[Tuple[int, str]]): The index of the module and the path to it.
+        """
+        self.task = task
+        self.started = None
+        self.connection.send(task)
+
+    def record_memory(self, memory: Optional[float]) -> None:
+        """Records the memory of the worker, keeping the peak.
+
+        Args:
+            memory (Optional[float]): The memory in MB, if known.
+        """
+        if memory is not None:
+            self.peak_memory = max(self.peak_memory, memory)
+
+    def get_exit_reason(self) -> str:
+        """Returns the reason the worker exited, after it closed its connection unexpectedly.
+
+        Returns:
+            str: The reason, including the exit code.
+        """
+        # The connection may be closed before the process has exited
+        self.process.join(5)
+        return f"Worker exited unexpectedly with exit code {self.process.exitcode}"
+
+    def stop(self, kill: bool = False) -> None:
+        """Stops the worker, waiting for it to exit unless it is killed.
+
+        Args:
+            kill (bool, optional): Whether to kill it, instead of asking it to stop.
+        """
+        if kill:
+            self.process.kill()
+        elif self.process.is_alive():
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+        self.process.join(None if kill else 5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+def get_wait_timeout(config: Configuration, busy: List[WorkerProcess]) -> Optional[float]:
+    """Returns the seconds to wait for the busy workers, before checking their memory or the module timeout.
+
+    Args:
+        config (Configuration): The configuration to validate with.
+        busy (List[WorkerProcess]): The workers validating a module.
+
+    Returns:
+        Optional[float]: The seconds, or None to wait until a worker is done.
+    """
+    timeouts = []
+    if config.worker_max_memory_mb > 0:
+        timeouts.append(MEMORY_CHECK_INTERVAL)
+    started = [w.started for w in busy if w.started is not None]
+    if config.module_timeout > 0 and len(started) > 0:
+        timeouts.append(max(0.0, min(started) + config.module_timeout - time.perf_counter()))
+    return min(timeouts) if len(timeouts) > 0 else None
+
+
+def get_timings_path(config: Configuration) -> str:
+    """Returns the path of the file recording how long modules took to validate.
+
+    Args:
+        config (Configuration): The configuration in use.
+
+    Returns:
+        str: The path to the timings file.
+    """
+    return os.path.join(config.get_cache_directory(), TIMINGS_FILE_NAME)
+
+
+def load_timings(config: Configuration) -> Dict[str, float]:
+    """Loads the recorded seconds spent validating each module, by path relative to the working directory.
+
+    Args:
+        config (Configuration): The configuration in use.
+
+    Returns:
+        Dict[str, float]: The timings, empty if none were recorded or caching is disabled.
+    """
+    if not config.cache:
+        return {}
+    try:
+        with open(get_timings_path(config), 'r') as f:
+            timings = json.load(f)
+        return { str(path): float(seconds) for path, seconds in timings.items() }
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_timings(config: Configuration, timings: Dict[str, float]) -> None:
+    """Records the seconds spent validating each module, keeping timings of modules that still exist.
+    Nothing is recorded if caching is disabled.
+
+    Args:
+        config (Configuration): The configuration in use.
+        timings (Dict[str, float]): The new timings, by path relative to the working directory.
+    """
+    if not config.cache:
+        return
+
+    all_timings = load_timings(config)
+    all_timings.update(timings)
+    all_timings = { p: t for p, t in all_timings.items() if os.path.exists(os.path.join(config.working_directory, p)) }
+
+    path = get_timings_path(config)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.{os.getpid()}", 'w') as f:
+            json.dump(all_timings, f, indent=0, sort_keys=True)
+        os.replace(f"{path}.{os.getpid()}", path)
+    except OSError as e:
+        logging.log(f'Failed to save timings: {str(e)}')
+
+
+def load_observed_modules(config: Configuration) -> List[str]:
+    """Loads the dependency modules the workers of the previous run imported.
+
+    Args:
+        config (Configuration): The configuration in use.
+
+    Returns:
+        List[str]: The module names, empty if none were recorded or caching is disabled.
+    """
+    if not config.cache:
+        return []
+    try:
+        with open(config.get_preload_path(), 'r') as f:
+            return [str(name) for name in json.load(f)]
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def save_observed_modules(config: Configuration, module_names: Set[str]) -> None:
+    """Records the dependency modules the workers imported, to preload them on the next run.
+    Nothing is recorded if caching is disabled.
+
+    Args:
+        config (Configuration): The configuration in use.
+        module_names (Set[str]): The module names.
+    """
+    if not config.cache:
+        return
+
+    path = config.get_preload_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.{os.getpid()}", 'w') as f:
+            json.dump(sorted(module_names), f, indent=0)
+        os.replace(f"{path}.{os.getpid()}", path)
+    except OSError as e:
+        logging.log(f'Failed to save observed modules: {str(e)}')
+
+
+def get_preload_modules(config: Configuration) -> List[str]:
+    """Returns the modules to import before starting the workers.
+
+    Args:
+        config (Configuration): The configuration in use.
+
+    Returns:
+        List[str]: The configured modules, followed by the observed modules if preload_observed_modules is set.
+    """
+    module_names = list(config.preload_modules)
+    if config.preload_observed_modules:
+        module_names.extend(load_observed_modules(config))
+    return list(dict.fromkeys(module_names))
+
+
+def preload_modules(module_names: List[str]) -> None:
+    """Imports the modules in this process, so forked workers inherit them. Modules failing to import are skipped.
+
+    Args:
+        module_names (List[str]): The module names.
+    """
+    start = time.perf_counter()
+    for module_name in module_names:
+        if module_name in sys.modules:
+            continue
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            logging.log(f'Failed to preload module: {module_name} - error: {str(e)}')
+    logging.log(f'Preloaded {len(module_names)} module(s) in {time.perf_counter() - start:.3f}s')
+
+
+def get_estimated_costs(module_paths: List[str], timings: Dict[str, float], working_directory: str) -> List[float]:
+    """Estimates the seconds it takes to validate each module. Modules with recorded timings use those,
+    and others are estimated by their size, using the seconds per byte of the modules with timings.
+
+    Args:
+        module_paths (List[str]): Paths to the modules.
+        timings (Dict[str, float]): The recorded timings, by path relative to the working directory.
+        working_directory (str): The directory the timings are relative to.
+
+    Returns:
+        List[float]: The estimated cost of each module, in the order of module_paths.
+    """
+    sizes = [os.path.getsize(p) if os.path.isfile(p) else 0 for p in module_paths]
+    recorded = [timings.get(os.path.relpath(p, working_directory or '.')) for p in module_paths]
+
+    timed_seconds = sum(t for t in recorded if t is not None)
+    timed_bytes = sum(size for size, t in zip(sizes, recorded) if t is not None)
+    seconds_per_byte = timed_seconds / timed_bytes if timed_bytes > 0 and timed_seconds > 0 else 1.0
+
+    return [t if t is not None else size * seconds_per_byte for size, t in zip(sizes, recorded)]
+
+
+def validate_modules_in_parallel(config: Configuration, module_paths: List[str], jobs: int, worker_memory: Optional[List[float]] = None) -> List[ModuleValidationResult]:
+    """Validates the modules in a pool of worker processes.
+
+    Args:
+        config (Configuration): The configuration to validate with.
+        module_paths (List[str]): Paths to the modules.
+        jobs (int): The number of worker processes.
+        worker_memory (Optional[List[float]], optional): Collects the peak memory of each worker process, in MB.
+
+    Raises:
+        Exception: If validating a module raised an exception in the worker, like it would in a serial run.
+
+    Returns:
+        List[ModuleValidationResult]: The results, in the same order as module_paths.
+    """
+    processes = min(jobs, len(module_paths))
+    logging.log(f'Validating {len(module_paths)} modules using {processes} processes')
+
+    costs = get_estimated_costs(module_paths, load_timings(config), config.working_directory)
+    tasks: Deque[Tuple[int, str]] = deque(sorted(enumerate(module_paths), key=lambda task: costs[task[0]], reverse=True))
+
+    # Workers are forked after preloading, so they share the preloaded modules. Forking is not safe on macOS.
+    module_names = get_preload_modules(config)
+    fork = len(module_names) > 0 and 'fork' in multiprocessing.get_all_start_methods() and sys.platform != 'darwin'
+    if fork:
+        preload_modules(module_names)
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+    context: Any = multiprocessing.get_context('fork') if fork else multiprocessing.get_context()
+
+    results: List[Optional[ModuleValidationResult]] = [None] * len(module_paths)
+    timings: Dict[str, float] = {}
+    observed_modules: Set[str] = set()
+    attempts: Dict[int, int] = {}
+    peak_memory: List[float] = []
+    workers: List[WorkerProcess] = []
+
+    def retire(worker: WorkerProcess, kill: bool = False) -> None:
+        worker.stop(kill)
+        workers.remove(worker)
+        peak_memory.append(worker.peak_memory)
+
+    def retry(worker: WorkerProcess, reason: str) -> None:
+        # The module is retried on a new worker, or failed if it was already retried
+        assert worker.task is not None
+        index, module_path = worker.task
+        retire(worker, kill=True)
+        attempts[index] = attempts.get(index, 0) + 1
+        if attempts[index] < MAX_ATTEMPTS:
+            logging.log(f'Retrying module on a new worker: {module_path} - {reason}')
+            new_worker = WorkerProcess(context, config)
+            workers.append(new_worker)
+            new_worker.send((index, module_path))
+        else:
+            result = ModuleValidationResult(module_path)
+            result.result = ResultType.FAILED
+            result.fail_reason = f"Failed to validate module: {reason}"
+            results[index] = result
+
+    try:
+        while any(r is None for r in results):
+            # Workers are started, and replaced after being recycled, while there are modules left for them
+            while len(workers) < processes and len(tasks) > len([w for w in workers if w.task is None]):
+                workers.append(WorkerProcess(context, config))
+            for worker in workers:
+                if worker.task is None and tasks:
+                    worker.send(tasks.popleft())
+
+            busy = [w for w in workers if w.task is not None]
+            ready = wait([w.connection for w in busy] + [w.process.sentinel for w in busy], get_wait_timeout(config, busy))
+
+            for worker in busy:
+                if worker.connection in ready:
+                    try:
+                        message = worker.connection.recv()
+                    except (EOFError, OSError):
+                        retry(worker, worker.get_exit_reason())
+                        continue
+                    if message[0] == 'started':
+                        worker.started = time.perf_counter()
+                        continue
+                    if message[0] == 'error':
+                        raise Exception(f"Failed to validate module in worker: {module_paths[message[1]]}\n{message[2]}")
+
+                    _, index, result, seconds, imported_modules, memory, recycle = message
+                    results[index] = result
+                    timings[os.path.relpath(module_paths[index], config.working_directory or '.')] = seconds
+                    observed_modules.update(imported_modules)
+                    worker.record_memory(memory)
+                    worker.task = None
+                    if recycle:
+                        logging.log(f'Recycling worker {worker.process.pid} after validating {module_paths[index]}')
+                        retire(worker)
+                elif worker.process.sentinel in ready:
+                    retry(worker, worker.get_exit_reason())
+                elif config.module_timeout > 0 and worker.started is not None and \
+                        time.perf_counter() - worker.started > config.module_timeout:
+                    # Timing out depends on the module, not the worker, so it is not retried
+                    index, module_path = cast(Tuple[int, str], worker.task)
+                    elapsed = time.perf_counter() - worker.started
+                    logging.log(f'Killing worker {worker.process.pid}, module timed out after {elapsed:.2f} seconds: {module_path}')
+                    retire(worker, kill=True)
+                    results[index] = get_timeout_result(module_path, config.module_timeout, elapsed)
+                    timings[os.path.relpath(module_path, config.working_directory or '.')] = elapsed
+                elif config.worker_max_memory_mb > 0:
+                    memory = get_memory_usage(worker.process.pid)
+                    worker.record_memory(memory)
+                    if memory is not None and memory > config.worker_max_memory_mb:
+                        retry(worker, f"Worker exceeded the memory limit of {config.worker_max_memory_mb} MB, using {memory:.1f} MB")
+    finally:
+        for worker in list(workers):
+            retire(worker, kill=any(r is None for r in results))
+        if fork and hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+    if worker_memory is not None:
+        worker_memory.extend(peak_memory)
+    save_timings(config, timings)
+    if config.preload_observed_modules:
+        save_observed_modules(config, observed_modules | (set(module_names) - set(config.preload_modules)))
+    return [r for r in results if r is not None]
@@ -0,0 +1,134 @@
+"""Parser for repositories mixing docstring styles, which detects the style of each docstring and parses it
+with the parser of that style.
+
+Styles are detected by markers: an underlined section header is numpy, a field like ':param' is sphinx,
+and anything else is google, which is also the style of docstrings with only a summary.
+"""
+
+from types import ModuleType
+from typing import Dict, List, Optional, Type
+
+from pydoctest.parsers.parser import Parameter, ParsedDocstring, Parser
+from pydoctest.parsers.google_parser import GoogleParser
+from pydoctest.parsers.numpy_parser import SECTION_REGEX, NumpyParser
+from pydoctest.parsers.sphinx_parser import SphinxParser
+
+NUMPY_SECTION_HEADERS = [ 'Parameters', 'Returns', 'Raises' ]
+
+SPHINX_FIELDS = [ ':param', ':type', ':return', ':rtype', ':raises' ]
+
+
+def get_docstring_style(doc: str) -> str:
+    """Detects the style of the docstring.
+
+    Args:
+        doc (str): The docstring.
+
+    Returns:
+        str: The style, either 'google', 'numpy' or 'sphinx'.
+    """
+    if '--' in doc and any(match.group(1) in NUMPY_SECTION_HEADERS for match in SECTION_REGEX.finditer(doc)):
+        return 'numpy'
+    if ':' in doc and any(field in doc for field in SPHINX_FIELDS):
+        return 'sphinx'
+    return 'google'
+
+
+class AutoParser(Parser):
+    def __init__(self) -> None:
+        """Parser detecting the style of each docstring."""
+        super().__init__()
+        self.parsers: Dict[str, Parser] = {
+            'google': GoogleParser(),
+            'numpy': NumpyParser(),
+            'sphinx': SphinxParser(),
+        }
+
+    def get_docstring_parser(self, doc: str) -> Parser:
+        """Returns the parser of the style of the docstring.
+
+        Args:
+            doc (str): The docstring.
+
+        Returns:
+            Parser: The parser.
+        """
+        return self.parsers[get_docstring_style(doc)]
+
+    def parse(self, doc: str, module_type: ModuleType) -> ParsedDocstring:
+        """Returns the docstring parsed by the parser of its style, see Parser.parse.
+
+        Args:
+            doc (str): The docstring to parse.
+            module_type (ModuleType): The module it was extracted from.
+
+        Returns:
+            ParsedDocstring: The parsed docstring.
+        """
+        return self.get_docstring_parser(doc).parse(doc, module_type)
+
+    def parse_batch(self, docs: List[str], module_type: ModuleType) -> List[ParsedDocstring]:
+        """Parses the docstrings of each style in one batch with the parser of that style, see Parser.parse_batch.
+
+        Args:
+            docs (List[str]): The docstrings to parse.
+            module_type (ModuleType): The module they were extracted from.
+
+        Returns:
+            List[ParsedDocstring]: The parsed docstrings, in the order of the docstrings.
+        """
+        docs_by_style: Dict[str, List[str]] = {}
+        for doc in docs:
+            docs_by_style.setdefault(get_docstring_style(doc), []).append(doc)
+
+        parsed_docs: Dict[str, ParsedDocstring] = {}
+        for style, style_docs in docs_by_style.items():
+            parsed_docs.update(zip(style_docs, self.parsers[style].parse_batch(style_docs, module_type)))
+        return [parsed_docs[doc] for doc in docs]
+
+    def get_exceptions_raised(self, doc: str) -> List[str]:
+        """Returns the exceptions listed as raised in the docstring.
+
+        Args:
+            doc (str): The docstring to analyze.
+
+        Returns:
+            List[str]: List of exceptions raised.
+        """
+        return self.get_docstring_parser(doc).get_exceptions_raised(doc)
+
+    def get_summary(self, doc: str, module_type: ModuleType) -> Optional[str]:
+        """Returns the summary part of the docstring.
+
+        Args:
+            doc (str): The docstring to analyze.
+            module_type (ModuleType): The module it was extracted from.
+
+        Returns:
+            Optional[str]: The summary, if it exists.
+        """
+        return self.get_docstring_parser(doc).get_summary(doc, module_type)
+
+    def get_parameters(self, doc: str, module_type: ModuleType) -> List[Parameter]:
+        """Returns the parameters of the docstring.
+
+        Args:
+            doc (str): Function docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
+        Returns:
+            List[Parameter]: The parameters parsed from the docstring.
+        """
+        return self.get_docstring_parser(doc).get_parameters(doc, module_type)
+
+    def get_return_type(self, doc: str, module_type: ModuleType) -> Type:
+        """Returns the return type of the docstring.
+
+        Args:
+            doc (str): Function docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
+        Returns:
+            Type: The return type parsed from the docs.
+        """
+        return self.get_docstring_parser(doc).get_return_type(doc, module_type)
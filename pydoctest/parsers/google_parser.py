@@ -1,9 +1,9 @@
 import re
 import sys
 from types import ModuleType
-from typing import Dict, List, Optional, Type
+from typing import Iterable, List, Match, Optional, Type
 
-from pydoctest.parsers.parser import Parameter, Parser, Section
+from pydoctest.parsers.parser import DocstringSections, Parameter, Parser, Section
 from pydoctest.utilities import get_type_from_module
 from pydoctest.exceptions import ParseException, UnknownTypeException
 
@@ -19,40 +19,76 @@ SECTION_NAMES = {
 # It terminates with .* meaning a new match is the terminator. This should support multiline descriptions without having to consider tabs/indentation.
 ARGUMENT_REGEX = re.compile(r"\s*(?P<name>(\w+))\s*\((?P<type>[\w\.\[\], \'\|^\w]+?)(?P<optional>, optional)?\)\s*:(.*)")
 
+# Separates the Args sections of docstrings scanned in one pass. It ends the last line of a section, and is neither
+# whitespace nor a word character, so no argument line can match across it.
+BATCH_SEPARATOR = "\n\x00"
+
+
+def get_arguments_batch(arguments_sections: List[str]) -> List[List[Match[str]]]:
+    """Finds the argument lines of each Args section in one regex pass, giving the same lines as ARGUMENT_REGEX.finditer on each.
+
+    Args:
+        arguments_sections (List[str]): The Args sections of the docstrings.
+
+    Returns:
+        List[List[Match[str]]]: The matches of the argument lines of each section.
+    """
+    results: List[List[Match[str]]] = [[] for _ in arguments_sections]
+    if len(arguments_sections) == 0:
+        return results
+
+    # Matches are found in order, so the section of each match is found by moving past the sections ending before it
+    i = 0
+    end = len(arguments_sections[0])
+    for match in ARGUMENT_REGEX.finditer(BATCH_SEPARATOR.join(arguments_sections)):
+        while match.start() > end:
+            i += 1
+            end += len(BATCH_SEPARATOR) + len(arguments_sections[i])
+        results[i].append(match)
+    return results
+
 
 class GoogleParser(Parser):
 
-    def __get_sections(self, doc: str) -> Dict[Section, str]:
-        """
-        Splits the docstring into sections.
+    def split_docstrings(self, docs: List[str]) -> List[DocstringSections]:
+        """Splits the docstrings, and finds the argument lines of all their Args sections in one regex pass.
+        Identical Args sections, e.g. of overloads, are scanned once.
 
         Args:
-            doc (str): The docstring.
+            docs (List[str]): The docstrings.
 
         Returns:
-            Dict[Section, str]: A map from section-type to section-string.
+            List[DocstringSections]: The sections of each docstring, with the argument lines in scanned.
         """
-        result: Dict[Section, str] = {}
-        indices = [(section, doc.index(name)) for section, name in SECTION_NAMES.items() if name in doc]
-        sections_sorted = sorted(indices, key=lambda kv: kv[1])
+        splits = [self.split_docstring(doc) for doc in docs]
+        scanned = [s for s in splits if s.sections.get(Section.ARGUMENTS) and Section.ARGUMENTS not in s.invalid]
+        unique_sections = list(dict.fromkeys(s.sections[Section.ARGUMENTS] for s in scanned))
+        arguments = dict(zip(unique_sections, get_arguments_batch(unique_sections)))
+        for sections in scanned:
+            sections.scanned[Section.ARGUMENTS] = arguments[sections.sections[Section.ARGUMENTS]]
+        return splits
+
+    def split_docstring(self, doc: str) -> DocstringSections:
+        """Splits the docstring into the summary and the sections starting with each header, once per docstring.
+        Sections whose header appears more than once can not be split, and fail to parse.
 
-        if len(sections_sorted) > 0:
-            result[Section.SUMMARY] = doc[:sections_sorted[0][1]]
-        else:
-            result[Section.SUMMARY] = doc
-
-        for i in range(len(sections_sorted)):
-            section, index = sections_sorted[i]
-
-            if i == len(sections_sorted) - 1:
-                # Last section
-                result[section] = doc[index:]
-            else:
-                # Has section after, so use following section's index as stop index
-                result[section] = doc[index:sections_sorted[i + 1][1]]
+        Args:
+            doc (str): The docstring.
 
-        # Make sure we didn't lose any characters
-        assert sum(len(s) for s in result.values()) == len(doc)
+        Returns:
+            DocstringSections: The sections, each including its header.
+        """
+        result = DocstringSections(doc)
+        indices = sorted([(doc.find(name), section) for section, name in SECTION_NAMES.items() if name in doc])
+
+        # Each section runs until the next one, and the summary until the first one
+        stop = len(doc)
+        for index, section in reversed(indices):
+            result.sections[section] = doc[index:stop]
+            if doc.find(SECTION_NAMES[section], index + 1) >= 0:
+                result.invalid.add(section)
+            stop = index
+        result.sections[Section.SUMMARY] = doc[:stop]
 
         return result
 
@@ -62,33 +98,38 @@ class GoogleParser(Parser):
         Args:
             doc (str): The docstring to analyze.
 
+        Returns:
+            List[str]: List of exceptions raised.
+        """
+        return self.get_exceptions_raised_from_sections(self.split_docstring(doc))
+
+    def get_exceptions_raised_from_sections(self, sections: DocstringSections) -> List[str]:
+        """Returns the exceptions listed in the Raises section.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+
         Raises:
-            ParseException: If unable to parse an argument-line.
+            ParseException: If unable to parse an exception line.
 
         Returns:
             List[str]: List of exceptions raised.
         """
-        if 'Raises:' not in doc:
+        raises = sections.sections.get(Section.RAISES)
+        if raises is None:
             return []
+        if Section.RAISES in sections.invalid:
+            raise ParseException()
 
-        try:
-            _, tail = doc.split('Raises:')
-
-            if 'Returns:' in tail:
-                exceptions, returns = tail.split('Returns:')
+        exceptions = raises[len("Raises:"):]
+        exceptions_raised: List[str] = []
+        for exc_line in [x.strip() for x in exceptions.split("\n") if x]:
+            if ':' in exc_line:
+                exceptions_raised.append(exc_line.split(":")[0])
             else:
-                exceptions = tail
+                raise ParseException()
 
-            exceptions_raised: List[str] = []
-            for exc_line in [x.strip() for x in exceptions.split("\n") if x]:
-                if ':' in exc_line:
-                    exceptions_raised.append(exc_line.split(":")[0])
-                else:
-                    raise ParseException(exc_line)
-
-            return exceptions_raised
-        except Exception:
-            raise ParseException()
+        return exceptions_raised
 
     def get_summary(self, doc: str, module_type: ModuleType) -> Optional[str]:
         """Returns the summary part of the docstring.
@@ -97,26 +138,26 @@ class GoogleParser(Parser):
             doc (str): The docstring to analyze.
             module_type (ModuleType): The module it was extracted from.
 
-        Raises:
-            ParseException: If unable to parse an argument-line.
-
         Returns:
             Optional[str]: The summary, if it exists.
         """
-        try:
-            for needle in [ 'Args:', 'Raises:', 'Returns:' ]:
-                if needle in doc:
-                    summ, _ = doc.split(needle)
-                    summary = summ.strip()
-                    return summary if len(summary) > 0 else None
+        return self.get_summary_from_sections(self.split_docstring(doc), module_type)
 
-            if len(doc) > 0:
-                return doc.strip()
+    def get_summary_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Optional[str]:
+        """Returns the text before the first section.
 
-            return None
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module it was extracted from.
 
-        except Exception:
-            raise ParseException()
+        Returns:
+            Optional[str]: The summary, if it exists.
+        """
+        if len(sections.sections) == 1:
+            return sections.doc.strip() if len(sections.doc) > 0 else None
+
+        summary = sections.sections[Section.SUMMARY].strip()
+        return summary if len(summary) > 0 else None
 
     def get_parameters(self, doc: str, module_type: ModuleType) -> List[Parameter]:
         """Finds the function arguments as strings, and returns their types as Parameter instances.
@@ -125,21 +166,36 @@ class GoogleParser(Parser):
             doc (str): Function docstring.
             module_type (ModuleType): The module the docstring was extracted from.
 
+        Returns:
+            List[Parameter]: The parameters parsed from the docstring.
+        """
+        return self.get_parameters_from_sections(self.split_docstring(doc), module_type)
+
+    def get_parameters_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> List[Parameter]:
+        """Returns the parameters of the argument lines in the Args section.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
         Raises:
             ParseException: If unable to parse an argument-line.
 
         Returns:
             List[Parameter]: The parameters parsed from the docstring.
         """
-
-        sections = self.__get_sections(doc)
-        if Section.ARGUMENTS not in sections:
+        arguments_section = sections.sections.get(Section.ARGUMENTS)
+        if not arguments_section:
             return []
+        if Section.ARGUMENTS in sections.invalid:
+            raise ParseException()
 
         parameters = []
 
-        for match in re.finditer(ARGUMENT_REGEX, sections[Section.ARGUMENTS]):
-            start, end = match.span()
+        # The argument lines were found already, if the docstring was split in a batch
+        scanned = sections.scanned.get(Section.ARGUMENTS)
+        matches: Iterable[Match[str]] = scanned if scanned is not None else ARGUMENT_REGEX.finditer(arguments_section)
+        for match in matches:
             name = match.group('name').strip()
             type = match.group('type').strip()
             optional = match.group('optional')
@@ -148,9 +204,9 @@ class GoogleParser(Parser):
                 located_type = get_type_from_module(type, module_type)
                 parameters.append(Parameter(name, located_type.type, optional is not None))
             except UnknownTypeException:
-                raise ParseException(f"Unknown type '{type}' in '{sections[Section.ARGUMENTS][start:end].strip()}'")
+                raise ParseException(f"Unknown type '{type}' in '{match.group(0).strip()}'")
             except Exception:
-                raise ParseException(sections[Section.ARGUMENTS][start:end].strip())
+                raise ParseException(match.group(0).strip())
 
         # If we have an Args section, but no parameters, we must have failed to parse
         if len(parameters) == 0:
@@ -165,22 +221,33 @@ class GoogleParser(Parser):
             doc (str): Function docstring.
             module_type (ModuleType): The module the docstring was extracted from.
 
+        Returns:
+            Type: The return type parsed from the docs.
+        """
+        return self.get_return_type_from_sections(self.split_docstring(doc), module_type)
+
+    def get_return_type_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Type:
+        """Returns the type of the Returns section.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
         Raises:
             ParseException: If unable to parse the return type line.
 
         Returns:
             Type: The return type parsed from the docs.
         """
-        try:
-            if 'Returns:' not in doc:
-                return type(None)
-
-            _, returns = doc.split("Returns:")
-            try:
-                doctype, _ = returns.strip().split(":")
-            except ValueError:
-                raise ParseException(returns)
+        returns = sections.sections.get(Section.RETURNS)
+        if returns is None:
+            return type(None)
+        if Section.RETURNS in sections.invalid:
+            raise ParseException()
 
+        returns = returns[len("Returns:"):]
+        try:
+            doctype, _ = returns.strip().split(":")
             return get_type_from_module(doctype, module_type).type
         except Exception:
             raise ParseException()
@@ -5,7 +5,7 @@ import sys
 from types import ModuleType
 from typing import List, Optional, Type
 
-from pydoctest.parsers.parser import Parameter, Parser
+from pydoctest.parsers.parser import DocstringSections, Parameter, Parser, Section
 from pydoctest.utilities import get_type_from_module
 from pydoctest.exceptions import ParseException
 
@@ -18,6 +18,16 @@ https://github.com/numpy/numpydoc/issues/333
 
 """
 
+# Split by word, newline, a number of '-' and newline
+SECTION_REGEX = re.compile("([a-zA-Z]+)\n[-]+\n")
+
+# Headers of the supported sections, the rest are not supported (Yields, See Also, Warns, Warnings, Receives)
+SECTION_HEADERS = {
+    Section.ARGUMENTS: 'Parameters',
+    Section.RETURNS: 'Returns',
+    Section.RAISES: 'Raises',
+}
+
 
 class NumpyParser(Parser):
     def __init__(self) -> None:
@@ -27,42 +37,71 @@ class NumpyParser(Parser):
             # Rest are not supported (Yields, See Also, Warns, Warnings, Receives)
             'Parameters', 'Returns', 'Raises',
         ]
-        # Split by word, newline, a number of '-' and newline
-        self.section_regex = re.compile("([a-zA-Z]+)\n[-]+\n")
+        self.section_regex = SECTION_REGEX
         self.parameter_regex = re.compile(r"(\w+)\s*:\s*([\w\[\], \| \^\w]+?)(?:(, optional)|$)")
         self.returns_with_name_regex = re.compile(r"(\w+)\s*:\s*([\w\[\], \|]+)")
 
+    def split_docstring(self, doc: str) -> DocstringSections:
+        """Splits the docstring by its underlined section headers, once per docstring.
+        Sections whose header word is used in the docstring, but not as a header, fail to parse.
+
+        Args:
+            doc (str): The docstring.
+
+        Returns:
+            DocstringSections: The summary, and the text below each supported header.
+        """
+        result = DocstringSections(doc)
+        splits = self.section_regex.split(doc)
+        if splits[0] not in self.section_headers:
+            result.sections[Section.SUMMARY] = splits[0]
+
+        # The split alternates between headers and their text. They are added last to first, so the first is kept
+        texts = dict(zip(splits[-2::-2], splits[::-2]))
+
+        for section, header in SECTION_HEADERS.items():
+            if header in texts:
+                result.sections[section] = texts[header]
+            elif header in doc:
+                result.invalid.add(section)
+        return result
+
     def get_exceptions_raised(self, doc: str) -> List[str]:
         """Returns the exceptions listed as raised in the docstring.
 
         Args:
             doc (str): The docstring to analyze.
 
+        Returns:
+            List[str]: List of exceptions raised.
+        """
+        return self.get_exceptions_raised_from_sections(self.split_docstring(doc))
+
+    def get_exceptions_raised_from_sections(self, sections: DocstringSections) -> List[str]:
+        """Returns the exceptions listed in the Raises section.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+
         Raises:
-            ParseException: Raised if any error happens during parsing.
+            ParseException: Raised if the Raises section can not be found.
 
         Returns:
             List[str]: List of exceptions raised.
         """
-        if 'Raises' not in doc:
-            return []
-        try:
-            splits = self.section_regex.split(doc)
-            raises_idx = splits.index('Raises')
-            if raises_idx == -1 or len(splits) < raises_idx + 1:
+        raises_section = sections.sections.get(Section.RAISES)
+        if raises_section is None:
+            if Section.RAISES in sections.invalid:
                 raise ParseException()
+            return []
 
-            exception_section = splits[raises_idx + 1]
+        exceptions_raised: List[str] = []
+        for exn_line in raises_section.split('\n'):
+            # Heuristic: Assume errors-types are not indented and descriptions are.
+            if not exn_line.startswith(' '):
+                exceptions_raised.append(exn_line)
 
-            exceptions_raised: List[str] = []
-            for exn_line in exception_section.split('\n'):
-                # Heuristic: Assume errors-types are not indented and descriptions are.
-                if not exn_line.startswith(' '):
-                    exceptions_raised.append(exn_line)
-
-            return exceptions_raised
-        except Exception:
-            raise ParseException()
+        return exceptions_raised
 
     def get_summary(self, doc: str, module_type: ModuleType) -> Optional[str]:
         """Returns the summary part of the docstring.
@@ -71,24 +110,24 @@ class NumpyParser(Parser):
             doc (str): The docstring to analyze.
             module_type (ModuleType): The module it was extracted from.
 
-        Raises:
-            ParseException: Raised if any error happens during parsing.
-
         Returns:
             Optional[str]: The summary, if it exists.
         """
-        if len(doc) == 0:
-            return None
+        return self.get_summary_from_sections(self.split_docstring(doc), module_type)
 
-        try:
-            splits = self.section_regex.split(doc)
+    def get_summary_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Optional[str]:
+        """Returns the text before the first section header.
 
-            if len(splits) > 0 and splits[0] not in self.section_headers:
-                return splits[0]
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module it was extracted from.
 
+        Returns:
+            Optional[str]: The summary, if it exists.
+        """
+        if len(sections.doc) == 0:
             return None
-        except Exception:
-            raise ParseException()
+        return sections.sections.get(Section.SUMMARY)
 
     def get_parameters(self, doc: str, module_type: ModuleType) -> List[Parameter]:
         """Finds the function arguments as strings, and returns their types as Parameter instances.
@@ -97,38 +136,47 @@ class NumpyParser(Parser):
             doc (str): Function docstring.
             module_type (ModuleType): The module the docstring was extracted from.
 
+        Returns:
+            List[Parameter]: The parameters parsed from the docstring.
+        """
+        return self.get_parameters_from_sections(self.split_docstring(doc), module_type)
+
+    def get_parameters_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> List[Parameter]:
+        """Returns the parameters of the Parameters section.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
         Raises:
             ParseException: Raised if any error happens during parsing.
 
         Returns:
             List[Parameter]: The parameters parsed from the docstring.
         """
-        if 'Parameters' not in doc:
+        parameters_section = sections.sections.get(Section.ARGUMENTS)
+        if parameters_section is None:
+            if Section.ARGUMENTS in sections.invalid:
+                raise ParseException()
             return []
         try:
-            splits = self.section_regex.split(doc)
-            parameters_idx = splits.index('Parameters')
-            if parameters_idx == -1 or len(splits) < parameters_idx + 1:
-                raise ParseException()
-
-            parameters_section = splits[parameters_idx + 1]
             parameters: List[Parameter] = []
 
             for parameters_line in parameters_section.split('\n'):
                 matches = self.parameter_regex.findall(parameters_line)
-                
+
                 for param_name, param_type, optional in matches:
                     located_type = get_type_from_module(param_type, module_type)
                     parameters.append(Parameter(param_name, located_type.type, len(optional.strip()) > 0))
-
-            # If we have a parameters section with text, but no matches, we must have bad formatting
-            if len(parameters_section) > 0 and len(parameters) == 0:
-                raise ParseException()
-        
-            return parameters
         except Exception:
             raise ParseException()
 
+        # If we have a parameters section with text, but no matches, we must have bad formatting
+        if len(parameters_section) > 0 and len(parameters) == 0:
+            raise ParseException()
+
+        return parameters
+
     def get_return_type(self, doc: str, module_type: ModuleType) -> Type:
         """Base method for Parsers to return the return-type of a function from its docstring.
 
@@ -136,35 +184,42 @@ class NumpyParser(Parser):
             doc (str): Function docstring.
             module_type (ModuleType): The module the docstring was extracted from.
 
+        Returns:
+            Type: The return type parsed from the docs.
+        """
+        return self.get_return_type_from_sections(self.split_docstring(doc), module_type)
+
+    def get_return_type_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Type:
+        """Returns the type of the first line of the Returns section.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
         Raises:
             ParseException: Raised if an exception occurs during parsing
 
         Returns:
             Type: The return type parsed from the docs.
         """
-        # TODO: Use section split regex so we know 'Returns' is not just a random word in docstring, but actually a section header
-        if 'Returns' not in doc:
-            return type(None)
-
-        try:
-            splits = self.section_regex.split(doc)
-            parameters_idx = splits.index('Returns')
-            if parameters_idx == -1 or len(splits) < parameters_idx + 1:
+        returns_section = sections.sections.get(Section.RETURNS)
+        if returns_section is None:
+            if Section.RETURNS in sections.invalid:
                 raise ParseException()
+            return type(None)
 
-            returns_section = splits[parameters_idx + 1]
-            returns_line = returns_section.split('\n')[0]
+        returns_line = returns_section.split('\n')[0]
 
-            # Test for line with name/type combo
-            if ':' in returns_line:
-                match = self.returns_with_name_regex.match(returns_line)
-                if match is not None:
-                    name, doctype = match.groups()
-                else:
-                    raise ParseException()
-            else:
-                doctype = returns_line.rstrip('\n')
+        # Test for line with name/type combo
+        if ':' in returns_line:
+            match = self.returns_with_name_regex.match(returns_line)
+            if match is None:
+                raise ParseException()
+            name, doctype = match.groups()
+        else:
+            doctype = returns_line.rstrip('\n')
 
+        try:
             return get_type_from_module(doctype, module_type).type
         except Exception:
             raise ParseException()
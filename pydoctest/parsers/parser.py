@@ -1,5 +1,5 @@
 from enum import IntEnum
-from typing import List, Optional, Type
+from typing import Any, Callable, Dict, List, Match, Optional, Set, Tuple, Type
 from types import ModuleType
 
 
@@ -24,7 +24,125 @@ class Parameter():
         self.is_optional = is_optional
 
 
+class DocstringSections():
+    def __init__(self, doc: str) -> None:
+        """A docstring split into its sections by a parser, see Parser.split_docstring.
+        Parsers define what the text of each section is, e.g. whether it includes its header.
+
+        Args:
+            doc (str): The docstring.
+        """
+        self.doc = doc
+
+        # The text of each section found in the docstring
+        self.sections: Dict[Section, str] = {}
+
+        # Sections that could not be split out, e.g. because their header appears more than once
+        self.invalid: Set[Section] = set()
+
+        # Entries of sections found when scanning the sections of several docstrings at once, see Parser.split_docstrings
+        self.scanned: Dict[Section, List[Match[str]]] = {}
+
+
 class Parser():
+    def parse(self, doc: str, module_type: ModuleType) -> 'ParsedDocstring':
+        """Returns the parsed docstring, whose sections are parsed once when first used.
+        Parsed docstrings are memoized by content, per module since types are resolved from the module.
+
+        Args:
+            doc (str): The docstring to parse.
+            module_type (ModuleType): The module it was extracted from.
+
+        Returns:
+            'ParsedDocstring': The parsed docstring.
+        """
+        return get_parsed_docstring(self, doc, module_type)
+
+    def parse_batch(self, docs: List[str], module_type: ModuleType) -> List['ParsedDocstring']:
+        """Parses all docstrings of a module at once. The docstrings not split yet are split in one batch by
+        split_docstrings, and the splits are memoized for parsing them, which gives the same results as parse.
+
+        Args:
+            docs (List[str]): The docstrings to parse.
+            module_type (ModuleType): The module they were extracted from.
+
+        Returns:
+            List['ParsedDocstring']: The parsed docstrings, in the order of the docstrings.
+        """
+        split_docstrings(self, docs)
+        return [self.parse(doc, module_type) for doc in docs]
+
+    def split_docstrings(self, docs: List[str]) -> List[DocstringSections]:
+        """Splits the docstrings into their sections, see split_docstring. Parsers may override this to scan the
+        sections of all the docstrings together, e.g. in one regex pass, and keep the entries found in scanned.
+
+        Args:
+            docs (List[str]): The docstrings.
+
+        Returns:
+            List[DocstringSections]: The sections of each docstring, in the order of the docstrings.
+        """
+        return [self.split_docstring(doc) for doc in docs]
+
+    def split_docstring(self, doc: str) -> DocstringSections:
+        """Splits the docstring into its sections, once for all the parts parsed from it.
+        Parsers that do not override this and the *_from_sections methods parse the whole docstring for each part.
+
+        Args:
+            doc (str): The docstring.
+
+        Returns:
+            DocstringSections: The sections, empty unless overridden.
+        """
+        return DocstringSections(doc)
+
+    def get_exceptions_raised_from_sections(self, sections: DocstringSections) -> List[str]:
+        """Returns the exceptions listed as raised in the split docstring, see get_exceptions_raised.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+
+        Returns:
+            List[str]: List of exceptions raised.
+        """
+        return self.get_exceptions_raised(sections.doc)
+
+    def get_summary_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Optional[str]:
+        """Returns the summary part of the split docstring, see get_summary.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module it was extracted from.
+
+        Returns:
+            Optional[str]: The summary, if it exists.
+        """
+        return self.get_summary(sections.doc, module_type)
+
+    def get_parameters_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> List[Parameter]:
+        """Returns the parameters of the split docstring, see get_parameters.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
+        Returns:
+            List[Parameter]: The parameters parsed from the docstring.
+        """
+        return self.get_parameters(sections.doc, module_type)
+
+    def get_return_type_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Type:
+        """Returns the return type of the split docstring, see get_return_type.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
+        Returns:
+            Type: The return type parsed from the docs.
+        """
+        return self.get_return_type(sections.doc, module_type)
+
     def get_exceptions_raised(self, doc: str) -> List[str]:
         """Returns the exceptions listed as raised in the docstring.
 
@@ -83,3 +201,154 @@ class Parser():
             Type: The return type parsed from the docs.
         """
         raise NotImplementedError()
+
+
+class ParsedDocstring():
+    def __init__(self, parser: Parser, doc: str, module_type: ModuleType) -> None:
+        """A docstring parsed into its sections. The docstring is split into its sections once, the first time a
+        section is used. Each section is parsed from the split the first time it is used, and errors of parsing it
+        are raised whenever it is used, so sections that are not validated never fail.
+
+        Args:
+            parser (Parser): The parser of the docstring format.
+            doc (str): The docstring.
+            module_type (ModuleType): The module it was extracted from.
+        """
+        self.parser = parser
+        self.doc = doc
+        self.module_type = module_type
+
+        # Parsed sections, or the exception raised when parsing them
+        self.sections: Dict[str, Tuple[Any, Optional[Exception]]] = {}
+
+        # The docstring split by the parser, see Parser.split_docstring
+        self.split: Optional[DocstringSections] = None
+
+    def get_split(self) -> DocstringSections:
+        """Returns the docstring split into its sections, splitting it on first use.
+
+        Returns:
+            DocstringSections: The sections.
+        """
+        if self.split is None:
+            self.split = get_split_docstring(self.parser, self.doc)
+        return self.split
+
+    def __get_section(self, name: str, parse: Callable[[], Any]) -> Any:
+        """Returns the parsed section, parsing it on first use.
+        If parsing the section raised an exception, e.g. a ParseException, it is raised again.
+
+        Args:
+            name (str): The name of the section.
+            parse (Callable[[], Any]): Parses the section.
+
+        Returns:
+            Any: The parsed section.
+        """
+        if name not in self.sections:
+            try:
+                self.sections[name] = (parse(), None)
+            except Exception as e:
+                self.sections[name] = (None, e)
+        value, error = self.sections[name]
+        if error is not None:
+            raise error
+        return value
+
+    def get_summary(self) -> Optional[str]:
+        """Returns the summary part of the docstring, see Parser.get_summary.
+
+        Returns:
+            Optional[str]: The summary, if it exists.
+        """
+        return self.__get_section('summary', lambda: self.parser.get_summary_from_sections(self.get_split(), self.module_type))
+
+    def get_parameters(self) -> List[Parameter]:
+        """Returns the parameters of the docstring, see Parser.get_parameters.
+
+        Returns:
+            List[Parameter]: The parameters parsed from the docstring.
+        """
+        return self.__get_section('parameters', lambda: self.parser.get_parameters_from_sections(self.get_split(), self.module_type))
+
+    def get_return_type(self) -> Type:
+        """Returns the return type of the docstring, see Parser.get_return_type.
+
+        Returns:
+            Type: The return type parsed from the docs.
+        """
+        return self.__get_section('return_type', lambda: self.parser.get_return_type_from_sections(self.get_split(), self.module_type))
+
+    def get_exceptions_raised(self) -> List[str]:
+        """Returns the exceptions listed as raised in the docstring, see Parser.get_exceptions_raised.
+
+        Returns:
+            List[str]: List of exceptions raised.
+        """
+        return self.__get_section('exceptions_raised', lambda: self.parser.get_exceptions_raised_from_sections(self.get_split()))
+
+
+# Parsed docstrings by parser, content and module. The modules are kept until the next run clears them.
+__parsed_docstrings: Dict[Tuple[type, str, ModuleType], ParsedDocstring] = {}
+
+# Docstrings split by parser and content, which does not depend on the module, so modules validated statically
+# and then by importing them, or sharing docstrings, split them once
+__split_docstrings: Dict[Tuple[type, str], DocstringSections] = {}
+
+
+def get_parsed_docstring(parser: Parser, doc: str, module_type: ModuleType) -> ParsedDocstring:
+    """Returns the memoized parsed docstring, see Parser.parse.
+
+    Args:
+        parser (Parser): The parser of the docstring format.
+        doc (str): The docstring to parse.
+        module_type (ModuleType): The module it was extracted from.
+
+    Returns:
+        ParsedDocstring: The parsed docstring.
+    """
+    # Static modules record the types they could not resolve when parsing, so they are always parsed again
+    if getattr(module_type, '__unresolved_types__', None) is not None:
+        return ParsedDocstring(parser, doc, module_type)
+
+    key = (type(parser), doc, module_type)
+    parsed_doc = __parsed_docstrings.get(key)
+    if parsed_doc is None:
+        parsed_doc = __parsed_docstrings[key] = ParsedDocstring(parser, doc, module_type)
+    return parsed_doc
+
+
+def get_split_docstring(parser: Parser, doc: str) -> DocstringSections:
+    """Returns the memoized split of the docstring, see Parser.split_docstring.
+
+    Args:
+        parser (Parser): The parser of the docstring format.
+        doc (str): The docstring.
+
+    Returns:
+        DocstringSections: The sections.
+    """
+    key = (type(parser), doc)
+    sections = __split_docstrings.get(key)
+    if sections is None:
+        sections = __split_docstrings[key] = parser.split_docstring(doc)
+    return sections
+
+
+def split_docstrings(parser: Parser, docs: List[str]) -> None:
+    """Splits the docstrings that are not split yet in one batch, and memoizes the splits, see Parser.split_docstrings.
+
+    Args:
+        parser (Parser): The parser of the docstring format.
+        docs (List[str]): The docstrings.
+    """
+    unsplit = [doc for doc in dict.fromkeys(docs) if (type(parser), doc) not in __split_docstrings]
+    for doc, sections in zip(unsplit, parser.split_docstrings(unsplit)):
+        __split_docstrings[(type(parser), doc)] = sections
+
+
+def clear_parsed_docstrings() -> None:
+    """Clears the memoized docstrings, since types resolved by searching other modules may change between runs.
+    """
+    __parsed_docstrings.clear()
+    __split_docstrings.clear()
@@ -0,0 +1,95 @@
+"""Registry of docstring parsers, by the name used in the configuration.
+
+Parsers are created once per name per process, and shared by every function validated, since they hold no
+state of a particular function. Besides the parsers of pydoctest, third-party packages can provide
+parsers through the 'pydoctest.parsers' entry point group, e.g. in setup.py:
+
+    entry_points={ 'pydoctest.parsers': [ 'mystyle=mypackage.parser:MyStyleParser' ] }
+
+Entry points are only looked up and loaded when a parser of that name is selected.
+"""
+
+import sys
+
+from typing import Any, Dict, List, Type
+
+from pydoctest.parsers.parser import Parser
+from pydoctest.parsers.auto_parser import AutoParser
+from pydoctest.parsers.google_parser import GoogleParser
+from pydoctest.parsers.numpy_parser import NumpyParser
+from pydoctest.parsers.sphinx_parser import SphinxParser
+
+PARSERS: Dict[str, Type[Parser]] = {
+    'google': GoogleParser,
+    'numpy': NumpyParser,
+    'sphinx': SphinxParser,
+    'auto': AutoParser
+}
+
+ENTRY_POINT_GROUP = 'pydoctest.parsers'
+
+__parsers: Dict[str, Parser] = {}
+
+
+def get_entry_points() -> Dict[str, Any]:
+    """Returns the parser entry points installed by other packages.
+
+    Returns:
+        Dict[str, Any]: The entry points, by name.
+    """
+    if sys.version_info < (3, 8):
+        return {}
+
+    from importlib.metadata import entry_points
+    if sys.version_info < (3, 10):
+        return { entry_point.name: entry_point for entry_point in entry_points().get(ENTRY_POINT_GROUP, []) }
+    return { entry_point.name: entry_point for entry_point in entry_points(group=ENTRY_POINT_GROUP) }
+
+
+def get_parser_names() -> List[str]:
+    """Returns the names of the available parsers, including those of entry points.
+
+    Returns:
+        List[str]: The names.
+    """
+    return list(PARSERS.keys()) + [name for name in get_entry_points() if name not in PARSERS]
+
+
+def get_parser(name: str) -> Parser:
+    """Returns the parser of the name, creating it on first use.
+
+    Args:
+        name (str): The name of the parser, e.g. 'google'.
+
+    Raises:
+        Exception: If no parser has the name, or the entry point of the name is not a Parser.
+
+    Returns:
+        Parser: The parser, shared within the process.
+    """
+    if name in __parsers:
+        return __parsers[name]
+
+    if name in PARSERS:
+        parser_class = PARSERS[name]
+    else:
+        entry_points = get_entry_points()
+        if name not in entry_points:
+            raise Exception(f"Unknown parser: {name}. Please use one of the following: {', '.join(get_parser_names())}")
+        parser_class = entry_points[name].load()
+        if not isinstance(parser_class, type) or not issubclass(parser_class, Parser):
+            raise Exception(f"Parser entry point {name} is not a Parser: {parser_class}")
+
+    parser = __parsers[name] = parser_class()
+    return parser
+
+
+def register_parser(name: str, parser_class: Type[Parser]) -> None:
+    """Registers a parser under the name, e.g. for parsers that are not installed as entry points.
+
+    Args:
+        name (str): The name, used in the configuration.
+        parser_class (Type[Parser]): The parser class, which is created when it is first used.
+    """
+    PARSERS[name] = parser_class
+    __parsers.pop(name, None)
@@ -4,7 +4,7 @@ import sys
 from types import ModuleType
 from typing import List, Optional, Type
 
-from pydoctest.parsers.parser import Parameter, Parser
+from pydoctest.parsers.parser import DocstringSections, Parameter, Parser, Section
 from pydoctest.utilities import get_type_from_module
 from pydoctest.exceptions import ParseException
 
@@ -14,6 +14,13 @@ https://sphinx-rtd-tutorial.readthedocs.io/en/latest/docstrings.html
 
 """
 
+# The lines of each section start with its fields, all other lines are ignored when parsing a section
+SECTION_FIELD_REGEXES = {
+    Section.ARGUMENTS: re.compile(r"^(?::param|:type).*", re.MULTILINE),
+    Section.RAISES: re.compile(r"^:raises.*", re.MULTILINE),
+    Section.RETURNS: re.compile(r"^:rtype:.*", re.MULTILINE),
+}
+
 
 class SphinxParser(Parser):
     def __init__(self) -> None:
@@ -26,12 +33,42 @@ class SphinxParser(Parser):
 
         self.raises_regex = re.compile(r":raises\s+(\w+):")
 
+    def split_docstring(self, doc: str) -> DocstringSections:
+        """Splits the docstring into the summary, and the field lines of each section, once per docstring.
+
+        Args:
+            doc (str): The docstring.
+
+        Returns:
+            DocstringSections: The summary, and the lines starting with the fields of each section.
+        """
+        result = DocstringSections(doc)
+
+        # Find first occurance of :param, :type, :return, :rtype, :raises
+        indices = [doc.find(x) for x in [':param', ':type', ':return', ':rtype', ':raises'] if doc.find(x) >= 0]
+        result.sections[Section.SUMMARY] = doc[0: min(indices)].rstrip() if len(indices) > 0 else doc
+
+        for section, field_regex in SECTION_FIELD_REGEXES.items():
+            result.sections[section] = '\n'.join(field_regex.findall(doc))
+        return result
+
     def get_exceptions_raised(self, doc: str) -> List[str]:
         """Returns the exceptions listed as raised in the docstring.
 
         Args:
             doc (str): The docstring to analyze.
 
+        Returns:
+            List[str]: List of exceptions raised.
+        """
+        return self.get_exceptions_raised_from_sections(self.split_docstring(doc))
+
+    def get_exceptions_raised_from_sections(self, sections: DocstringSections) -> List[str]:
+        """Returns the exceptions of the :raises fields.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+
         Raises:
             ParseException: Raised if any error happens during parsing.
 
@@ -40,7 +77,7 @@ class SphinxParser(Parser):
         """
         try:
             raised_exceptions: List[str] = []
-            for line in doc.split('\n'):
+            for line in sections.sections[Section.RAISES].split('\n'):
                 match = self.raises_regex.match(line)
                 if match is None:
                     continue
@@ -57,23 +94,23 @@ class SphinxParser(Parser):
             doc (str): The docstring to analyze.
             module_type (ModuleType): The module it was extracted from.
 
-        Raises:
-            ParseException: Raised if any error happens during parsing.
+        Returns:
+            Optional[str]: The summary, if it exists.
+        """
+        return self.get_summary_from_sections(self.split_docstring(doc), module_type)
+
+    def get_summary_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Optional[str]:
+        """Returns the text before the first field.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module it was extracted from.
 
         Returns:
             Optional[str]: The summary, if it exists.
         """
-        try:
-            # Find first occurance of :param, :type, :return, :rtype, :raises
-            indices = [doc.find(x) for x in [':param', ':type', ':return', ':rtype', ':raises'] if doc.find(x) >= 0]
-            if len(indices) == 0:
-                return doc if len(doc) > 0 else None
-
-            min_index = min(indices)
-            summary = doc[0: min_index].rstrip()
-            return summary if len(summary) > 0 else None
-        except Exception as e:
-            raise ParseException()
+        summary = sections.sections[Section.SUMMARY]
+        return summary if len(summary) > 0 else None
 
     def get_parameters(self, doc: str, module_type: ModuleType) -> List[Parameter]:
         """Finds the function arguments as strings, and returns their types as Parameter instances.
@@ -82,6 +119,18 @@ class SphinxParser(Parser):
             doc (str): Function docstring.
             module_type (ModuleType): The module the docstring was extracted from.
 
+        Returns:
+            List[Parameter]: The parameters parsed from the docstring.
+        """
+        return self.get_parameters_from_sections(self.split_docstring(doc), module_type)
+
+    def get_parameters_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> List[Parameter]:
+        """Returns the parameters of the :param and :type fields.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
         Raises:
             ParseException: Raised if any error happens during parsing.
 
@@ -89,7 +138,7 @@ class SphinxParser(Parser):
             List[Parameter]: The parameters parsed from the docstring.
         """
         try:
-            lines = doc.split('\n')
+            lines = sections.sections[Section.ARGUMENTS].split('\n')
             parameters: List[Parameter] = []
             var_name: Optional[str] = None
             for line in lines:
@@ -120,6 +169,18 @@ class SphinxParser(Parser):
             doc (str): Function docstring.
             module_type (ModuleType): The module the docstring was extracted from.
 
+        Returns:
+            Type: The return type parsed from the docs.
+        """
+        return self.get_return_type_from_sections(self.split_docstring(doc), module_type)
+
+    def get_return_type_from_sections(self, sections: DocstringSections, module_type: ModuleType) -> Type:
+        """Returns the type of the first :rtype field.
+
+        Args:
+            sections (DocstringSections): The docstring split by split_docstring.
+            module_type (ModuleType): The module the docstring was extracted from.
+
         Raises:
             ParseException: Raised if an exception occurs during parsing
 
@@ -127,7 +188,7 @@ class SphinxParser(Parser):
             Type: The return type parsed from the docs.
         """
         try:
-            for line in doc.split('\n'):
+            for line in sections.sections[Section.RETURNS].split('\n'):
                 match = self.return_type_regex.match(line)
                 if match is None:
                     continue
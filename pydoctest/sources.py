@@ -0,0 +1,200 @@
+"""Source of imported modules, read and parsed once per module.
+
+Functions are mapped to their ast nodes by the first line of their code object and their name, so ranges,
+source and raised exceptions of every function in the module are served from the same tree, instead of
+finding and parsing the source of each function separately. The positions of all docstrings are found
+in one pass of tokenize, the first time a range is needed.
+"""
+
+import io
+import os
+import ast
+import bisect
+import inspect
+import linecache
+import tokenize
+
+from types import FunctionType, ModuleType
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+def get_first_line(node: FunctionNode) -> int:
+    """Returns the first line of the function, including decorators, like co_firstlineno of its code object.
+
+    Args:
+        node (FunctionNode): The function.
+
+    Returns:
+        int: The line number.
+    """
+    return min([d.lineno for d in node.decorator_list] + [node.lineno])
+
+
+class DocstringLocator():
+    def __init__(self, lines: List[str]) -> None:
+        """Finds the positions of the docstrings of all functions in the source, in one pass of tokenize.
+
+        Args:
+            lines (List[str]): The source lines.
+        """
+        self.lines = lines
+
+        # Lines of the def keywords of all functions, in order
+        self.definitions: List[int] = []
+
+        # Start line, end line, start column and end column of docstrings, by the line of the def keyword
+        self.docstrings: Dict[int, Tuple[int, int, int, int]] = {}
+
+        try:
+            self.__find_docstrings(tokenize.generate_tokens(io.StringIO(''.join(lines)).readline))
+        except (tokenize.TokenError, SyntaxError):
+            # Docstrings found before the error are kept
+            pass
+
+    def __find_docstrings(self, tokens: Iterator[tokenize.TokenInfo]) -> None:
+        """Records the docstrings, i.e. strings which are the first statement of a function body.
+
+        Args:
+            tokens (Iterator[tokenize.TokenInfo]): The tokens of the source.
+        """
+        header_line: Optional[int] = None  # The def line, while reading the function header
+        body_line: Optional[int] = None  # The def line, until the first statement of the body
+        depth = 0
+        start: Optional[Tuple[int, int]] = None
+        end: Optional[Tuple[int, int]] = None
+
+        for token in tokens:
+            if body_line is not None and start is not None and end is not None:
+                # Implicitly concatenated strings are one docstring, which must end the statement
+                if token.type == tokenize.STRING:
+                    end = token.end
+                    continue
+                if token.type in (tokenize.NL, tokenize.COMMENT):
+                    continue
+                if token.type in (tokenize.NEWLINE, tokenize.DEDENT, tokenize.ENDMARKER):
+                    self.docstrings[body_line] = (start[0], end[0], start[1], end[1])
+                body_line, start, end = None, None, None
+            elif body_line is not None:
+                if token.type in (tokenize.NEWLINE, tokenize.NL, tokenize.INDENT, tokenize.COMMENT):
+                    continue
+                if token.type == tokenize.STRING:
+                    start, end = token.start, token.end
+                    continue
+                body_line = None
+
+            if token.type == tokenize.NAME and token.string == 'def' and header_line is None:
+                header_line, depth = token.start[0], 0
+                self.definitions.append(header_line)
+            elif header_line is not None and token.type == tokenize.OP:
+                if token.string in '([{':
+                    depth += 1
+                elif token.string in ')]}':
+                    depth -= 1
+                elif token.string == ':' and depth == 0:
+                    body_line, header_line = header_line, None
+
+    def get_position(self, first_line: int) -> Optional[Tuple[int, int, int, int]]:
+        """Returns the position of the docstring of the function starting at the line.
+
+        Args:
+            first_line (int): The first line of the function, including decorators.
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: Start line, end line, start column and end column, if the function has a docstring.
+        """
+        i = bisect.bisect_left(self.definitions, first_line)
+        if i == len(self.definitions):
+            return None
+        return self.docstrings.get(self.definitions[i])
+
+
+class ModuleSource():
+    def __init__(self, path: str, lines: List[str]) -> None:
+        """Parses the source of the module, and maps its functions by their first line and name.
+
+        Args:
+            path (str): Path to the module.
+            lines (List[str]): The source lines of the module.
+        """
+        self.path = path
+        self.lines = lines
+        self.tree = ast.parse(''.join(lines), filename=path)
+
+        self.functions: Dict[Tuple[int, str], FunctionNode] = {}
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.functions[(get_first_line(node), node.name)] = node
+
+        self.__docstring_locator: Optional[DocstringLocator] = None
+
+    def get_docstring_locator(self) -> DocstringLocator:
+        """Returns the positions of the docstrings of the module, tokenizing it on first use.
+
+        Returns:
+            DocstringLocator: The positions.
+        """
+        if self.__docstring_locator is None:
+            self.__docstring_locator = DocstringLocator(self.lines)
+        return self.__docstring_locator
+
+    def get_function_node(self, fn: FunctionType) -> Optional[FunctionNode]:
+        """Returns the node of the function, unwrapping decorators like inspect does.
+
+        Args:
+            fn (FunctionType): The function.
+
+        Returns:
+            Optional[FunctionNode]: The node, or None if the function is not defined in this module.
+        """
+        code = getattr(inspect.unwrap(fn), '__code__', None)
+        if code is None or os.path.abspath(code.co_filename) != self.path:
+            return None
+        return self.functions.get((code.co_firstlineno, code.co_name))
+
+    def get_function_lines(self, node: FunctionNode) -> Optional[List[str]]:
+        """Returns the source lines of the function, including decorators.
+
+        Args:
+            node (FunctionNode): The function.
+
+        Returns:
+            Optional[List[str]]: The lines, or None if the end of the function is unknown (before Python 3.8).
+        """
+        last_line = getattr(node, 'end_lineno', None)
+        if last_line is None:
+            return None
+        return self.lines[get_first_line(node) - 1:last_line]
+
+
+__module_sources: 'WeakKeyDictionary[ModuleType, Optional[ModuleSource]]' = WeakKeyDictionary()
+
+
+def get_module_source(module: ModuleType) -> Optional[ModuleSource]:
+    """Returns the parsed source of the imported module, reading and parsing it on first use.
+
+    Args:
+        module (ModuleType): The module.
+
+    Returns:
+        Optional[ModuleSource]: The source, or None if it is not available or can not be parsed.
+    """
+    if module in __module_sources:
+        return __module_sources[module]
+
+    source = None
+    path = getattr(module, '__file__', None)
+    if path and path.endswith('.py'):
+        path = os.path.abspath(path)
+        # The module may have been imported again after changing, so lines cached by linecache are checked first
+        linecache.checkcache(path)
+        lines = linecache.getlines(path, vars(module))
+        try:
+            source = ModuleSource(path, lines) if lines else None
+        except (SyntaxError, ValueError):
+            source = None
+
+    __module_sources[module] = source
+    return source
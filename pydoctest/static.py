@@ -0,0 +1,729 @@
+"""Static validation engine.
+
+Modules are parsed with ast rather than executed. Signatures are built from the ast.FunctionDef nodes,
+and names are resolved through the module's own statements:
+- Classes defined in the module are bound to empty stand-in classes with the same qualified name.
+- Imports of modules already loaded in sys.modules are bound to the real objects.
+- Other imports are bound to placeholder classes named by their dotted path, so the same name always
+  resolves to the same object and can be compared, without importing anything.
+"""
+
+import os
+import sys
+import ast
+import inspect
+import operator
+import importlib.util
+import importlib.machinery
+from enum import Enum
+
+from types import FunctionType, ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+
+from pydoctest import logging
+from pydoctest.configuration import Configuration
+from pydoctest.exceptions import UnknownTypeException
+from pydoctest.parsers.parser import Parser
+from pydoctest.expressions import BUILTINS, CONSTANT_NODES, NamespaceResolver, compile_type_node
+from pydoctest.sources import DocstringLocator, FunctionNode, get_first_line
+from pydoctest.utilities import StaticModule, get_exceptions_raised_from_node, get_module_name, is_excluded_class, is_excluded_function
+from pydoctest.validation import (
+    ClassValidationResult, FunctionDefinition, FunctionReference, FunctionResultCache, FunctionValidationResult, ModuleValidationResult, Range,
+    ResultType, get_docstring_range, parse_docstrings, validate_function_definition
+)
+
+# Decorators which turn a function into something inspect.isfunction does not accept.
+# These are skipped when importing the module, so we skip them statically too.
+NON_FUNCTION_DECORATORS = [ 'property', 'staticmethod', 'classmethod', 'cached_property', 'lru_cache', 'cache', 'setter', 'getter', 'deleter' ]
+
+# Node of string constants, i.e. forward references
+STRING_NODE: Any = ast.Str if sys.version_info < (3, 8) else ast.Constant
+
+
+class PlaceholderType(type):
+    """Metaclass of placeholders for names imported from modules that are not loaded."""
+
+    def __getattr__(self, name: str) -> 'PlaceholderType':
+        """Attribute access on a placeholder returns the placeholder of the dotted path.
+
+        Args:
+            name (str): The attribute name.
+
+        Raises:
+            AttributeError: Raised for private and dunder attributes, which typing may probe for.
+
+        Returns:
+            'PlaceholderType': The placeholder.
+        """
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return get_placeholder(f"{self.__module__}.{self.__qualname__}.{name}")
+
+    def __getitem__(self, item: Any) -> 'PlaceholderType':
+        """Subscripting a placeholder, e.g. a generic class, returns a placeholder for the subscripted type.
+
+        Args:
+            item (Any): The subscript.
+
+        Returns:
+            'PlaceholderType': The placeholder.
+        """
+        return get_subscripted_placeholder(self, item)
+
+
+__placeholders: Dict[str, PlaceholderType] = {}
+
+
+def get_placeholder(path: str) -> PlaceholderType:
+    """Returns the placeholder class for the dotted path, creating it on first use.
+
+    Args:
+        path (str): The dotted path, e.g. "numpy.ndarray".
+
+    Returns:
+        PlaceholderType: The placeholder, which prints like a class at that path.
+    """
+    if path not in __placeholders:
+        module_name, _, name = path.rpartition('.')
+        __placeholders[path] = PlaceholderType(name, (), { '__module__': module_name, '__qualname__': name })
+    return __placeholders[path]
+
+
+def get_subscripted_placeholder(cls: type, item: Any) -> PlaceholderType:
+    """Returns the placeholder of the subscripted class, e.g. of a generic class defined in the module.
+
+    Args:
+        cls (type): The placeholder or stand-in class.
+        item (Any): The subscript.
+
+    Returns:
+        PlaceholderType: The placeholder, which prints like the subscripted class.
+    """
+    items = item if isinstance(item, tuple) else (item,)
+    arguments = ', '.join(getattr(i, '__qualname__', repr(i)) for i in items)
+    return get_placeholder(f"{cls.__module__}.{cls.__qualname__}[{arguments}]")
+
+
+def evaluate_expression(node: ast.expr, module: StaticModule) -> Any:
+    """Evaluates the type expression in the namespace of the module.
+
+    Args:
+        node (ast.expr): The expression, e.g. an annotation.
+        module (StaticModule): The module providing the namespace.
+
+    Raises:
+        UnknownTypeException: If the expression is not a type expression, or uses names the module does not bind.
+
+    Returns:
+        Any: The evaluated expression.
+    """
+    value = getattr(node, 'value' if sys.version_info >= (3, 8) else 's', None)
+    if isinstance(node, STRING_NODE) and isinstance(value, str):
+        # Like inspect.signature, string annotations (forward references) are not evaluated
+        return value
+
+    try:
+        expression = compile_type_node(node)
+    except UnknownTypeException:
+        raise UnknownTypeException(f"Was unable to statically evaluate expression on line {node.lineno} in module: {module.__file__}")
+
+    try:
+        return expression(NamespaceResolver([vars(module), BUILTINS]))
+    except (NameError, AttributeError) as e:
+        raise UnknownTypeException(f"Was unable to statically detect the type on line {node.lineno} in module: {module.__file__}: {str(e)}")
+    except Exception as e:
+        # E.g. invalid typing forms like Optional[int, str], which fail the function as when importing the module
+        raise UnknownTypeException(f"Was unable to statically evaluate the type on line {node.lineno} in module: {module.__file__}: {str(e)}")
+
+
+def get_imported_object(module_name: str, name: Optional[str] = None) -> Any:
+    """Returns the imported module, or name from it, without importing anything.
+    If the module is not loaded already, a placeholder is returned instead.
+
+    Args:
+        module_name (str): The absolute name of the module.
+        name (Optional[str], optional): The name imported from the module, if any.
+
+    Returns:
+        Any: The real object, if loaded, otherwise a placeholder.
+    """
+    path = f"{module_name}.{name}" if name else module_name
+    if path in sys.modules:
+        return sys.modules[path]
+    if name and module_name in sys.modules and hasattr(sys.modules[module_name], name):
+        return getattr(sys.modules[module_name], name)
+    return get_placeholder(path)
+
+
+def get_absolute_module_name(node: ast.ImportFrom, module: StaticModule) -> str:
+    """Returns the absolute module name of a (possibly relative) from-import.
+
+    Args:
+        node (ast.ImportFrom): The import statement.
+        module (StaticModule): The module containing the statement.
+
+    Returns:
+        str: The module name.
+    """
+    if node.level == 0:
+        return node.module or ''
+
+    package = module.__package__ or ''
+    parts = package.split('.') if package else []
+    if node.level > 1:
+        parts = parts[:-(node.level - 1)]
+    if node.module:
+        parts.append(node.module)
+    return '.'.join(parts)
+
+
+def is_enum_class(node: ast.ClassDef, module: StaticModule, enum_classes: List[Any]) -> bool:
+    """Returns whether the class derives from Enum, either directly or through a class in the module.
+
+    Args:
+        node (ast.ClassDef): The class.
+        module (StaticModule): The module containing the class.
+        enum_classes (List[Any]): Stand-ins of the enum classes found in the module so far.
+
+    Returns:
+        bool: If the class is an enum.
+    """
+    for base in node.bases:
+        try:
+            base_type = evaluate_expression(base, module)
+        except UnknownTypeException:
+            continue
+        if base_type in enum_classes or (inspect.isclass(base_type) and issubclass(base_type, Enum)):
+            return True
+    return False
+
+
+# Comparisons allowed in conditions evaluated statically, see evaluate_condition
+COMPARISON_OPERATORS: Dict[type, Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+
+
+def get_condition_value(node: ast.expr) -> Any:
+    """Returns the value of a part of a condition that does not depend on the module, e.g. sys.version_info[:2].
+
+    Args:
+        node (ast.expr): The part of the condition.
+
+    Raises:
+        UnknownTypeException: If the value is not known without executing the module.
+
+    Returns:
+        Any: The value.
+    """
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'sys' and node.attr in ('version_info', 'platform'):
+        return getattr(sys, node.attr)
+    if isinstance(node, ast.Tuple):
+        return tuple(get_condition_value(element) for element in node.elts)
+    if isinstance(node, CONSTANT_NODES):
+        return ast.literal_eval(node)
+    if isinstance(node, ast.Subscript):
+        value = get_condition_value(node.value)
+        index = node.slice.value if sys.version_info < (3, 9) and isinstance(node.slice, ast.Index) else node.slice  # type: ignore
+        if isinstance(index, ast.Slice):
+            bounds = [get_condition_value(bound) if bound is not None else None for bound in (index.lower, index.upper, index.step)]
+            return value[slice(*bounds)]
+        return value[get_condition_value(cast(ast.expr, index))]
+    raise UnknownTypeException(ast.dump(node))
+
+
+def evaluate_condition(node: ast.expr) -> Optional[bool]:
+    """Evaluates the condition of an if-statement, if it only depends on sys.version_info, sys.platform or TYPE_CHECKING.
+    TYPE_CHECKING is False, as when the module is imported.
+
+    Args:
+        node (ast.expr): The condition.
+
+    Returns:
+        Optional[bool]: The value of the condition, or None if it depends on the module.
+    """
+    if (isinstance(node, ast.Name) and node.id == 'TYPE_CHECKING') or (isinstance(node, ast.Attribute) and node.attr == 'TYPE_CHECKING'):
+        return False
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        value = evaluate_condition(node.operand)
+        return None if value is None else not value
+    if isinstance(node, ast.BoolOp):
+        values = [evaluate_condition(operand) for operand in node.values]
+        if None in values:
+            return None
+        return all(values) if isinstance(node.op, ast.And) else any(values)
+    try:
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and type(node.ops[0]) in COMPARISON_OPERATORS:
+            return COMPARISON_OPERATORS[type(node.ops[0])](get_condition_value(node.left), get_condition_value(node.comparators[0]))
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'startswith' and len(node.args) == 1:
+            return str(get_condition_value(node.func.value)).startswith(get_condition_value(node.args[0]))
+    except (UnknownTypeException, TypeError, ValueError, IndexError):
+        return None
+    return None
+
+
+def get_branches(statement: ast.If) -> List[List[ast.stmt]]:
+    """Returns the branches of the if-statement that may run, in the order their definitions are bound.
+    If the condition can not be evaluated statically, the if-branch is last, so its definitions are used.
+
+    Args:
+        statement (ast.If): The statement.
+
+    Returns:
+        List[List[ast.stmt]]: The statements of each branch.
+    """
+    condition = evaluate_condition(statement.test)
+    if condition is None:
+        return [statement.orelse, statement.body]
+    return [statement.body if condition else statement.orelse]
+
+
+def bind_statements(statements: List[ast.stmt], module: StaticModule, enum_classes: List[Any]) -> None:
+    """Binds the names the statements define in the namespace of the module, in order.
+
+    Args:
+        statements (List[ast.stmt]): The statements, e.g. the body of the module.
+        module (StaticModule): The module to bind names in.
+        enum_classes (List[Any]): Collects stand-ins of enum classes.
+    """
+    namespace = vars(module)
+    for statement in statements:
+        if isinstance(statement, ast.Import):
+            for alias in statement.names:
+                if alias.asname:
+                    namespace[alias.asname] = get_imported_object(alias.name)
+                else:
+                    # 'import a.b.c' binds 'a'
+                    top_level = alias.name.split('.')[0]
+                    loaded = alias.name in sys.modules
+                    namespace[top_level] = sys.modules[top_level] if loaded else get_placeholder(top_level)
+        elif isinstance(statement, ast.ImportFrom):
+            module_name = get_absolute_module_name(statement, module)
+            for alias in statement.names:
+                if alias.name == '*':
+                    imported = sys.modules.get(module_name)
+                    if imported is not None:
+                        names = getattr(imported, '__all__', [n for n in vars(imported) if not n.startswith('_')])
+                        namespace.update({ n: getattr(imported, n) for n in names if hasattr(imported, n) })
+                    continue
+                namespace[alias.asname or alias.name] = get_imported_object(module_name, alias.name)
+        elif isinstance(statement, ast.ClassDef):
+            namespace[statement.name] = create_class_stand_in(statement, module, statement.name, enum_classes)
+        elif isinstance(statement, (ast.Assign, ast.AnnAssign)) and statement.value is not None:
+            # Type aliases, e.g. Vector = List[float]
+            targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+            if len(targets) != 1 or not isinstance(targets[0], ast.Name):
+                continue
+            try:
+                namespace[targets[0].id] = evaluate_expression(statement.value, module)
+            except UnknownTypeException:
+                pass
+        elif isinstance(statement, ast.If):
+            for branch in get_branches(statement):
+                bind_statements(branch, module, enum_classes)
+        elif isinstance(statement, ast.Try):
+            bind_statements(statement.body, module, enum_classes)
+            for handler in statement.handlers:
+                bind_statements(handler.body, module, enum_classes)
+            bind_statements(statement.orelse, module, enum_classes)
+            bind_statements(statement.finalbody, module, enum_classes)
+
+
+def create_class_stand_in(node: ast.ClassDef, module: StaticModule, qualname: str, enum_classes: List[Any]) -> type:
+    """Creates an empty class with the same name as the class defined in the module, including its nested classes.
+
+    Args:
+        node (ast.ClassDef): The class.
+        module (StaticModule): The module containing the class.
+        qualname (str): The qualified name of the class.
+        enum_classes (List[Any]): Collects stand-ins of enum classes.
+
+    Returns:
+        type: The stand-in class.
+    """
+    # Subscripting a stand-in, e.g. of a generic class, returns a placeholder for the subscripted class
+    stand_in = type(node.name, (), {
+        '__module__': module.__name__,
+        '__qualname__': qualname,
+        '__class_getitem__': classmethod(get_subscripted_placeholder),
+    })
+    if is_enum_class(node, module, enum_classes):
+        enum_classes.append(stand_in)
+    for statement in node.body:
+        if isinstance(statement, ast.ClassDef):
+            setattr(stand_in, statement.name, create_class_stand_in(statement, module, f"{qualname}.{statement.name}", enum_classes))
+    return stand_in
+
+
+def is_validated_function(node: FunctionNode) -> bool:
+    """Returns whether the function would be validated if the module was imported.
+    Properties, static- and classmethods and cached functions are not plain functions at runtime.
+
+    Args:
+        node (FunctionNode): The function.
+
+    Returns:
+        bool: If the function should be validated.
+    """
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        name = decorator.attr if isinstance(decorator, ast.Attribute) else getattr(decorator, 'id', None)
+        if name in NON_FUNCTION_DECORATORS:
+            return False
+    return True
+
+
+def get_function_nodes(statements: List[ast.stmt], recurse: bool) -> Dict[str, FunctionNode]:
+    """Returns the functions defined by the statements, by name. Later definitions replace earlier ones.
+    Branches of if-statements are chosen like bind_statements does, see get_branches.
+
+    Args:
+        statements (List[ast.stmt]): The statements, e.g. the body of the module.
+        recurse (bool): Whether to include functions defined in if- and try-blocks.
+
+    Returns:
+        Dict[str, FunctionNode]: The functions by name.
+    """
+    functions: Dict[str, FunctionNode] = {}
+    for statement in statements:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions[statement.name] = statement
+        elif recurse and isinstance(statement, ast.If):
+            for branch in get_branches(statement):
+                functions.update(get_function_nodes(branch, recurse))
+        elif recurse and isinstance(statement, ast.Try):
+            blocks = statement.body + [s for h in statement.handlers for s in h.body] + statement.orelse + statement.finalbody
+            functions.update(get_function_nodes(blocks, recurse))
+    return functions
+
+
+class StaticFunctionDefinition(FunctionDefinition):
+    mode = 'static'
+
+    def __init__(self, node: FunctionNode, module: StaticModule, source_lines: List[str], qualname: str, inherited_docstring: Optional[str] = None) -> None:
+        """Function definition backed by the parsed source of the function.
+
+        Args:
+            node (FunctionNode): The parsed function.
+            module (StaticModule): The module containing the function.
+            source_lines (List[str]): The source lines of the module.
+            qualname (str): The qualified name of the function.
+            inherited_docstring (Optional[str], optional): Docstring of the overridden method, used if the function has none.
+        """
+        self.node = node
+        self.module = module
+        self.source_lines = source_lines
+        self.function = FunctionReference(node.name, qualname)
+        self.inherited_docstring = inherited_docstring
+
+    def get_docstring(self) -> Optional[str]:
+        """Returns the cleaned docstring of the function, like inspect.getdoc.
+
+        Returns:
+            Optional[str]: The docstring, if it exists.
+        """
+        return ast.get_docstring(self.node) or self.inherited_docstring
+
+    def get_signature(self) -> inspect.Signature:
+        """Builds the signature from the function arguments and annotations.
+
+        Raises:
+            UnknownTypeException: If an annotation could not be resolved statically.
+
+        Returns:
+            inspect.Signature: The signature.
+        """
+        try:
+            return self.__build_signature()
+        except UnknownTypeException as e:
+            self.module.__unresolved_types__.append(self.function.__qualname__)
+            raise UnknownTypeException(str(e))
+
+    def __build_signature(self) -> inspect.Signature:
+        """Builds the signature from the function arguments and annotations.
+
+        Returns:
+            inspect.Signature: The signature.
+        """
+        arguments = self.node.args
+        parameters: List[inspect.Parameter] = []
+
+        positional: List[Tuple[ast.arg, Any]] = [(a, inspect.Parameter.POSITIONAL_ONLY) for a in getattr(arguments, 'posonlyargs', [])]
+        positional += [(a, inspect.Parameter.POSITIONAL_OR_KEYWORD) for a in arguments.args]
+        first_default = len(positional) - len(arguments.defaults)
+        for i, (argument, kind) in enumerate(positional):
+            default = arguments.defaults[i - first_default] if i >= first_default else None
+            parameters.append(self.__get_parameter(argument, kind, default))
+
+        if arguments.vararg:
+            parameters.append(self.__get_parameter(arguments.vararg, inspect.Parameter.VAR_POSITIONAL))
+
+        for argument, kw_default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+            parameters.append(self.__get_parameter(argument, inspect.Parameter.KEYWORD_ONLY, kw_default))
+
+        if arguments.kwarg:
+            parameters.append(self.__get_parameter(arguments.kwarg, inspect.Parameter.VAR_KEYWORD))
+
+        return_annotation = inspect.Signature.empty
+        if self.node.returns is not None:
+            return_annotation = evaluate_expression(self.node.returns, self.module)
+
+        return inspect.Signature(parameters, return_annotation=return_annotation)
+
+    def __get_parameter(self, argument: ast.arg, kind: Any, default: Optional[ast.expr] = None) -> inspect.Parameter:
+        """Returns the signature parameter for the argument.
+
+        Args:
+            argument (ast.arg): The parsed argument.
+            kind (Any): The kind of parameter, e.g. inspect.Parameter.KEYWORD_ONLY.
+            default (Optional[ast.expr], optional): The parsed default value, if any. Only its presence matters.
+
+        Returns:
+            inspect.Parameter: The parameter.
+        """
+        annotation = inspect.Parameter.empty
+        if argument.annotation is not None:
+            annotation = evaluate_expression(argument.annotation, self.module)
+        return inspect.Parameter(argument.arg, kind, default=default if default is not None else inspect.Parameter.empty, annotation=annotation)
+
+    def get_source(self) -> str:
+        """Returns the source of the function, including decorators.
+
+        Returns:
+            str: The source.
+        """
+        last_line = getattr(self.node, 'end_lineno', None) or len(self.source_lines)
+        return ''.join(self.source_lines[self.get_first_line() - 1:last_line])
+
+    def get_first_line(self) -> int:
+        """Returns the first line of the function source, including decorators.
+
+        Returns:
+            int: The line number.
+        """
+        return get_first_line(self.node)
+
+    def get_docstring_range(self) -> Optional[Range]:
+        """Returns the range of the docstring in the function source.
+
+        Returns:
+            Optional[Range]: The range, if found.
+        """
+        # Tokenized on first use, since most modules do not need any ranges, and again if the source changed
+        locator: Optional[DocstringLocator] = getattr(self.module, '__docstring_locator__', None)
+        if locator is None or locator.lines is not self.source_lines:
+            locator = DocstringLocator(self.source_lines)
+            setattr(self.module, '__docstring_locator__', locator)
+        return get_docstring_range(locator, self.get_first_line())
+
+    def get_exceptions_raised(self) -> List[str]:
+        """Returns the exceptions explicitly raised in the function body.
+
+        Returns:
+            List[str]: The names of the exceptions raised.
+        """
+        return get_exceptions_raised_from_node(self.node)
+
+
+def load_static_module(module_path: str, source: str) -> StaticModule:
+    """Parses the module source and builds its namespace without executing it.
+
+    Args:
+        module_path (str): Path to the module.
+        source (str): The source of the module.
+
+    Returns:
+        StaticModule: The module, with the parsed tree in __tree__ and source lines in __source_lines__.
+    """
+    module = StaticModule(get_module_name(module_path), module_path)
+    tree = ast.parse(source, filename=module_path)
+
+    enum_classes: List[Any] = []
+    bind_statements(tree.body, module, enum_classes)
+
+    setattr(module, '__tree__', tree)
+    setattr(module, '__source_lines__', source.splitlines(keepends=True))
+    setattr(module, '__enum_classes__', enum_classes)
+    return module
+
+
+def validate_static_function(definition: StaticFunctionDefinition, config: Configuration, unresolved: Optional[List[FunctionValidationResult]] = None, cache: Optional[FunctionResultCache] = None, parser: Optional[Parser] = None) -> FunctionValidationResult:
+    """Validates the function from its parsed source.
+
+    Args:
+        definition (StaticFunctionDefinition): The function to validate.
+        config (Configuration): The configuration to use while validating.
+        unresolved (Optional[List[FunctionValidationResult]], optional): Collects results of functions with types that could not be resolved statically.
+        cache (Optional[FunctionResultCache], optional): Cache of function results, used if the function has not changed.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
+
+    Returns:
+        FunctionValidationResult: The result of validating this function.
+    """
+    fn = cast(FunctionType, definition.function)
+    unresolved_types = len(definition.module.__unresolved_types__)
+    if cache is not None:
+        cached_result = cache.get(definition, fn, definition.module)
+        if cached_result is not None:
+            return cached_result
+
+    result = validate_function_definition(definition, fn, config, definition.module, parser)
+    if len(definition.module.__unresolved_types__) > unresolved_types:
+        if unresolved is not None:
+            unresolved.append(result)
+    elif cache is not None:
+        # Results with unresolved types are not cached, they depend on what could be found statically
+        cache.store(definition, result)
+    return result
+
+
+def validate_static_class(node: ast.ClassDef, class_nodes: Dict[str, ast.ClassDef], module: StaticModule, config: Configuration, unresolved: Optional[List[FunctionValidationResult]] = None, cache: Optional[FunctionResultCache] = None, parser: Optional[Parser] = None) -> ClassValidationResult:
+    """Validates the class by validating each of its methods, from the parsed source.
+
+    Args:
+        node (ast.ClassDef): The class to validate.
+        class_nodes (Dict[str, ast.ClassDef]): The classes defined at the top-level of the module, used for finding inherited docstrings.
+        module (StaticModule): The module containing the class.
+        config (Configuration): The configuration to use while validating.
+        unresolved (Optional[List[FunctionValidationResult]], optional): Collects results of functions with types that could not be resolved statically.
+        cache (Optional[FunctionResultCache], optional): Cache of function results, used for methods that have not changed.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
+
+    Returns:
+        ClassValidationResult: The result of validating this class.
+    """
+    logging.log(f"Validating class: {node.name}")
+    class_result = ClassValidationResult(node.name)
+
+    methods = get_function_nodes(node.body, recurse=True)
+    for name in sorted(methods.keys()):
+        method = methods[name]
+        if not is_validated_function(method) or is_excluded_function(name, config.exclude_methods):
+            continue
+
+        inherited_docstring = get_inherited_docstring(node, name, class_nodes)
+        definition = StaticFunctionDefinition(method, module, getattr(module, '__source_lines__'), f"{node.name}.{name}", inherited_docstring)
+        function_result = validate_static_function(definition, config, unresolved, cache, parser)
+        if function_result.result == ResultType.FAILED:
+            class_result.result = ResultType.FAILED
+
+        class_result.function_results.append(function_result)
+
+    if class_result.result == ResultType.NOT_RUN:
+        class_result.result = ResultType.OK
+
+    return class_result
+
+
+def get_inherited_docstring(node: ast.ClassDef, name: str, class_nodes: Dict[str, ast.ClassDef]) -> Optional[str]:
+    """Mirrors inspect.getdoc, which uses the docstring of the overridden method when a method has none.
+    Only base classes defined in the same module can be followed statically.
+
+    Args:
+        node (ast.ClassDef): The class defining the method.
+        name (str): The name of the method.
+        class_nodes (Dict[str, ast.ClassDef]): The classes defined at the top-level of the module.
+
+    Returns:
+        Optional[str]: The docstring of the overridden method, if found.
+    """
+    for base in node.bases:
+        if not isinstance(base, ast.Name) or base.id not in class_nodes or class_nodes[base.id] is node:
+            continue
+        base_node = class_nodes[base.id]
+        methods = get_function_nodes(base_node.body, recurse=True)
+        if name in methods:
+            docstring = ast.get_docstring(methods[name])
+            if docstring:
+                return docstring
+        docstring = get_inherited_docstring(base_node, name, class_nodes)
+        if docstring:
+            return docstring
+    return None
+
+
+def validate_static_module(module_path: str, config: Configuration, unresolved: Optional[List[FunctionValidationResult]] = None, cache: Optional[FunctionResultCache] = None, parser: Optional[Parser] = None) -> ModuleValidationResult:
+    """Validates the module from its source, without importing it.
+
+    Args:
+        module_path (str): Path to a module.
+        config (Configuration): The configuration to use while validating.
+        unresolved (Optional[List[FunctionValidationResult]], optional): Collects results of functions with types that could not be resolved statically.
+        cache (Optional[FunctionResultCache], optional): Cache of function results, used for functions that have not changed.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
+
+    Returns:
+        ModuleValidationResult: Result of validating the module.
+    """
+    result = ModuleValidationResult(module_path)
+
+    if not os.path.isfile(module_path) or not module_path.endswith(tuple(importlib.machinery.SOURCE_SUFFIXES)):
+        result.result = ResultType.NOT_RUN
+        result.fail_reason = f"Failed to load file from location: {module_path}"
+        return result
+
+    try:
+        with open(module_path, 'rb') as f:
+            source = importlib.util.decode_source(f.read())
+        module = load_static_module(module_path, source)
+    except Exception as e:
+        result.result = ResultType.FAILED
+        result.fail_reason = f"Failed to load module (possibly due to syntax errors): {module_path} - error: {str(e)}"
+        return result
+
+    return validate_loaded_static_module(module, result, config, unresolved, cache, parser)
+
+
+def validate_loaded_static_module(module: StaticModule, result: ModuleValidationResult, config: Configuration, unresolved: Optional[List[FunctionValidationResult]] = None, cache: Optional[FunctionResultCache] = None, parser: Optional[Parser] = None) -> ModuleValidationResult:
+    """Validates the functions and classes of a module loaded by load_static_module.
+
+    Args:
+        module (StaticModule): The module.
+        result (ModuleValidationResult): The result to add the results of the functions and classes to.
+        config (Configuration): The configuration to use while validating.
+        unresolved (Optional[List[FunctionValidationResult]], optional): Collects results of functions with types that could not be resolved statically.
+        cache (Optional[FunctionResultCache], optional): Cache of function results, used for functions that have not changed.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
+
+    Returns:
+        ModuleValidationResult: Result of validating the module.
+    """
+    tree: ast.Module = getattr(module, '__tree__')
+    source_lines: List[str] = getattr(module, '__source_lines__')
+
+    functions = get_function_nodes(tree.body, recurse=True)
+    class_nodes: Dict[str, ast.ClassDef] = {}
+    for statement in tree.body:
+        if isinstance(statement, ast.ClassDef):
+            class_nodes[statement.name] = statement
+    if 0 < config.batch_parse_threshold <= len(functions) + sum(len(class_node.body) for class_node in class_nodes.values()):
+        methods = [node for class_node in class_nodes.values() for node in get_function_nodes(class_node.body, recurse=True).values()]
+        parse_docstrings([ast.get_docstring(node) for node in list(functions.values()) + methods], config, module, parser)
+
+    # Validate top-level functions in module
+    for name in sorted(functions.keys()):
+        node = functions[name]
+        if not is_validated_function(node) or is_excluded_function(name, config.exclude_functions):
+            continue
+        definition = StaticFunctionDefinition(node, module, source_lines, name)
+        function_result = validate_static_function(definition, config, unresolved, cache, parser)
+        if function_result.result == ResultType.FAILED:
+            result.result = ResultType.FAILED
+        result.function_results.append(function_result)
+
+    # Validate top-level classes in module
+    enum_classes: List[Any] = getattr(module, '__enum_classes__')
+    for name in sorted(class_nodes.keys()):
+        if getattr(module, name, None) in enum_classes:
+            # Ignore enums
+            continue
+        if is_excluded_class(name, config.exclude_classes):
+            continue
+
+        class_result = validate_static_class(class_nodes[name], class_nodes, module, config, unresolved, cache, parser)
+        if class_result.result == ResultType.FAILED:
+            result.result = ResultType.FAILED
+        result.class_results.append(class_result)
+
+    return result
@@ -0,0 +1,387 @@
+"""Index of the names bound by the modules reachable from the validated modules.
+
+Type strings that can be resolved neither by pydoc.locate nor from the namespace of their module, are resolved
+against the index. It is built lazily, the first time a type is not found, by a breadth-first search from the
+module over imported modules and the modules of imported classes. Modules are only indexed once per run, so
+later lookups are dictionary lookups instead of a new search.
+
+Names that indexed modules bind to different objects are ambiguous, and resolved to the binding nearest the
+validated module in the search instead, so the result does not depend on which module was searched first.
+
+The index can be saved between runs as references to where each name is defined, so it is only searched again
+for names it does not know.
+"""
+
+import os
+import sys
+import json
+import builtins
+import importlib
+import inspect
+
+from collections import deque
+from types import ModuleType
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from pydoctest import logging
+from pydoctest.expressions import evaluate_type_expression
+
+# Maximum number of modules to index from each validated module, unless configured
+DEFAULT_TYPE_SEARCH_LIMIT = 1_000
+
+# Returned by SymbolIndex.get_nearest if no module binds the name
+MISSING = object()
+
+
+class IndexedModule():
+    def __init__(self, module: ModuleType) -> None:
+        """A module in the index, with what indexing it found.
+
+        Args:
+            module (ModuleType): The module.
+        """
+        self.module = module
+
+        # Number of names the module bound when it was indexed. If it binds more or fewer, e.g. because a
+        # submodule was imported, it is indexed again.
+        self.size = 0
+
+        # Modules reachable from the module, searched from it when it is unchanged
+        self.children: List[ModuleType] = []
+
+        # Names and qualified names the module added to the index, removed with it, see SymbolIndex.remove_modules
+        self.names: List[str] = []
+        self.qualified_names: List[str] = []
+
+
+class SymbolIndex():
+    def __init__(self, search_limit: int = DEFAULT_TYPE_SEARCH_LIMIT, import_modules: bool = True) -> None:
+        """Creates an empty index.
+
+        Args:
+            search_limit (int, optional): Maximum number of modules to index from each validated module.
+            import_modules (bool, optional): Whether modules may be imported to resolve types, see Configuration.import_types.
+        """
+        self.search_limit = search_limit
+        self.import_modules = import_modules
+
+        # Objects by the name modules bind them to, the first module found in the search wins
+        self.names: Dict[str, Any] = {}
+
+        # Names modules bind to different objects, which are resolved by get_nearest instead
+        self.ambiguous_names: Set[str] = set()
+
+        # Objects by their module and name, e.g. 'pydoctest.parsers.parser.Parser'
+        self.qualified_names: Dict[str, Any] = {}
+
+        # References to where names are defined, loaded from an earlier run, by name
+        self.references: Dict[str, Tuple[str, str]] = {}
+
+        # Names resolved from the index, which are saved for later runs
+        self.resolved_names: Set[str] = set()
+
+        # Modules already indexed, by id. The modules are kept until removed, so their ids are not reused.
+        self.modules: Dict[int, IndexedModule] = {}
+
+        # How many type strings were resolved by each method, reported in debug output
+        self.statistics: Dict[str, int] = { 'locate': 0, 'eval': 0, 'index': 0, 'unknown': 0 }
+
+    def index_module(self, root: ModuleType) -> bool:
+        """Indexes the modules reachable from the module, that are not indexed yet or bind other names than when
+        they were indexed, e.g. a package whose submodule was imported after it was indexed. Indexed modules that
+        are unchanged are not indexed again, but the modules reachable from them are searched.
+
+        Args:
+            root (ModuleType): The module to search from.
+
+        Returns:
+            bool: Whether any module was indexed.
+        """
+        queue: Deque[ModuleType] = deque([root])
+        searched: Set[int] = set()
+        searches_left = self.search_limit
+        while queue:
+            module = queue.popleft()
+            if id(module) in searched:
+                continue
+            searched.add(id(module))
+
+            indexed_module = self.modules.get(id(module))
+            if indexed_module is not None and indexed_module.size == len(vars(module)):
+                queue.extend(indexed_module.children)
+                continue
+            if searches_left <= 0:
+                continue
+            searches_left -= 1
+
+            if indexed_module is None:
+                indexed_module = self.modules[id(module)] = IndexedModule(module)
+            indexed_module.size = len(vars(module))
+            indexed_module.children = []
+
+            module_name = getattr(module, '__name__', '')
+            for name, item in list(vars(module).items()):
+                if name not in self.names:
+                    self.names[name] = item
+                    indexed_module.names.append(name)
+                elif self.names[name] is not item:
+                    self.ambiguous_names.add(name)
+                qualified_name = f"{module_name}.{name}"
+                if qualified_name not in self.qualified_names:
+                    self.qualified_names[qualified_name] = item
+                    indexed_module.qualified_names.append(qualified_name)
+                if inspect.ismodule(item):
+                    indexed_module.children.append(item)
+                elif inspect.isclass(item) and item.__module__ != root.__name__:
+                    item_module = inspect.getmodule(item)
+                    if item_module:
+                        indexed_module.children.append(item_module)
+            queue.extend(indexed_module.children)
+        return searches_left < self.search_limit
+
+    def remove_modules(self, modules: List[ModuleType]) -> None:
+        """Removes the modules and the names they added from the index, so it does not keep them alive.
+        Indexed modules that bind one of those names are indexed again when they are next searched.
+
+        Args:
+            modules (List[ModuleType]): The modules to remove, e.g. removed from sys.modules.
+        """
+        removed_ids = set(id(module) for module in modules)
+        removed_names: Set[str] = set()
+        for module_id in removed_ids:
+            indexed_module = self.modules.pop(module_id, None)
+            if indexed_module is not None:
+                removed_names.update(self.__remove_names(indexed_module, lambda item: True))
+
+        for indexed_module in self.modules.values():
+            children = [child for child in indexed_module.children if id(child) not in removed_ids]
+            if len(children) < len(indexed_module.children):
+                # The module bound the removed modules themselves, e.g. a package binding its submodules
+                indexed_module.children = children
+                removed_names.update(self.__remove_names(indexed_module, lambda item: id(item) in removed_ids))
+
+        if len(removed_names) == 0:
+            return
+        self.resolved_names -= removed_names
+        for indexed_module in self.modules.values():
+            if not removed_names.isdisjoint(vars(indexed_module.module)):
+                indexed_module.size = -1
+
+    def __remove_names(self, indexed_module: IndexedModule, predicate: Callable[[Any], bool]) -> List[str]:
+        """Removes the names and qualified names the module added to the index, that are bound to items matching the predicate.
+
+        Args:
+            indexed_module (IndexedModule): The module in the index.
+            predicate (Callable[[Any], bool]): Whether to remove the name bound to the item.
+
+        Returns:
+            List[str]: The removed names.
+        """
+        removed_names = [name for name in indexed_module.names if predicate(self.names[name])]
+        for name in removed_names:
+            del self.names[name]
+        indexed_module.names = [name for name in indexed_module.names if name in self.names]
+
+        removed_qualified_names = [name for name in indexed_module.qualified_names if predicate(self.qualified_names[name])]
+        for name in removed_qualified_names:
+            del self.qualified_names[name]
+        indexed_module.qualified_names = [name for name in indexed_module.qualified_names if name in self.qualified_names]
+        return removed_names
+
+    def get(self, name: str, module: Optional[ModuleType] = None) -> Any:
+        """Returns the object bound to the name, by the index or the references of an earlier run.
+
+        Args:
+            name (str): The name.
+            module (Optional[ModuleType], optional): The module the name is looked up for. It is indexed if it is not yet,
+                so names bound differently in the modules reachable from it are known to be ambiguous, see get_nearest.
+
+        Raises:
+            KeyError: Raised if the name is not known.
+
+        Returns:
+            Any: The object.
+        """
+        if module is not None and id(module) not in self.modules and name not in self.references:
+            self.index_module(module)
+        if name in self.ambiguous_names and module is not None:
+            nearest = self.get_nearest(name, module)
+            if nearest is not MISSING:
+                return nearest
+        if name not in self.names and name in self.references:
+            module_name, attribute = self.references.pop(name)
+            try:
+                module = importlib.import_module(module_name) if self.import_modules else sys.modules[module_name]
+                self.names[name] = getattr(module, attribute)
+            except Exception:
+                pass
+        if name in self.names:
+            self.resolved_names.add(name)
+            return self.names[name]
+        raise KeyError(name)
+
+    def get_nearest(self, name: str, module: ModuleType) -> Any:
+        """Returns the object bound to the name by the indexed module nearest the module, searching the modules
+        reachable from it breadth-first in the order they were found when indexing.
+
+        Args:
+            name (str): The name.
+            module (ModuleType): The module to search from.
+
+        Returns:
+            Any: The object, or MISSING if no indexed module reachable from the module binds the name.
+        """
+        queue: Deque[ModuleType] = deque([module])
+        searched: Set[int] = set()
+        while queue:
+            current = queue.popleft()
+            if id(current) in searched:
+                continue
+            searched.add(id(current))
+            item = vars(current).get(name, MISSING)
+            if item is not MISSING:
+                return item
+            indexed_module = self.modules.get(id(current))
+            if indexed_module is not None:
+                queue.extend(indexed_module.children)
+        return MISSING
+
+    def evaluate(self, type_string: str, module: ModuleType) -> Any:
+        """Evaluates the type string in the namespace of the module, resolving names the module does not bind from the index.
+
+        Args:
+            type_string (str): String version of a type, e.g. "Optional[str]"
+            module (ModuleType): The module the type_string is extracted from.
+
+        Returns:
+            Any: The type.
+        """
+        if type_string in self.qualified_names:
+            return self.qualified_names[type_string]
+        return evaluate_type_expression(type_string, [vars(module), IndexNamespace(self, module)])
+
+    def get_references(self) -> Dict[str, Tuple[str, str]]:
+        """Returns references to where the classes resolved from the index are defined, which can be imported again in a later run.
+
+        Ambiguous names are left out, since they resolve differently depending on the module.
+
+        Returns:
+            Dict[str, Tuple[str, str]]: The module and attribute of each class, by name.
+        """
+        references = dict(self.references)
+        for name in self.resolved_names - self.ambiguous_names:
+            cls = self.names[name]
+            if not inspect.isclass(cls) or cls.__qualname__ != cls.__name__:
+                continue
+            # Only classes of modules that were imported by name can be imported again
+            class_module = sys.modules.get(cls.__module__)
+            class_name = cls.__name__
+            if class_module is not None and getattr(class_module, class_name, None) is cls:
+                references[name] = (cls.__module__, class_name)
+        return references
+
+    def save(self, path: str) -> None:
+        """Saves references to the classes resolved from the index, see get_references.
+
+        Args:
+            path (str): Path to the file to save to.
+        """
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.{os.getpid()}", 'w') as f:
+                json.dump(self.get_references(), f)
+            os.replace(f"{path}.{os.getpid()}", path)
+        except OSError as e:
+            logging.log(f'Failed to save symbol index: {path} - error: {str(e)}')
+
+    def load(self, path: str) -> None:
+        """Loads references saved by an earlier run.
+
+        Args:
+            path (str): Path to the saved file.
+        """
+        try:
+            with open(path, 'r') as f:
+                self.references = { name: (reference[0], reference[1]) for name, reference in json.load(f).items() }
+        except (OSError, ValueError, TypeError, IndexError):
+            self.references = {}
+
+    def get_statistics(self) -> str:
+        """Returns a summary of how type strings were resolved, for debug output.
+
+        Returns:
+            str: The summary.
+        """
+        counts = ', '.join(f"{method}: {count}" for method, count in self.statistics.items())
+        return f"Resolved types by {counts}. Indexed {len(self.modules)} module(s) with {len(self.names)} name(s)"
+
+
+class IndexNamespace(Mapping[str, Any]):
+    def __init__(self, index: SymbolIndex, module: ModuleType) -> None:
+        """Namespace passed as locals to eval, so names are looked up in the module first, then in builtins,
+        and finally in the index.
+
+        Args:
+            index (SymbolIndex): The index.
+            module (ModuleType): The module.
+        """
+        self.index = index
+        self.module = module
+        self.module_namespace = vars(module)
+
+    def __getitem__(self, name: str) -> Any:
+        """Returns the object the index binds to the name, unless the module or builtins bind it.
+
+        Args:
+            name (str): The name.
+
+        Raises:
+            KeyError: Raised if the module or builtins bind the name, so eval looks it up there, or the index does not know it.
+
+        Returns:
+            Any: The object.
+        """
+        if name in self.module_namespace or hasattr(builtins, name):
+            raise KeyError(name)
+        return self.index.get(name, self.module)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates the names of the index.
+
+        Returns:
+            Iterator[str]: The names.
+        """
+        return iter(self.index.names)
+
+    def __len__(self) -> int:
+        """Returns the number of names in the index.
+
+        Returns:
+            int: The number of names.
+        """
+        return len(self.index.names)
+
+
+__symbol_index: Optional[SymbolIndex] = None
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Returns the symbol index of the current run, creating it if no run has set one.
+
+    Returns:
+        SymbolIndex: The index.
+    """
+    global __symbol_index
+    if __symbol_index is None:
+        __symbol_index = SymbolIndex()
+    return __symbol_index
+
+
+def set_symbol_index(index: SymbolIndex) -> None:
+    """Sets the symbol index used for the current run.
+
+    Args:
+        index (SymbolIndex): The index.
+    """
+    global __symbol_index
+    __symbol_index = index
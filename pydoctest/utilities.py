@@ -1,14 +1,23 @@
-from collections import deque
+import os
+import sys
 import re
 import inspect
 import ast
+import builtins
+import sysconfig
+import typing
+import importlib.machinery
 
 from types import FunctionType, ModuleType
-from typing import Any, List, Optional, Type, cast
+from typing import Any, Dict, List, Optional, Set, Type, Union, cast
+from weakref import WeakKeyDictionary
 
 from pydoc import locate
 
-from pydoctest.exceptions import UnknownTypeException, ParseException
+from pydoctest.exceptions import UnknownTypeException
+from pydoctest.expressions import evaluate_type_expression
+from pydoctest.sources import get_module_source
+from pydoctest.symbols import get_symbol_index
 
 
 class LocateResult():
@@ -26,9 +35,188 @@ class LocateResult():
         self.method = method
 
 
+class StaticModule(ModuleType):
+    def __init__(self, name: str, path: str) -> None:
+        """A module whose namespace is built from its source without executing it, see pydoctest.static.
+        Type strings are only resolved against the names the module binds itself.
+
+        Args:
+            name (str): The name of the module.
+            path (str): The path to the module source.
+        """
+        super().__init__(name)
+        self.__file__ = path
+
+        # Type strings that could not be resolved from the module's own namespace
+        self.__unresolved_types__: List[str] = []
+
+
+def get_type_from_static_module(type_string: str, module: StaticModule) -> LocateResult:
+    """Returns the type, given the type_string and the statically built module it is extracted from.
+
+    Unlike get_type_from_module, this never imports or searches other modules.
+
+    Args:
+        type_string (str): String version of a type, e.g. "Optional[str]"
+        module (StaticModule): The module the type_string is extracted from.
+
+    Raises:
+        UnknownTypeException: If the type_string refers to names the module does not bind.
+
+    Returns:
+        LocateResult: A LocateResult wrapping the type when found.
+    """
+    try:
+        t = evaluate_type_expression(type_string, [vars(module)])
+        return LocateResult(t, 'static')
+    except (NameError, AttributeError):
+        module.__unresolved_types__.append(type_string)
+        raise UnknownTypeException(f"Was unable to statically detect the type of: {type_string} from module: {module.__file__}.")
+    except Exception as e:
+        # Not a name the module does not bind, but e.g. an invalid typing form, so importing the module would not resolve it
+        raise UnknownTypeException(f"Was unable to statically evaluate the type of: {type_string} from module: {module.__file__}: {str(e)}")
+
+
+# Marks names a module does not bind, when comparing the bindings of a global result
+MISSING = object()
+
+
+class TypeCache():
+    def __init__(self) -> None:
+        """Memoizes resolved type strings in two tiers.
+
+        The global tier holds type strings built only from builtins and typing, which resolve to the same type in
+        every module that does not bind those names to something else. The module tier holds everything else by
+        module and type string, including the type strings that could not be resolved.
+        """
+        # Type strings built only from builtins and typing, and the objects their names must be bound to
+        self.global_names: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        # Results of the global tier, by type string
+        self.global_types: Dict[str, LocateResult] = {}
+
+        # Results, or the messages of UnknownTypeExceptions, by module and type string. The modules are weakly
+        # referenced, so evicted modules do not keep their results.
+        self.module_types: 'WeakKeyDictionary[ModuleType, Dict[str, Union[LocateResult, str]]]' = WeakKeyDictionary()
+
+        # Hits per tier and misses, reported in debug output
+        self.statistics: Dict[str, int] = { 'global': 0, 'module': 0, 'miss': 0 }
+
+    def get_global_names(self, type_string: str) -> Optional[Dict[str, Any]]:
+        """Returns the objects the names of the type string are bound to by builtins and typing, if it only uses those.
+
+        Args:
+            type_string (str): String version of a type, e.g. "Optional[str]"
+
+        Returns:
+            Optional[Dict[str, Any]]: The objects by name, or None if the type string uses other names.
+        """
+        if type_string in self.global_names:
+            return self.global_names[type_string]
+
+        names: Optional[Dict[str, Any]] = {}
+        try:
+            nodes = list(ast.walk(ast.parse(type_string, mode='eval')))
+        except SyntaxError:
+            nodes = []
+            names = None
+        for node in nodes:
+            if not isinstance(node, ast.Name) or names is None:
+                continue
+            if node.id == 'typing':
+                names[node.id] = typing
+            elif hasattr(builtins, node.id):
+                names[node.id] = getattr(builtins, node.id)
+            elif not node.id.startswith('_') and hasattr(typing, node.id):
+                names[node.id] = getattr(typing, node.id)
+            else:
+                names = None
+
+        self.global_names[type_string] = names
+        return names
+
+    def get(self, type_string: str, module: ModuleType) -> Optional[Union[LocateResult, str]]:
+        """Returns the cached result of resolving the type string in the module.
+
+        Args:
+            type_string (str): String version of a type, e.g. "Optional[str]"
+            module (ModuleType): The module the type_string is extracted from.
+
+        Returns:
+            Optional[Union[LocateResult, str]]: The result, the message of the UnknownTypeException if it could not be resolved, or None if not cached.
+        """
+        result = self.global_types.get(type_string)
+        if result is not None:
+            names = self.get_global_names(type_string) or {}
+            namespace = vars(module)
+            # pydoc.locate does not depend on the module, but eval uses the names the module binds
+            if result.method == 'locate' or all(namespace.get(name, getattr(builtins, name, MISSING)) is value for name, value in names.items()):
+                self.statistics['global'] += 1
+                return result
+
+        module_result = self.module_types.get(module, {}).get(type_string)
+        if module_result is not None:
+            self.statistics['module'] += 1
+            return module_result
+
+        self.statistics['miss'] += 1
+        return None
+
+    def store(self, type_string: str, module: ModuleType, result: Union[LocateResult, str]) -> None:
+        """Stores the result of resolving the type string in the module.
+
+        Args:
+            type_string (str): String version of a type, e.g. "Optional[str]"
+            module (ModuleType): The module the type_string is extracted from.
+            result (Union[LocateResult, str]): The result, or the message of the UnknownTypeException if it could not be resolved.
+        """
+        if isinstance(result, LocateResult) and result.method in ('locate', 'eval') and self.get_global_names(type_string) is not None:
+            self.global_types[type_string] = result
+        else:
+            self.module_types.setdefault(module, {})[type_string] = result
+
+    def clear_modules(self) -> None:
+        """Clears the module tier, since types found by searching other modules may change between runs.
+        """
+        self.module_types = WeakKeyDictionary()
+
+    def remove_modules(self, modules: List[ModuleType]) -> None:
+        """Removes the results of the modules from the module tier, so the results do not keep them alive.
+
+        Args:
+            modules (List[ModuleType]): The modules to remove, e.g. removed from sys.modules.
+        """
+        for module in modules:
+            self.module_types.pop(module, None)
+
+    def get_statistics(self) -> str:
+        """Returns a summary of the hit rates, for debug output.
+
+        Returns:
+            str: The summary.
+        """
+        total = sum(self.statistics.values())
+        rates = ', '.join(f"{tier}: {count} ({count / max(total, 1):.0%})" for tier, count in self.statistics.items())
+        return f"Cached types by {rates}"
+
+
+__type_cache = TypeCache()
+
+
+def get_type_cache() -> TypeCache:
+    """Returns the type cache of this process.
+
+    Returns:
+        TypeCache: The cache.
+    """
+    return __type_cache
+
+
 def get_type_from_module(type_string: str, module: ModuleType) -> LocateResult:
     """Attempts to return the type, given the type_string and module it is extracted from.
 
+    Results are memoized, see TypeCache.
+
     Args:
         type_string (str): String version of a string, e.g. "Optional[str]"
         module (ModuleType): The module the type_string is extracted from.
@@ -39,42 +227,93 @@ def get_type_from_module(type_string: str, module: ModuleType) -> LocateResult:
     Returns:
         LocateResult: A LocateResult wrapping the type when found.
     """
-    # First let pydoc attempt to locate the type
-    located_type: Type = cast(Type, locate(type_string))
+    if isinstance(module, StaticModule):
+        return get_type_from_static_module(type_string, module)
+
+    cache = get_type_cache()
+    result = cache.get(type_string, module)
+    if result is None:
+        try:
+            result = locate_type_in_module(type_string, module)
+        except UnknownTypeException as e:
+            result = str(e)
+        cache.store(type_string, module, result)
+
+    if isinstance(result, str):
+        raise UnknownTypeException(result)
+    return result
+
+
+def locate_loaded(path: str) -> Any:
+    """Returns the object at the dotted path like pydoc.locate, but only from modules already imported, never importing any.
+
+    Args:
+        path (str): The dotted path, e.g. "numpy.ndarray".
+
+    Returns:
+        Any: The object, or None if the path does not refer to an object of a loaded module, or builtins.
+    """
+    parts = path.split('.')
+    obj: Any = builtins
+    attributes = parts
+    for n in range(len(parts), 0, -1):
+        module = sys.modules.get('.'.join(parts[:n]))
+        if module is not None:
+            obj, attributes = module, parts[n:]
+            break
+
+    for attribute in attributes:
+        obj = getattr(obj, attribute, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def locate_type_in_module(type_string: str, module: ModuleType) -> LocateResult:
+    """Resolves the type string by pydoc.locate, then by evaluating it in the module, and finally from the symbol index.
+
+    Args:
+        type_string (str): String version of a type, e.g. "Optional[str]"
+        module (ModuleType): The module the type_string is extracted from.
+
+    Raises:
+        UnknownTypeException: If unable to find the type.
+
+    Returns:
+        LocateResult: A LocateResult wrapping the type when found.
+    """
+    index = get_symbol_index()
+
+    # First let pydoc attempt to locate the type, or only look in loaded modules if imports are not allowed
+    located_type: Type = cast(Type, locate(type_string) if index.import_modules else locate_loaded(type_string))
     if located_type and not isinstance(located_type, ModuleType):
+        index.statistics['locate'] += 1
         return LocateResult(located_type, 'locate')
 
-    # Try to eval it.
+    # Try to evaluate it in the module.
     try:
-        # We pass the globals of module to eval, so lookups should work.
-        t = eval(type_string, vars(module))
+        # We resolve names from the globals of module, so lookups should work.
+        t = evaluate_type_expression(type_string, [vars(module)])
+        index.statistics['eval'] += 1
         return LocateResult(t, 'eval')
-    except NameError:
+    except (NameError, AttributeError):
         pass
 
-    # Search imported modules in module
-    # Inspired by this: https://stackoverflow.com/a/11781721/3717691
-    # TODO: We limit the search by count, not by depth. Should it be configurable, e.g. when large codebases?
-    SEARCHES_LEFT = 1_000
-    q = deque([module])
-    while q and SEARCHES_LEFT > 0:
-        m = q.popleft()
+    # Resolve the names the module does not bind from the symbol index. The modules reachable from
+    # the module are indexed when it is needed, unless the index already knows the names, and indexed
+    # again if they bind new names, e.g. submodules imported since.
+    for _ in range(2):
         try:
-            t = eval(type_string, vars(m))
-            return LocateResult(t, 'deque')
-        except NameError:
-            pass
-
-        for name, item in inspect.getmembers(m):
-            if inspect.ismodule(item):
-                q.append(item)
-            elif inspect.isclass(item) and item.__module__ != module.__name__:
-                mod = inspect.getmodule(item)
-                if mod:
-                    q.append(mod)
-        SEARCHES_LEFT -= 1
-
-    # TODO: We should make this configurable in config
+            t = index.evaluate(type_string, module)
+            index.statistics['index'] += 1
+            return LocateResult(t, 'index')
+        except (NameError, AttributeError):
+            if not index.index_module(module):
+                break
+
+    index.statistics['unknown'] += 1
+    if not index.import_modules:
+        raise UnknownTypeException(f"Was unable to detect the type of: {type_string} from module: {module.__file__}, without importing modules (import_types is disabled).")
     raise UnknownTypeException(f"Was unable to detect the type of: {type_string} from module: {module.__file__}.\nIf you believe this is a bug, please file it here: https://github.com/jepperaskdk/pydoctest/issues")
 
 
@@ -96,75 +335,242 @@ class RaiseVisitor(ast.NodeVisitor):
         super().visit(n)
 
 
-def dedent_from_first(source_string: str) -> str:
+def get_exceptions_raised(fn: FunctionType, module: ModuleType) -> List[str]:
+    """Get exceptions raised in fn.
+
+    NOTE: We currently only return exceptions explicitly raised by the function.
+    This means, that exceptions raised from super-calls are not returned,
+    and exceptions thrown by called functions in the function are not returned.
+
+    The function is found in the parsed source of the module defining it, see pydoctest.sources.
+
+    Args:
+        fn (FunctionType): The function to get raised exceptions from.
+        module (ModuleType): The module in which the function is defined.
+
+    Returns:
+        List[str]: The list of exceptions thrown, empty if the source of the function is not available.
     """
-    Simple method for dedenting code similar to textwrap.dedent.
-    A problem with textwrap.dedent is that it only removes common leading whitespace,
-    which is not enough when a function has multilinestrings that has no leading whitespace.
+    source = get_module_source(inspect.getmodule(fn) or module)
+    node = source.get_function_node(fn) if source else None
+    if node is None:
+        return []
+    return get_exceptions_raised_from_node(node)
+
 
-    This function dedents the entire source_string, based on the whitespace/tabs in the first line (i.e. the 'def').
+def get_exceptions_raised_from_node(node: ast.AST) -> List[str]:
+    """Get exceptions raised in the parsed function source.
 
     Args:
-        source_string (str): The source code string to dedent.
+        node (ast.AST): The parsed function, or a tree containing it.
 
     Returns:
-        str: The source code string dedented once.
+        List[str]: The list of exceptions thrown.
     """
-    def get_leading_indents(s: str) -> int:
-        return len(s) - len(s.lstrip())
+    visitor = RaiseVisitor()
+    visitor.generic_visit(node)
 
-    if get_leading_indents(source_string) == 0:
-        return source_string
+    # Make sure we dont return duplicate exceptions
+    return list(set(visitor.nodes))
 
-    lines = source_string.splitlines()
-    if len(lines) == 0:
-        return source_string
 
-    first_leading_indents = get_leading_indents(lines[0])
-    for i, line in enumerate(lines):
-        if get_leading_indents(line) != 0:
-            # TODO: We need to make sure we don't remove non-whitespace characters here.
-            lines[i] = line[first_leading_indents:]
+def get_type_paths(types: List[Any]) -> List[str]:
+    """Returns the files of the modules the types are defined in, including the arguments of generic types.
 
-    return '\n'.join(lines)
+    Args:
+        types (List[Any]): The types, e.g. as resolved from a docstring.
 
+    Returns:
+        List[str]: Paths to the modules.
+    """
+    paths = set()
+    queue = list(types)
+    while queue:
+        t = queue.pop()
+        origin = getattr(t, '__origin__', None)
+        if origin is not None:
+            # Generic aliases like List[int] are defined in typing, the types they are made of are what matters
+            queue.append(origin)
+            queue.extend(arg for arg in getattr(t, '__args__', None) or () if not isinstance(arg, (list, tuple)))
+            continue
+        module = inspect.getmodule(t)
+        path = getattr(module, '__file__', None)
+        if isinstance(path, str):
+            paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+
+def evict_modules(paths: Set[str]) -> None:
+    """Removes the modules loaded from the files from sys.modules, so they are executed again when imported.
 
-def get_exceptions_raised(fn: FunctionType, module: ModuleType) -> List[str]:
-    """Get exceptions raised in fn.
+    Args:
+        paths (Set[str]): Absolute paths to the modules.
+    """
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if isinstance(path, str) and os.path.abspath(path) in paths:
+            del sys.modules[name]
 
-    NOTE: We currently only return exceptions explicitly raised by the function.
-    This means, that exceptions raised from super-calls are not returned,
-    and exceptions thrown by called functions in the function are not returned.
+
+def get_module_name(module_path: str) -> str:
+    """Returns the name a module is loaded with when validated, i.e. its dotted name in the outermost package
+    containing it, e.g. 'pydoctest.parsers.parser'. Modules outside packages are named by their file name.
 
     Args:
-        fn (FunctionType): The function to get raised exceptions from.
-        module (ModuleType): The module in which the function is defined.
+        module_path (str): Path to a module.
+
+    Returns:
+        str: The module name.
+    """
+    directory, file_name = os.path.split(os.path.abspath(module_path))
+    name = os.path.splitext(file_name)[0]
+    parts = [] if name == '__init__' else [name]
+    while os.path.isfile(os.path.join(directory, '__init__.py')):
+        directory, package = os.path.split(directory)
+        if not package:
+            break
+        parts.insert(0, package)
+    return '.'.join(parts) or name
 
-    Raises:
-        ParseException: If failing to parse the AST of the source code.
+
+# Modification times of the files of the modules registered by register_module, by path
+__module_times: Dict[str, int] = {}
+
+
+def get_file_time(path: str) -> Optional[int]:
+    """Returns the modification time of the file.
+
+    Args:
+        path (str): Path to the file.
 
     Returns:
-        List[str]: The list of exceptions thrown.
+        Optional[int]: The modification time in nanoseconds, or None if the file can not be read.
     """
-    fn_source = inspect.getsource(fn)
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-    tree: Optional[Any] = None
-    # Try to parse, and if IndentationError, dedent.
-    for _ in range(2):
-        try:
-            tree = ast.parse(fn_source)
-            break
-        except IndentationError as e:
-            fn_source = dedent_from_first(fn_source)
 
-    if tree is None:
-        raise ParseException("Failed to parse function source code to detect raised exceptions")
+def get_loaded_module(module_name: str, module_path: str) -> Optional[ModuleType]:
+    """Returns the module of the file from sys.modules, if it is loaded under the name already, e.g. since another
+    module imported it. Modules registered by register_module, whose file changed since, are removed instead.
 
-    visitor = RaiseVisitor()
-    visitor.generic_visit(tree)
+    Args:
+        module_name (str): The name of the module, see get_module_name.
+        module_path (str): Path to the module.
 
-    # Make sure we dont return duplicate exceptions
-    return list(set(visitor.nodes))
+    Returns:
+        Optional[ModuleType]: The module, if it is loaded and unchanged.
+    """
+    module = sys.modules.get(module_name)
+    path = getattr(module, '__file__', None)
+    if module is None or not isinstance(path, str) or os.path.abspath(path) != os.path.abspath(module_path):
+        return None
+
+    path = os.path.abspath(path)
+    if path in __module_times and __module_times[path] != get_file_time(path):
+        evict_modules({ path })
+        return None
+    return module
+
+
+def register_module(module_name: str, module: ModuleType) -> bool:
+    """Registers the module in sys.modules before it is executed, like importing it would, so modules importing it
+    while it is validated use the same module instead of executing it again.
+
+    Args:
+        module_name (str): The name of the module, see get_module_name.
+        module (ModuleType): The module, not executed yet.
+
+    Returns:
+        bool: Whether it was registered. Modules are not registered if a module not registered by register_module,
+            e.g. of the standard library, is loaded under the name.
+    """
+    if module_name in sys.modules:
+        loaded_path = getattr(sys.modules[module_name], '__file__', None)
+        if not isinstance(loaded_path, str) or os.path.abspath(loaded_path) not in __module_times:
+            return False
+        __module_times.pop(os.path.abspath(loaded_path))
+    sys.modules[module_name] = module
+    path = getattr(module, '__file__', None)
+    if isinstance(path, str):
+        __module_times[os.path.abspath(path)] = get_file_time(os.path.abspath(path)) or 0
+    return True
+
+
+def unregister_module(module_name: str, module: ModuleType) -> None:
+    """Removes the module registered by register_module, e.g. if executing it failed.
+
+    Args:
+        module_name (str): The name of the module.
+        module (ModuleType): The module.
+    """
+    if sys.modules.get(module_name) is module:
+        del sys.modules[module_name]
+    path = getattr(module, '__file__', None)
+    if isinstance(path, str):
+        __module_times.pop(os.path.abspath(path), None)
+
+
+def is_shared_module(module: Any) -> bool:
+    """Returns whether the module must be kept when removing the modules a module imported, see restore_modules.
+    Modules of the standard library are shared by everything, and built-in and extension modules can not be
+    loaded again.
+
+    Args:
+        module (Any): The module in sys.modules.
+
+    Returns:
+        bool: Whether it is shared.
+    """
+    if module is None:
+        return False
+    path = getattr(module, '__file__', None)
+    if not isinstance(path, str):
+        # Built-in modules and namespace packages
+        return True
+    if path.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES)):
+        return True
+    path = os.path.abspath(path)
+    stdlib_paths = { os.path.abspath(sysconfig.get_paths()[name]) + os.sep for name in [ 'stdlib', 'platstdlib' ] }
+    return any(path.startswith(p) for p in stdlib_paths) and 'site-packages' not in path and 'dist-packages' not in path
+
+
+def restore_modules(snapshot: Set[str], shared_packages: Set[str]) -> List[str]:
+    """Removes the modules added to sys.modules since the snapshot was taken, so they can be collected.
+    They are also removed from the symbol index and type cache of this process.
+    Top-level packages of shared_packages, or containing a shared module, are kept entirely.
+
+    Args:
+        snapshot (Set[str]): The names in sys.modules when the snapshot was taken.
+        shared_packages (Set[str]): Names of top-level packages to keep, e.g. preloaded modules.
+
+    Returns:
+        List[str]: The names of the removed modules.
+    """
+    new_names = [name for name in sys.modules if name not in snapshot]
+    kept_packages = set(shared_packages)
+    kept_packages.update(name.split('.')[0] for name in new_names if is_shared_module(sys.modules[name]))
+
+    removed = [name for name in new_names if name.split('.')[0] not in kept_packages]
+    removed_modules: List[ModuleType] = []
+    for name in removed:
+        module = sys.modules.pop(name)
+        removed_modules.append(module)
+        path = getattr(module, '__file__', None)
+        if isinstance(path, str):
+            __module_times.pop(os.path.abspath(path), None)
+
+        # Importing a submodule binds it in its package, which may be kept
+        parent, _, child = name.rpartition('.')
+        if parent and getattr(sys.modules.get(parent), child, None) is module:
+            delattr(sys.modules[parent], child)
+
+    # The index and type cache of this process would otherwise keep the modules alive
+    get_symbol_index().remove_modules(removed_modules)
+    get_type_cache().remove_modules(removed_modules)
+    return removed
 
 
 def parse_cli_list(content: str, separator: str = ',') -> List[str]:
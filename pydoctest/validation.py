@@ -4,13 +4,14 @@ from sys import modules
 import types
 
 from types import FunctionType, ModuleType
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Tuple, Type, cast
 
 from pydoctest.logging import log
 from pydoctest.configuration import Configuration
-from pydoctest.parsers.parser import Parameter
-from pydoctest.exceptions import ParseException
-from pydoctest.utilities import get_exceptions_raised, is_excluded_function
+from pydoctest.parsers.parser import Parameter, Parser
+from pydoctest.exceptions import ParseException, UnknownTypeException
+from pydoctest.sources import DocstringLocator, get_first_line, get_module_source
+from pydoctest.utilities import get_exceptions_raised, get_exceptions_raised_from_node, get_type_paths, is_excluded_function
 
 
 class Range():
@@ -89,6 +90,38 @@ class Result():
         return { 'result': self.result, 'fail_reason': self.fail_reason }
 
 
+class FunctionReference():
+    def __init__(self, name: str, qualname: str) -> None:
+        """Lightweight stand-in for a function object, used when results are produced without the function itself.
+
+        Args:
+            name (str): The name of the function.
+            qualname (str): The qualified name of the function, e.g. "ExampleClass.func".
+        """
+        self.__name__ = name
+        self.__qualname__ = qualname
+
+    def __repr__(self) -> str:
+        """Mirrors the representation of a function object, so reporters output the same.
+
+        Returns:
+            str: The representation.
+        """
+        return f"<function {self.__qualname__} at {hex(id(self))}>"
+
+
+class ModuleReference():
+    def __init__(self, name: str, file: Optional[str]) -> None:
+        """Lightweight stand-in for a module object, used when results are detached from the module itself.
+
+        Args:
+            name (str): The name of the module.
+            file (Optional[str]): The path to the module.
+        """
+        self.__name__ = name
+        self.__file__ = file
+
+
 class FunctionValidationResult(Result):
     def __init__(self, function: FunctionType, module: ModuleType) -> None:
         """Result class for storing results of testing functions.
@@ -102,6 +135,12 @@ class FunctionValidationResult(Result):
         self.function = function
         self.range: Optional[Range] = None
 
+        # Which engine validated the function, 'import' or 'static'
+        self.mode = 'import'
+
+        # Files of the modules the docstring types were resolved from
+        self.type_paths: List[str] = []
+
     def to_dict(self) -> Dict[str, Any]:
         """Serializes this class to dict, which is useful for the JSONReporter.
 
@@ -111,9 +150,19 @@ class FunctionValidationResult(Result):
         return {
             **super().to_dict(),
             'function': str(self.function),
-            'range': self.range.to_dict() if self.range else None
+            'range': self.range.to_dict() if self.range else None,
+            'mode': self.mode
         }
 
+    def detach(self) -> None:
+        """Replaces the function and module with lightweight references, so the result can be pickled
+        and does not keep the module alive.
+        """
+        if not isinstance(self.function, FunctionReference):
+            self.function = cast(FunctionType, FunctionReference(self.function.__name__, self.function.__qualname__))
+        if not isinstance(self.module, ModuleReference):
+            self.module = cast(ModuleType, ModuleReference(self.module.__name__, getattr(self.module, '__file__', None)))
+
 
 class ClassValidationResult(Result):
     def __init__(self, class_name: str) -> None:
@@ -140,6 +189,12 @@ class ClassValidationResult(Result):
             ]
         }
 
+    def detach(self) -> None:
+        """Detaches the results of the methods, see FunctionValidationResult.detach.
+        """
+        for r in self.function_results:
+            r.detach()
+
 
 class ModuleValidationResult(Result):
     def __init__(self, module_path: str) -> None:
@@ -170,6 +225,14 @@ class ModuleValidationResult(Result):
             ]
         }
 
+    def detach(self) -> None:
+        """Detaches the results of the functions and classes, see FunctionValidationResult.detach.
+        """
+        for f_r in self.function_results:
+            f_r.detach()
+        for c_r in self.class_results:
+            c_r.detach()
+
 
 class ValidationResult(Result):
     def __init__(self) -> None:
@@ -178,18 +241,25 @@ class ValidationResult(Result):
         super().__init__()
         self.module_results: List[ModuleValidationResult] = []
 
+        # The peak memory of each parallel worker in MB, only collected with --debug
+        self.worker_memory: List[float] = []
+
     def to_dict(self) -> Dict[str, Any]:
         """Serializes this class to dict, which is useful for the JSONReporter.
+        The worker memory is only included if it was collected, so the output is the same as when validating serially.
 
         Returns:
-            Dict[str, Any]: The result, fail_reason and module_results.
+            Dict[str, Any]: The result, fail_reason, module_results and worker_memory if collected.
         """
-        return {
+        result = {
             **super().to_dict(),
             'module_results': [
                 r.to_dict() for r in self.module_results
             ]
         }
+        if len(self.worker_memory) > 0:
+            result['worker_memory'] = self.worker_memory
+        return result
 
     def get_counts(self) -> ValidationCounts:
         """Counts the failed, succeeded and skipped tests of running pydoctest.
@@ -217,92 +287,326 @@ class ValidationResult(Result):
         return counts
 
 
-def __get_docstring_range(fn: FunctionType, module_type: ModuleType, docstring: Optional[str] = None) -> Optional[Range]:
-    """Returns the range for the docstring.
+class FunctionDefinition():
+    """Base class for the information validate_function_definition needs about a function.
+    Implemented both for function objects and for functions that are only parsed, never executed.
+    """
+
+    # Which engine the definition comes from, recorded on the result
+    mode = ''
+
+    def get_docstring(self) -> Optional[str]:
+        """Returns the cleaned docstring of the function.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            Optional[str]: The docstring, if it exists.
+        """
+        raise NotImplementedError()
+
+    def get_signature(self) -> inspect.Signature:
+        """Returns the signature of the function.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            inspect.Signature: The signature.
+        """
+        raise NotImplementedError()
+
+    def get_source(self) -> str:
+        """Returns the source of the function, including decorators.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            str: The source.
+        """
+        raise NotImplementedError()
+
+    def get_first_line(self) -> int:
+        """Returns the first line of the function source, including decorators.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            int: The line number.
+        """
+        raise NotImplementedError()
+
+    def get_docstring_range(self) -> Optional[Range]:
+        """Returns the range of the docstring in the function source.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            Optional[Range]: The range, if found.
+        """
+        raise NotImplementedError()
+
+    def get_exceptions_raised(self) -> List[str]:
+        """Returns the exceptions explicitly raised in the function body.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            List[str]: The names of the exceptions raised.
+        """
+        raise NotImplementedError()
+
+
+class RuntimeFunctionDefinition(FunctionDefinition):
+    mode = 'import'
+
+    def __init__(self, fn: FunctionType, module_type: ModuleType) -> None:
+        """Function definition backed by an imported function object.
+        Source information is served from the parsed source of the module, shared by its functions, and only found
+        with inspect if the function is not found there.
+
+        Args:
+            fn (FunctionType): The function.
+            module_type (ModuleType): The module from which the function was extracted.
+        """
+        self.fn = fn
+        self.module_type = module_type
+        self.source = get_module_source(module_type)
+        self.node = self.source.get_function_node(fn) if self.source else None
+        self.lines = self.source.get_function_lines(self.node) if self.source and self.node else None
+
+    def get_docstring(self) -> Optional[str]:
+        """Returns the cleaned docstring of the function.
+
+        Returns:
+            Optional[str]: The docstring, if it exists.
+        """
+        return inspect.getdoc(self.fn)
+
+    def get_signature(self) -> inspect.Signature:
+        """Returns the signature of the function.
+
+        Returns:
+            inspect.Signature: The signature.
+        """
+        return inspect.signature(self.fn)
+
+    def get_source_lines(self) -> Tuple[List[str], int]:
+        """Returns the source lines of the function, including decorators, and the line number of the first line.
+
+        Returns:
+            Tuple[List[str], int]: The lines and the line number.
+        """
+        if self.node and self.lines is not None:
+            return self.lines, get_first_line(self.node)
+        return inspect.getsourcelines(self.fn)
+
+    def get_source(self) -> str:
+        """Returns the source of the function, including decorators.
+
+        Returns:
+            str: The source.
+        """
+        lines, _ = self.get_source_lines()
+        return ''.join(lines)
+
+    def get_first_line(self) -> int:
+        """Returns the first line of the function source, including decorators.
+
+        Returns:
+            int: The line number.
+        """
+        if self.node:
+            return get_first_line(self.node)
+        _, line_number = inspect.getsourcelines(self.fn)
+        return line_number
+
+    def get_docstring_range(self) -> Optional[Range]:
+        """Returns the range of the docstring in the function source.
+
+        Returns:
+            Optional[Range]: The range, if found.
+        """
+        if self.source and self.node:
+            return get_docstring_range(self.source.get_docstring_locator(), get_first_line(self.node))
+        lines, line_number = self.get_source_lines()
+        return get_docstring_range_from_lines(lines, line_number)
+
+    def get_exceptions_raised(self) -> List[str]:
+        """Returns the exceptions explicitly raised in the function body.
+
+        Returns:
+            List[str]: The names of the exceptions raised.
+        """
+        if self.node:
+            return get_exceptions_raised_from_node(self.node)
+        return get_exceptions_raised(self.fn, self.module_type)
+
+
+class FunctionResultCache():
+    """Base class for caches of function results, used to skip validating functions that have not changed.
+    """
+
+    def get(self, definition: FunctionDefinition, fn: FunctionType, module_type: ModuleType) -> Optional[FunctionValidationResult]:
+        """Returns the cached result of the function, if it has not changed since it was stored.
+
+        Args:
+            definition (FunctionDefinition): The function to look up.
+            fn (FunctionType): The function (or a stand-in for it) stored on the result.
+            module_type (ModuleType): The module from which the function was extracted.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            Optional[FunctionValidationResult]: The result, if cached.
+        """
+        raise NotImplementedError()
+
+    def store(self, definition: FunctionDefinition, result: FunctionValidationResult) -> None:
+        """Stores the result of validating the function.
+
+        Args:
+            definition (FunctionDefinition): The function that was validated.
+            result (FunctionValidationResult): The result of validating the function.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+        """
+        raise NotImplementedError()
+
+
+def get_docstring_range_from_lines(lines: List[str], line_number: int) -> Optional[Range]:
+    """Returns the range for the docstring, given the source lines of a function.
 
     Args:
-        fn (FunctionType): The function to validate.
-        module_type (ModuleType): The module from which the function was extracted.
-        docstring (Optional[str], optional): Optionally, the docstring.
+        lines (List[str]): The source lines of the function.
+        line_number (int): The line number of the first line.
 
     Returns:
         Optional[Range]: The range, if found.
     """
-    lines, line_number = inspect.getsourcelines(fn)
-    start_line, end_line = -1, -1
-    for i, l in enumerate(lines):
-        if l.count('"""') == 2:
-            # One liner
-            return Range(line_number + i, line_number + i, 0, 0)
-
-        if '"""' in l:
-            if start_line == -1:
-                start_line = line_number + i
-            elif end_line == -1:
-                end_line = line_number + i
-                return Range(start_line, end_line, 0, 0)
-    return None
-
-
-def validate_function(fn: FunctionType, config: Configuration, module_type: ModuleType) -> FunctionValidationResult:
+    return get_docstring_range(DocstringLocator(lines), 1, line_number - 1)
+
+
+def get_docstring_range(locator: DocstringLocator, first_line: int, line_offset: int = 0) -> Optional[Range]:
+    """Returns the range for the docstring of the function, with the columns of its quotes.
+
+    Args:
+        locator (DocstringLocator): The docstring positions of the source containing the function.
+        first_line (int): The first line of the function in the source, including decorators.
+        line_offset (int, optional): Added to the lines, if the source does not start at the first line of the file.
+
+    Returns:
+        Optional[Range]: The range, if the function has a docstring.
+    """
+    position = locator.get_position(first_line)
+    if position is None:
+        return None
+    start_line, end_line, start_character, end_character = position
+    return Range(start_line + line_offset, end_line + line_offset, start_character, end_character)
+
+
+def validate_function(fn: FunctionType, config: Configuration, module_type: ModuleType, cache: Optional[FunctionResultCache] = None, parser: Optional[Parser] = None) -> FunctionValidationResult:
     """Validates the docstring of a function against its signature.
 
     Args:
         fn (FunctionType): The function to validate.
         config (Configuration): The configuration to use while validating.
         module_type (ModuleType): The module from which the function was extracted.
+        cache (Optional[FunctionResultCache], optional): Cache of function results, used if the function has not changed.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
+
+    Returns:
+        FunctionValidationResult: The result of validating this function.
+    """
+    definition = RuntimeFunctionDefinition(fn, module_type)
+    if cache is not None:
+        cached_result = cache.get(definition, fn, module_type)
+        if cached_result is not None:
+            return cached_result
+
+    result = validate_function_definition(definition, fn, config, module_type, parser)
+    if cache is not None:
+        cache.store(definition, result)
+    return result
+
+
+def validate_function_definition(definition: FunctionDefinition, fn: FunctionType, config: Configuration, module_type: ModuleType, parser: Optional[Parser] = None) -> FunctionValidationResult:
+    """Validates the docstring of a function definition against its signature.
+
+    Args:
+        definition (FunctionDefinition): Provides the docstring, signature and source information of the function.
+        fn (FunctionType): The function (or a stand-in for it) stored on the result.
+        config (Configuration): The configuration to use while validating.
+        module_type (ModuleType): The module from which the function was extracted.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
 
     Returns:
         FunctionValidationResult: The result of validating this function.
     """
     log(f"Validating function: {fn}")
     result = FunctionValidationResult(fn, module_type)
+    result.mode = definition.mode
 
-    doc = inspect.getdoc(fn)
+    doc = definition.get_docstring()
     if not doc:
         if config.fail_on_missing_docstring:
             result.result = ResultType.FAILED
             result.fail_reason = f"Function does not have a docstring"
-            _, line_number = inspect.getsourcelines(fn)
+            line_number = definition.get_first_line()
             result.range = Range(line_number, line_number, 0, 0)
         else:
             result.result = ResultType.NO_DOC
         return result
 
-    parser = config.get_parser()
+    parsed_doc = (parser or config.get_parser()).parse(doc, module_type)
 
-    summary = parser.get_summary(doc, module_type)
+    summary = parsed_doc.get_summary()
     if not summary and config.fail_on_missing_summary:
         result.result = ResultType.FAILED
         result.fail_reason = f"Function does not have a summary"
-        result.range = __get_docstring_range(fn, module_type, doc)
+        result.range = definition.get_docstring_range()
+        return result
+
+    try:
+        sig = definition.get_signature()
+    except UnknownTypeException as e:
+        result.result = ResultType.FAILED
+        result.fail_reason = f"Unable to resolve signature: {str(e)}"
         return result
 
-    sig = inspect.signature(fn)
     sig_parameters = [Parameter(name, proxy.annotation, proxy.default is not inspect.Parameter.empty) for name, proxy in sig.parameters.items() if name != "self"]
     sig_return_type = type(None) if sig.return_annotation is None else sig.return_annotation
 
     try:
-        doc_parameters = parser.get_parameters(doc, module_type)
-        doc_return_type = parser.get_return_type(doc, module_type)
+        doc_parameters = parsed_doc.get_parameters()
+        doc_return_type = parsed_doc.get_return_type()
     except ParseException as e:
         result.result = ResultType.FAILED
         result.fail_reason = f"Unable to parse docstring: {str(e)}"
-        result.range = __get_docstring_range(fn, module_type, doc)
+        result.range = definition.get_docstring_range()
         return result
 
+    result.type_paths = get_type_paths([p.type for p in doc_parameters] + [doc_return_type])
+
     # Validate return type
     if sig_return_type != doc_return_type:
         result.result = ResultType.FAILED
         result.fail_reason = f"Return type differ. Expected (from signature) {sig_return_type}, but got (in docs) {doc_return_type}."
-        result.range = __get_docstring_range(fn, module_type, doc)
+        result.range = definition.get_docstring_range()
         return result
 
     # Validate equal number of parameters
     if len(sig_parameters) != len(doc_parameters):
         result.result = ResultType.FAILED
         result.fail_reason = f"Number of arguments differ. Expected (from signature) {len(sig_parameters)} arguments, but found (in docs) {len(doc_parameters)}."
-        result.range = __get_docstring_range(fn, module_type, doc)
+        result.range = definition.get_docstring_range()
         return result
 
     # Validate name and type of function parameters
@@ -310,14 +614,14 @@ def validate_function(fn: FunctionType, config: Configuration, module_type: Modu
         if sigparam.name != docparam.name:
             result.result = ResultType.FAILED
             result.fail_reason = f"Argument name differ. Expected (from signature) '{sigparam.name}', but got (in docs) '{docparam.name}'"
-            result.range = __get_docstring_range(fn, module_type, doc)
+            result.range = definition.get_docstring_range()
             return result
 
         # NOTE: Optional[str] == Union[str, None] # True
         if sigparam.type != docparam.type:
             result.result = ResultType.FAILED
             result.fail_reason = f"Argument type differ. Argument '{sigparam.name}' was expected (from signature) to have type '{sigparam.type}', but has (in docs) type '{docparam.type}'"
-            result.range = __get_docstring_range(fn, module_type, doc)
+            result.range = definition.get_docstring_range()
             return result
         
         if sigparam.is_optional != docparam.is_optional:
@@ -325,51 +629,66 @@ def validate_function(fn: FunctionType, config: Configuration, module_type: Modu
             sig_optional = 'optional' if sigparam.is_optional else 'not optional'
             doc_optional = 'optional' if docparam.is_optional else 'not optional'
             result.fail_reason = f"Argument optional differs. Argument '{sigparam.name}' was expected (from signature) to be {sig_optional}, but is (in docs) {doc_optional}"
-            result.range = __get_docstring_range(fn, module_type, doc)
+            result.range = definition.get_docstring_range()
             return result
 
     # Validate exceptions raised
     if config.fail_on_raises_section:
         try:
-            sig_exceptions = get_exceptions_raised(fn, module_type)
-            doc_exceptions = parser.get_exceptions_raised(doc)
+            sig_exceptions = definition.get_exceptions_raised()
+            doc_exceptions = parsed_doc.get_exceptions_raised()
 
             if len(sig_exceptions) != len(doc_exceptions):
                 result.result = ResultType.FAILED
                 result.fail_reason = f"Number of listed raised exceptions does not match actual. Doc: {doc_exceptions}, expected: {sig_exceptions}"
-                result.range = __get_docstring_range(fn, module_type, doc)
+                result.range = definition.get_docstring_range()
                 return result
 
             intersection = set(sig_exceptions) - set(doc_exceptions)
             if len(intersection) > 0:
                 result.result = ResultType.FAILED
                 result.fail_reason = f"Listed raised exceptions does not match actual. Docstring: {doc_exceptions}, expected: {sig_exceptions}"
-                result.range = __get_docstring_range(fn, module_type, doc)
+                result.range = definition.get_docstring_range()
                 return result
         except ParseException as e:
             result.result = ResultType.FAILED
             result.fail_reason = f"Unable to parse docstring: {str(e)}"
-            result.range = __get_docstring_range(fn, module_type, doc)
+            result.range = definition.get_docstring_range()
             return result
 
     result.result = ResultType.OK
     return result
 
 
-def validate_class(class_instance: Any, config: Configuration, module_type: ModuleType) -> ClassValidationResult:
-    """Validates the class by validating each of its methods.
+def parse_docstrings(docs: List[Optional[str]], config: Configuration, module_type: ModuleType, parser: Optional[Parser] = None) -> None:
+    """Parses the docstrings of a module in one batch, if it has at least batch_parse_threshold of them, see Parser.parse_batch.
+    Validating the functions then parses the docstrings from their memoized splits.
 
     Args:
-        class_instance (Any): A class to validate.
+        docs (List[Optional[str]]): The docstrings of the functions of the module, None for functions without one.
+        config (Configuration): The configuration to use while validating.
+        module_type (ModuleType): The module from which the docstrings were extracted.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
+    """
+    batch_docs = [doc for doc in docs if doc]
+    if config.batch_parse_threshold <= 0 or len(batch_docs) < config.batch_parse_threshold:
+        return
+    log(f"Parsing {len(batch_docs)} docstring(s) in one batch: {module_type.__name__}")
+    (parser or config.get_parser()).parse_batch(batch_docs, module_type)
+
+
+def get_class_methods(class_instance: Any, config: Configuration, module_type: ModuleType) -> List[FunctionType]:
+    """Returns the methods of the class to validate, i.e. those defined by the class itself, which are not excluded.
+
+    Args:
+        class_instance (Any): The class.
         config (Configuration): The configuration to use while validating.
         module_type (ModuleType): The module from which the class was extracted.
 
     Returns:
-        ClassValidationResult: The result of validating this class.
+        List[FunctionType]: The methods.
     """
-    log(f"Validating class: {class_instance}")
-    class_result = ClassValidationResult(class_instance.__name__)
-
+    methods = []
     for name, item in inspect.getmembers(class_instance):
         if inspect.isfunction(item) and item.__module__ == module_type.__name__:
             if name not in class_instance.__dict__ or item != class_instance.__dict__[name]:
@@ -379,11 +698,32 @@ def validate_class(class_instance: Any, config: Configuration, module_type: Modu
             if is_excluded_function(name, config.exclude_methods):
                 continue
 
-            function_result = validate_function(item, config, module_type)
-            if function_result.result == ResultType.FAILED:
-                class_result.result = ResultType.FAILED
+            methods.append(item)
+    return methods
+
+
+def validate_class(class_instance: Any, config: Configuration, module_type: ModuleType, cache: Optional[FunctionResultCache] = None, parser: Optional[Parser] = None) -> ClassValidationResult:
+    """Validates the class by validating each of its methods.
+
+    Args:
+        class_instance (Any): A class to validate.
+        config (Configuration): The configuration to use while validating.
+        module_type (ModuleType): The module from which the class was extracted.
+        cache (Optional[FunctionResultCache], optional): Cache of function results, used for methods that have not changed.
+        parser (Optional[Parser], optional): The parser to use, defaults to the parser of the configuration.
+
+    Returns:
+        ClassValidationResult: The result of validating this class.
+    """
+    log(f"Validating class: {class_instance}")
+    class_result = ClassValidationResult(class_instance.__name__)
+
+    for item in get_class_methods(class_instance, config, module_type):
+        function_result = validate_function(item, config, module_type, cache, parser)
+        if function_result.result == ResultType.FAILED:
+            class_result.result = ResultType.FAILED
 
-            class_result.function_results.append(function_result)
+        class_result.function_results.append(function_result)
 
     # If result has not been changed at this point, it must be OK
     if class_result.result == ResultType.NOT_RUN:
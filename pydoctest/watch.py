@@ -0,0 +1,384 @@
+"""Watch mode, which validates the modules again when files change.
+
+Files are watched with inotify when available, otherwise by polling their modification times. Changes that
+arrive in a burst, e.g. an editor saving several files, are collected until no change has arrived for
+DEBOUNCE_SECONDS, and then only the changed modules and the modules depending on them are validated.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from pydoctest import logging
+from pydoctest.dependencies import ImportGraph
+from pydoctest.main import PyDoctestService
+from pydoctest.utilities import evict_modules
+from pydoctest.validation import ModuleValidationResult, ResultType, ValidationResult
+
+DEBOUNCE_SECONDS = 0.1
+POLL_INTERVAL_SECONDS = 0.5
+
+# Flags from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def is_watched_directory(name: str) -> bool:
+    """Returns whether files in the directory are watched. Hidden directories, like .git and the cache, are not.
+
+    Args:
+        name (str): The name of the directory.
+
+    Returns:
+        bool: If the directory is watched.
+    """
+    return not name.startswith('.') and name != '__pycache__'
+
+
+def walk_directories(root: str) -> List[str]:
+    """Returns the watched directories in the root, including the root.
+
+    Args:
+        root (str): The directory to walk.
+
+    Returns:
+        List[str]: Paths to the directories.
+    """
+    directories = []
+    for directory, subdirectories, _ in os.walk(root):
+        subdirectories[:] = [d for d in subdirectories if is_watched_directory(d)]
+        directories.append(directory)
+    return directories
+
+
+def get_python_files(root: str) -> Set[str]:
+    """Returns the python files in the watched directories of the root.
+
+    Args:
+        root (str): The directory to search.
+
+    Returns:
+        Set[str]: Paths to the files.
+    """
+    paths = set()
+    for directory in walk_directories(root):
+        for name in os.listdir(directory):
+            if name.endswith('.py'):
+                paths.add(os.path.join(directory, name))
+    return paths
+
+
+class FileWatcher():
+    """Base class for watching python files in a directory tree.
+    """
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Waits for python files to be changed, created or removed.
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait at most, or None to wait until a file changes.
+
+        Raises:
+            NotImplementedError: Raised if this is not implemented by subclasses.
+
+        Returns:
+            Set[str]: Paths to the changed files, empty if the timeout passed.
+        """
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """Stops watching.
+        """
+        pass
+
+
+class PollingFileWatcher(FileWatcher):
+    def __init__(self, root: str, interval: float = POLL_INTERVAL_SECONDS) -> None:
+        """Watches python files by comparing their modification times and sizes.
+
+        Args:
+            root (str): The directory to watch.
+            interval (float, optional): Seconds between checking the files.
+        """
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        self.snapshot = self.get_snapshot()
+
+    def get_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Returns the modification time and size of the python files.
+
+        Returns:
+            Dict[str, Tuple[int, int]]: The modification time in nanoseconds and size, by path.
+        """
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for path in get_python_files(self.root):
+            try:
+                stat = os.stat(path)
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Waits for python files to be changed, created or removed.
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait at most, or None to wait until a file changes.
+
+        Returns:
+            Set[str]: Paths to the changed files, empty if the timeout passed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.get_snapshot()
+            changed = set(p for p in snapshot.keys() | self.snapshot.keys() if snapshot.get(p) != self.snapshot.get(p))
+            self.snapshot = snapshot
+            if changed:
+                return changed
+
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return set()
+            time.sleep(remaining)
+
+
+class InotifyFileWatcher(FileWatcher):
+    def __init__(self, root: str) -> None:
+        """Watches python files using inotify. Only available on Linux.
+
+        Args:
+            root (str): The directory to watch.
+
+        Raises:
+            OSError: Raised if inotify is not available.
+        """
+        self.root = os.path.abspath(root)
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError) as e:
+            raise OSError(f"inotify is not available: {str(e)}")
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.directories: Dict[int, str] = {}
+        for directory in walk_directories(self.root):
+            self.add_watch(directory)
+
+    def add_watch(self, directory: str) -> None:
+        """Starts watching the directory.
+
+        Args:
+            directory (str): Path to the directory.
+        """
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+        if wd < 0:
+            logging.log(f'Failed to watch directory: {directory} - error: {os.strerror(ctypes.get_errno())}')
+            return
+        self.directories[wd] = directory
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Waits for python files to be changed, created or removed.
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait at most, or None to wait until a file changes.
+
+        Returns:
+            Set[str]: Paths to the changed files, empty if the timeout passed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if not readable:
+                return set()
+
+            changed = self.read_events()
+            if changed:
+                return changed
+
+    def read_events(self) -> Set[str]:
+        """Reads the pending events, and watches directories that were created.
+
+        Returns:
+            Set[str]: Paths to the changed python files.
+        """
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return set()
+            raise
+
+        changed: Set[str] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b'\0'))
+            offset += INOTIFY_EVENT.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, so any file may have changed
+                changed.update(get_python_files(self.root))
+                continue
+
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and is_watched_directory(name):
+                    # Files may have been written before the directory was watched
+                    for new_directory in walk_directories(path):
+                        self.add_watch(new_directory)
+                    changed.update(get_python_files(path))
+            elif name.endswith('.py'):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """Stops watching.
+        """
+        os.close(self.fd)
+
+
+def get_file_watcher(root: str) -> FileWatcher:
+    """Returns an inotify watcher if available, otherwise a polling watcher.
+
+    Args:
+        root (str): The directory to watch.
+
+    Returns:
+        FileWatcher: The watcher.
+    """
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyFileWatcher(root)
+        except OSError as e:
+            logging.log(f'Falling back to polling for changes - error: {str(e)}')
+    return PollingFileWatcher(root)
+
+
+def wait_for_changes(watcher: FileWatcher, debounce: float = DEBOUNCE_SECONDS) -> Set[str]:
+    """Waits for files to change, and collects further changes until none arrive within the debounce period.
+
+    Args:
+        watcher (FileWatcher): The watcher to wait on.
+        debounce (float, optional): Seconds without changes before returning.
+
+    Returns:
+        Set[str]: Paths to the changed files.
+    """
+    changed = watcher.wait()
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed.update(more)
+
+
+class WatchSession():
+    def __init__(self, service: PyDoctestService, modules: Optional[List[str]] = None) -> None:
+        """Keeps the latest result of each module, so only changed modules have to be validated again.
+
+        Args:
+            service (PyDoctestService): The service to validate with.
+            modules (Optional[List[str]], optional): Optionally, specify directly the modules rather than discover.
+        """
+        self.service = service
+        # Validated in this process, since evicting changed modules only reloads them here, and a pool of
+        # workers per run would cost more than the few modules usually validated again
+        self.service.config.jobs = 1
+        self.modules = modules
+        self.import_graph = ImportGraph(service.config.working_directory)
+        self.results: Dict[str, ModuleValidationResult] = {}
+
+    def get_modules(self) -> List[str]:
+        """Returns the modules to validate, discovering them again since files may have been created or removed.
+
+        Returns:
+            List[str]: Paths to the modules.
+        """
+        if self.modules is not None:
+            return [m for m in self.modules if os.path.isfile(m)]
+        return self.service.discover_modules()
+
+    def validate(self, changed: Optional[Set[str]] = None) -> Optional[ValidationResult]:
+        """Validates the modules that changed and the modules depending on them, or all modules on the first run.
+
+        Args:
+            changed (Optional[Set[str]], optional): Paths to the changed files, or None to validate all modules.
+
+        Returns:
+            Optional[ValidationResult]: The result of all modules, or None if no module was affected by the changes.
+        """
+        modules = self.get_modules()
+        if changed is None:
+            stale = list(modules)
+        else:
+            changed = set(os.path.abspath(p) for p in changed)
+            self.import_graph.invalidate(changed)
+            stale = [
+                m for m in modules
+                if os.path.abspath(m) in changed or m not in self.results or changed.intersection(self.import_graph.get_dependencies(m))
+            ]
+            if not stale and self.results.keys() == set(modules):
+                return None
+
+        logging.log(f'Validating {len(stale)} module(s)')
+        evict_modules(set(os.path.abspath(m) for m in stale) | (changed or set()))
+        for module_result in self.service.validate(stale).module_results:
+            self.results[module_result.module_path] = module_result
+        self.results = { m: self.results[m] for m in modules }
+
+        result = ValidationResult()
+        for module_result in self.results.values():
+            if module_result.result == ResultType.FAILED:
+                result.result = ResultType.FAILED
+            result.module_results.append(module_result)
+
+        if result.result == ResultType.NOT_RUN:
+            result.result = ResultType.OK
+
+        return result
+
+
+def watch(service: PyDoctestService, on_result: Callable[[ValidationResult], None], modules: Optional[List[str]] = None, watcher: Optional[FileWatcher] = None) -> None:
+    """Validates the modules, and again whenever files change, until interrupted.
+
+    Args:
+        service (PyDoctestService): The service to validate with.
+        on_result (Callable[[ValidationResult], None]): Called with the result of every run.
+        modules (Optional[List[str]], optional): Optionally, specify directly the modules rather than discover.
+        watcher (Optional[FileWatcher], optional): The watcher to use, defaults to get_file_watcher.
+    """
+    session = WatchSession(service, modules)
+    watcher = watcher or get_file_watcher(service.config.working_directory)
+    try:
+        result = session.validate()
+        assert result is not None
+        on_result(result)
+        while True:
+            changed = wait_for_changes(watcher)
+            logging.log(f'Changed files: {", ".join(sorted(changed))}')
+            start = time.perf_counter()
+            result = session.validate(changed)
+            if result is not None:
+                on_result(result)
+                logging.log(f'Validated changes in {(time.perf_counter() - start) * 1000:.1f} ms')
+    finally:
+        watcher.close()
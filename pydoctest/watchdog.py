@@ -0,0 +1,91 @@
+"""Bounds the time spent on each module, see module_timeout.
+
+Parallel workers validating a module for too long are killed by the parent process. Serial runs are
+interrupted by a SIGALRM timer, which raises ModuleTimeoutException in the module, e.g. in its module scope.
+Where signals can not be used, i.e. on Windows or outside the main thread, serial runs are not interrupted.
+"""
+
+import time
+import signal
+import threading
+
+from types import FrameType
+from typing import Callable, Optional
+
+from pydoctest import logging
+from pydoctest.exceptions import ModuleTimeoutException
+from pydoctest.validation import ModuleValidationResult, ResultType
+
+
+def can_interrupt() -> bool:
+    """Returns whether a timer signal can interrupt the current thread.
+
+    Returns:
+        bool: Whether it can.
+    """
+    return hasattr(signal, 'SIGALRM') and threading.current_thread() is threading.main_thread()
+
+
+def raise_timeout(signum: int, frame: Optional[FrameType]) -> None:
+    """Signal handler of the timer, interrupting the module being validated.
+
+    Args:
+        signum (int): The signal.
+        frame (Optional[FrameType]): The frame interrupted.
+
+    Raises:
+        ModuleTimeoutException: Always.
+    """
+    raise ModuleTimeoutException()
+
+
+def get_timeout_result(module_path: str, timeout: float, elapsed: float) -> ModuleValidationResult:
+    """Returns the result of a module that exceeded the timeout.
+
+    Args:
+        module_path (str): Path to the module.
+        timeout (float): The timeout in seconds.
+        elapsed (float): The seconds spent on the module before it was interrupted.
+
+    Returns:
+        ModuleValidationResult: The failed result.
+    """
+    result = ModuleValidationResult(module_path)
+    result.result = ResultType.FAILED
+    result.fail_reason = f"Timed out after {elapsed:.2f} seconds, exceeding the module timeout of {timeout:g} seconds: {module_path}"
+    return result
+
+
+def run_with_timeout(module_path: str, timeout: float, validate: Callable[[], ModuleValidationResult]) -> ModuleValidationResult:
+    """Validates the module, interrupting it if it exceeds the timeout.
+
+    Args:
+        module_path (str): Path to the module.
+        timeout (float): The timeout in seconds, 0 for no timeout.
+        validate (Callable[[], ModuleValidationResult]): Validates the module.
+
+    Returns:
+        ModuleValidationResult: The result of the module, or a failed result if it timed out.
+    """
+    if timeout <= 0:
+        return validate()
+    if not can_interrupt():
+        logging.log(f'Module timeout is not enforced, since signals can not interrupt this thread: {module_path}')
+        return validate()
+
+    start = time.perf_counter()
+    previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        try:
+            return validate()
+        finally:
+            # Cancelled within the handled block, so a timer firing just as validate returns is handled as well,
+            # and the previous handler is only restored once the timer can no longer fire
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except ModuleTimeoutException:
+        elapsed = time.perf_counter() - start
+        logging.log(f'Module timed out after {elapsed:.2f} seconds: {module_path}')
+        return get_timeout_result(module_path, timeout, elapsed)
+    finally:
+        signal.signal(signal.SIGALRM, previous_handler)
@@ -0,0 +1,236 @@
+import os
+import shutil
+import tempfile
+
+from typing import Tuple
+
+from pydoctest.cache import FunctionCache, ResultCache
+from pydoctest.dependencies import ImportGraph
+from pydoctest.configuration import Configuration
+from pydoctest.main import PyDoctestService
+from pydoctest.reporters.text_reporter import TextReporter
+from pydoctest.static import validate_static_module
+from pydoctest.validation import ModuleReference, ModuleValidationResult, ResultType
+
+
+class TestCache():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        shutil.copy("tests/test_class/incorrect_class.py", self.directory)
+        self.module_path = os.path.join(self.directory, "incorrect_class.py")
+
+    def teardown_method(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def get_config(self) -> Configuration:
+        config = Configuration.get_default_configuration(self.directory)
+        config.jobs = 1
+        config.cache = True
+        return config
+
+    def test_cache_disabled_by_default(self) -> None:
+        config = Configuration.get_default_configuration(self.directory)
+        assert not config.cache
+        config.jobs = 2
+        config.cache_symbol_index = True
+        config.preload_observed_modules = True
+        PyDoctestService(config).validate()
+        assert not os.path.exists(config.get_cache_directory())
+
+    def test_unchanged_module_is_replayed(self) -> None:
+        config = self.get_config()
+        first = PyDoctestService(config).validate()
+
+        cache = ResultCache(config)
+        cached = cache.get(self.module_path)
+        assert cached is not None
+        assert cache.hits == 1
+        assert isinstance(cached.class_results[0].function_results[0].module, ModuleReference)
+
+        second = PyDoctestService(config).validate()
+        assert second.result == first.result == ResultType.FAILED
+        assert TextReporter(config).get_output(second) == TextReporter(config).get_output(first)
+
+    def test_changed_module_is_validated(self) -> None:
+        config = self.get_config()
+        PyDoctestService(config).validate()
+
+        with open(self.module_path, 'a') as f:
+            f.write("\n\ndef added() -> None:\n    pass\n")
+
+        assert ResultCache(config).get(self.module_path) is None
+        result = PyDoctestService(config).validate()
+        assert 'added' in [f.function.__name__ for f in result.module_results[0].function_results]
+
+    def test_changed_configuration_is_validated(self) -> None:
+        config = self.get_config()
+        PyDoctestService(config).validate()
+
+        config.fail_on_raises_section = False
+        assert ResultCache(config).get(self.module_path) is None
+
+        # Configuration values which don't change results, don't change the key
+        config.fail_on_raises_section = True
+        config.verbosity = 2
+        assert ResultCache(config).get(self.module_path) is not None
+
+    def test_no_cache(self) -> None:
+        config = self.get_config()
+        config.cache = False
+        PyDoctestService(config).validate()
+        assert not os.path.exists(config.get_cache_directory())
+
+    def test_cache_directory(self) -> None:
+        config = self.get_config()
+        config.cache_directory = "other_cache"
+        PyDoctestService(config).validate()
+        assert os.path.exists(os.path.join(self.directory, "other_cache"))
+        assert ResultCache(config).get(self.module_path) is not None
+
+    def test_evict_least_recently_used(self) -> None:
+        shutil.copy("tests/test_class/correct_class.py", self.directory)
+        config = self.get_config()
+        PyDoctestService(config).validate()
+
+        cache_directory = config.get_cache_directory()
+        entries = sorted(e for e in os.listdir(cache_directory) if e.endswith('.pickle'))
+        assert len(entries) == 2
+        shutil.rmtree(os.path.join(cache_directory, "functions"))
+
+        # Make one entry older, so it is evicted first
+        cache = ResultCache(config)
+        os.utime(os.path.join(cache_directory, entries[0]), (0, 0))
+        cache.max_size = os.path.getsize(os.path.join(cache_directory, entries[1]))
+        cache.evict()
+        assert sorted(os.listdir(cache_directory)) == [ entries[1] ]
+
+    def write_project(self) -> None:
+        os.makedirs(os.path.join(self.directory, "package"))
+        with open(os.path.join(self.directory, "package", "__init__.py"), 'w') as f:
+            f.write("")
+        with open(os.path.join(self.directory, "package", "payload.py"), 'w') as f:
+            f.write("class Payload():\n    pass\n")
+        with open(os.path.join(self.directory, "package", "consumer.py"), 'w') as f:
+            f.write("from .payload import Payload\n\n\ndef consume(payload: Payload) -> None:\n    \"\"\"Consumes the payload.\n\n    Args:\n        payload (Payload): The payload.\n    \"\"\"\n    pass\n")
+
+    def test_changed_dependency_is_validated(self) -> None:
+        self.write_project()
+        config = self.get_config()
+        config.mode = "static"
+        PyDoctestService(config).validate()
+
+        consumer_path = os.path.join(self.directory, "package", "consumer.py")
+        cache = ResultCache(config)
+        assert cache.get(consumer_path) is not None
+
+        # Unrelated modules do not invalidate the result
+        with open(self.module_path, 'a') as f:
+            f.write("\n")
+        assert ResultCache(config).get(consumer_path) is not None
+
+        with open(os.path.join(self.directory, "package", "payload.py"), 'a') as f:
+            f.write("\n\nclass Other():\n    pass\n")
+        cache = ResultCache(config)
+        assert cache.get(consumer_path) is None
+        assert cache.misses == 1
+
+
+class TestImportGraph():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, "package", "sub"))
+        files = {
+            "package/__init__.py": "",
+            "package/a.py": "import os\nfrom . import b\nfrom .sub.c import thing\n",
+            "package/b.py": "from package.sub import d\n",
+            "package/sub/__init__.py": "",
+            "package/sub/c.py": "from ..b import value\nthing = 1\n",
+            "package/sub/d.py": "def f() -> None:\n    import json\n",
+            "script.py": "import package.sub.d\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(self.directory, name), 'w') as f:
+                f.write(content)
+
+    def teardown_method(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def test_get_imports(self) -> None:
+        graph = ImportGraph(self.directory)
+        assert graph.get_imports(self.path("package/a.py")) == sorted([
+            self.path("package/__init__.py"), self.path("package/b.py"), self.path("package/sub/__init__.py"), self.path("package/sub/c.py")
+        ])
+        assert graph.get_imports(self.path("script.py")) == sorted([
+            self.path("package/__init__.py"), self.path("package/sub/__init__.py"), self.path("package/sub/d.py")
+        ])
+        assert graph.get_imports(self.path("package/sub/d.py")) == []
+
+    def test_get_dependencies(self) -> None:
+        graph = ImportGraph(self.directory)
+        assert graph.get_dependencies(self.path("package/sub/c.py")) == sorted([
+            self.path("package/__init__.py"), self.path("package/b.py"), self.path("package/sub/__init__.py"), self.path("package/sub/d.py")
+        ])
+
+
+class TestFunctionCache():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.module_path = os.path.join(self.directory, "functions.py")
+        self.write_module("")
+
+    def teardown_method(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def write_module(self, header: str, return_type: str = "int") -> None:
+        with open(self.module_path, 'w') as f:
+            f.write(header)
+            f.write(f"def first(a: int) -> int:\n    \"\"\"Returns a.\n\n    Args:\n        a (int): A number.\n\n    Returns:\n        {return_type}: The number.\n    \"\"\"\n    return a\n\n\n")
+            f.write("def second(b: int) -> int:\n    \"\"\"Returns b.\n\n    Args:\n        b (str): A number.\n\n    Returns:\n        int: The number.\n    \"\"\"\n    return b\n")
+
+    def validate(self, mode: str) -> Tuple[ModuleValidationResult, FunctionCache]:
+        config = Configuration.get_default_configuration(self.directory)
+        config.cache = True
+        config.mode = mode
+        service = PyDoctestService(config)
+        function_cache = service.get_function_cache(self.module_path)
+        assert function_cache is not None
+        if mode == "static":
+            result = validate_static_module(self.module_path, config, cache=function_cache)
+        else:
+            result = service.validate_module_import(self.module_path, function_cache)
+        assert service.cache is not None
+        service.cache.save_function_cache(self.module_path, function_cache)
+        return result, function_cache
+
+    def test_unchanged_functions_are_replayed(self) -> None:
+        for mode in ["import", "static"]:
+            _, function_cache = self.validate(mode)
+            assert (function_cache.hits, function_cache.misses) == (0, 2)
+
+            # Only the changed function is validated
+            self.write_module("", return_type="str")
+            result, function_cache = self.validate(mode)
+            assert (function_cache.hits, function_cache.misses) == (1, 1)
+            assert [r.result for r in result.function_results] == [ResultType.FAILED, ResultType.FAILED]
+            self.write_module("")
+
+    def test_moved_functions_are_replayed(self) -> None:
+        for mode in ["import", "static"]:
+            self.validate(mode)
+
+            self.write_module("# Moved\n\n\n")
+            result, function_cache = self.validate(mode)
+            assert function_cache.hits == 2
+            uncached = PyDoctestService(Configuration.get_default_configuration(self.directory)).validate_module_import(self.module_path)
+            assert [r.range.to_dict() for r in result.function_results if r.range] == [r.range.to_dict() for r in uncached.function_results if r.range]
+            self.write_module("")
+
+    def test_changed_environment_is_validated(self) -> None:
+        self.validate("static")
+        # Names types are resolved from may have changed
+        self.write_module("int = str\n\n\n")
+        _, function_cache = self.validate("static")
+        assert function_cache.hits == 0
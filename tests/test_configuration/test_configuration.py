@@ -19,6 +19,13 @@ class TestConfiguration():
         with pytest.raises(Exception):
             config.get_parser()
 
+    def test_isolate_modules_validates_serially(self) -> None:
+        config = Configuration.get_default_configuration()
+        config.jobs = 4
+        assert config.get_jobs() == 4
+        config.isolate_modules = True
+        assert config.get_jobs() == 1
+
     def test_configuration_unknown_keys(self) -> None:
         with pytest.raises(Exception):
             config = Configuration.get_configuration_from_path("tests/test_configuration/pydoctest_unknown_keys.json")
@@ -0,0 +1,126 @@
+import io
+import os
+import sys
+import json
+import shutil
+import socket
+import tempfile
+import threading
+import contextlib
+
+from typing import Generator
+
+import pytest
+
+import pydoctest.main
+from pydoctest.daemon import Daemon, forward_request, get_socket_directory, get_socket_path, send_request, stop_daemon
+from pydoctest.main import get_argument_parser, run
+
+
+def write(path: str, content: str) -> None:
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+@pytest.fixture
+def project(monkeypatch: pytest.MonkeyPatch) -> Generator[str, None, None]:
+    directory = os.path.realpath(tempfile.mkdtemp())
+    write(os.path.join(directory, "helper.py"), "class Helper():\n    pass\n")
+    write(os.path.join(directory, "module.py"), "from helper import Helper\n\n\ndef f(h: Helper) -> None:\n    \"\"\"Uses the helper.\n\n    Args:\n        h (Helper): The helper.\n    \"\"\"\n    pass\n")
+    monkeypatch.chdir(directory)
+    monkeypatch.syspath_prepend(directory)
+    yield directory
+    sys.modules.pop("helper", None)
+    shutil.rmtree(directory)
+
+
+@pytest.fixture
+def daemon(project: str) -> Generator[Daemon, None, None]:
+    daemon = Daemon(project, idle_timeout=30)
+    thread = threading.Thread(target=daemon.serve)
+    thread.start()
+    while not os.path.exists(daemon.socket_path):
+        pass
+    yield daemon
+    stop_daemon(project)
+    thread.join()
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason="The daemon requires Unix sockets")
+class TestDaemon():
+    def test_no_daemon(self, project: str) -> None:
+        assert not os.path.exists(get_socket_path(project))
+        assert forward_request(project, []) is None
+
+    def test_forward_request(self, daemon: Daemon, project: str) -> None:
+        response = forward_request(project, ["--reporter", "json", "--no-cache"])
+        assert response is not None
+        output, exit_code = response
+        assert exit_code == 0
+
+        local_output = io.StringIO()
+        with contextlib.redirect_stdout(local_output):
+            local_exit_code = run(get_argument_parser().parse_args(["--reporter", "json", "--no-cache"]))
+        assert local_exit_code == exit_code
+        assert json.loads(output)['result'] == json.loads(local_output.getvalue())['result']
+        assert len(json.loads(output)['module_results']) == 2
+
+        # Invalid arguments are reported like on the command line
+        response = forward_request(project, ["--not-an-argument"])
+        assert response is not None and response[1] == 2 and "unrecognized arguments" in response[0]
+
+    def test_changed_modules_are_reloaded(self, daemon: Daemon, project: str) -> None:
+        response = forward_request(project, ["--no-cache", "--file", "module.py"])
+        assert response is not None and response[1] == 0
+        assert os.path.join(project, "helper.py") in daemon.module_times
+
+        # The module imports helper, so it has to see the changed helper
+        write(os.path.join(project, "helper.py"), "class Helper():\n    pass\n\n\nclass Other():\n    pass\n")
+        os.utime(os.path.join(project, "helper.py"), ns=(0, 0))
+        write(os.path.join(project, "module.py"), "from helper import Other\n\n\ndef f(h: Other) -> None:\n    \"\"\"Uses the helper.\n\n    Args:\n        h (Other): The helper.\n    \"\"\"\n    pass\n")
+        response = forward_request(project, ["--no-cache", "--file", "module.py"])
+        assert response is not None and response[1] == 0, response[0]
+
+    def test_other_version_is_refused(self, daemon: Daemon, project: str) -> None:
+        response = send_request(project, { 'argv': [], 'fingerprint': 'other' })
+        assert response is not None and 'error' in response
+
+    def test_stop(self, project: str) -> None:
+        daemon = Daemon(project, idle_timeout=30)
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        while not os.path.exists(daemon.socket_path):
+            pass
+        with pytest.raises(RuntimeError):
+            Daemon(project).serve()
+        assert stop_daemon(project)
+        thread.join()
+        assert not os.path.exists(daemon.socket_path)
+        assert not stop_daemon(project)
+
+    def test_idle_timeout(self, project: str) -> None:
+        Daemon(project, idle_timeout=0.05).serve()
+        assert not os.path.exists(get_socket_path(project))
+
+    def test_requests_are_validated_serially(self, daemon: Daemon, project: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        def validate_modules_in_parallel(*args: object) -> None:
+            raise AssertionError("Validated in parallel")
+
+        monkeypatch.setattr(pydoctest.main, 'validate_modules_in_parallel', validate_modules_in_parallel)
+        response = forward_request(project, ["--no-cache", "--jobs", "4"])
+        assert response is not None and response[1] == 0, response[0]
+
+    def test_socket_directory_is_private(self, project: str, monkeypatch: pytest.MonkeyPatch, tmp_path: str) -> None:
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+        Daemon(project, idle_timeout=0.05).serve()
+        assert os.stat(get_socket_directory()).st_mode & 0o777 == 0o700
+
+        # A directory others can write to could hold a socket placed by another user
+        os.chmod(get_socket_directory(), 0o777)
+        with pytest.raises(RuntimeError):
+            Daemon(project).serve()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(get_socket_path(project))
+            server.listen()
+            assert send_request(project, { 'ping': True }) is None
+            assert forward_request(project, []) is None
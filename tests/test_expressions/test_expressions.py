@@ -0,0 +1,47 @@
+import sys
+import typing
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from pydoctest.exceptions import UnknownTypeException
+from pydoctest.expressions import evaluate_type_expression, get_type_expression
+
+
+NAMESPACE = vars(typing)
+
+
+class TestExpressions():
+    def test_evaluate(self) -> None:
+        assert evaluate_type_expression('int', []) is int
+        assert evaluate_type_expression('Optional[List[Dict[str, Any]]]', [NAMESPACE]) == Optional[List[Dict[str, Any]]]
+        assert evaluate_type_expression('typing.Tuple[int, ...]', [{ 'typing': typing }]) == Tuple[int, ...]
+        assert evaluate_type_expression('Callable[[int], None]', [NAMESPACE]) == Callable[[int], None]
+        assert evaluate_type_expression("List['Forward']", [NAMESPACE]) == List['Forward']
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="| unions of types require Python 3.10")
+    def test_evaluate_union(self) -> None:
+        assert evaluate_type_expression('int | None', []) == Optional[int]
+
+    def test_namespaces_order(self) -> None:
+        assert evaluate_type_expression('int', [{ 'int': str }]) is str
+        assert evaluate_type_expression('A', [{ 'A': int }, { 'A': str }]) is int
+
+    def test_unknown_name(self) -> None:
+        with pytest.raises(NameError):
+            evaluate_type_expression('Optional[NotAName]', [NAMESPACE])
+
+    def test_not_type_expression(self) -> None:
+        for type_string in ['print(1)', 'lambda: 0', '__import__', 'int.__subclasses__', '[x for x in str]', 'int if 1 else str']:
+            with pytest.raises(UnknownTypeException):
+                evaluate_type_expression(type_string, [])
+
+    def test_syntax_error(self) -> None:
+        with pytest.raises(SyntaxError):
+            evaluate_type_expression('list of int', [])
+
+    def test_cached_by_ast(self) -> None:
+        assert get_type_expression('Dict[str,int]') is get_type_expression('Dict[str, int]')
+        assert get_type_expression(' Dict[str, int]') is get_type_expression('Dict[str, int]')
+        assert get_type_expression('Dict[str, int]') is not get_type_expression('Dict[int, str]')
@@ -0,0 +1,22 @@
+from pydoctest.configuration import Configuration
+
+
+def resolved_statically(config: Configuration) -> int:
+    """The types are bound in this module.
+
+    Args:
+        config (Configuration): [description]
+
+    Returns:
+        int: [description]
+    """
+    pass
+
+
+def resolved_at_runtime(config: Configuration) -> None:
+    """Parser is not bound in this module, but is found in the modules it imports.
+
+    Args:
+        config (Parser): [description]
+    """
+    pass
@@ -0,0 +1,41 @@
+import json
+
+from pydoctest.configuration import Configuration
+from pydoctest.main import PyDoctestService
+from pydoctest.reporters.json_reporter import JSONReporter
+from pydoctest.validation import ResultType
+
+
+class TestHybrid():
+    def test_import_only_unresolved_functions(self) -> None:
+        config = Configuration.get_configuration_from_path("tests/test_hybrid/pydoctest.json")
+        ds = PyDoctestService(config)
+        result = ds.validate()
+
+        resolved_at_runtime, resolved_statically = result.module_results[0].function_results
+        assert resolved_statically.mode == 'static'
+        assert resolved_statically.result == ResultType.OK
+
+        # Validated again after importing, where Parser is found by searching imported modules
+        assert resolved_at_runtime.mode == 'import'
+        assert resolved_at_runtime.result == ResultType.FAILED
+        assert "Argument type differ" in resolved_at_runtime.fail_reason
+
+    def test_static_mode_does_not_import(self) -> None:
+        config = Configuration.get_configuration_from_path("tests/test_hybrid/pydoctest.json")
+        config.mode = 'static'
+        ds = PyDoctestService(config)
+        result = ds.validate()
+
+        resolved_at_runtime = result.module_results[0].function_results[0]
+        assert resolved_at_runtime.mode == 'static'
+        assert "Unknown type 'Parser'" in resolved_at_runtime.fail_reason
+
+    def test_mode_in_json_output(self) -> None:
+        config = Configuration.get_configuration_from_path("tests/test_hybrid/pydoctest.json")
+        ds = PyDoctestService(config)
+        result = ds.validate()
+
+        output = json.loads(JSONReporter(config).get_output(result))
+        modes = [f['mode'] for f in output['module_results'][0]['function_results']]
+        assert modes == [ 'import', 'static' ]
@@ -0,0 +1,161 @@
+import io
+import os
+import json
+import time
+
+from typing import Any, Dict, List
+
+from pydoctest.lsp import LanguageServer, read_message, write_message
+
+
+URI = "file:///project/module.py"
+
+CORRECT = '''from typing import List
+
+
+def first(a: int) -> int:
+    """Returns a.
+
+    Args:
+        a (int): A number.
+
+    Returns:
+        int: The number.
+    """
+    return a
+
+
+class Numbers():
+    def total(self, numbers: List[int]) -> int:
+        """Returns the total.
+
+        Args:
+            numbers (List[int]): The numbers.
+
+        Returns:
+            int: The total.
+        """
+        return sum(numbers)
+'''
+
+
+def get_messages(stream: io.BytesIO) -> List[Dict[str, Any]]:
+    stream.seek(0)
+    messages = []
+    while True:
+        message = read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+class TestLanguageServer():
+    def setup_method(self) -> None:
+        self.output = io.BytesIO()
+        self.server = LanguageServer(io.BytesIO(), self.output, os.getcwd())
+        self.server.handle_message({ 'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': { 'rootUri': None } })
+
+    def change(self, text: str, version: int = 2) -> List[Dict[str, Any]]:
+        self.output.seek(0)
+        self.output.truncate()
+        self.server.handle_message({
+            'jsonrpc': '2.0', 'method': 'textDocument/didChange',
+            'params': { 'textDocument': { 'uri': URI, 'version': version }, 'contentChanges': [ { 'text': text } ] }
+        })
+        return get_messages(self.output)
+
+    def test_initialize(self) -> None:
+        messages = get_messages(self.output)
+        assert messages[0]['id'] == 1
+        assert messages[0]['result']['capabilities']['textDocumentSync']['change'] == 1
+
+    def test_diagnostics(self) -> None:
+        self.server.handle_message({
+            'jsonrpc': '2.0', 'method': 'textDocument/didOpen',
+            'params': { 'textDocument': { 'uri': URI, 'languageId': 'python', 'version': 1, 'text': CORRECT } }
+        })
+        messages = get_messages(self.output)
+        assert messages[-1]['method'] == 'textDocument/publishDiagnostics'
+        assert messages[-1]['params'] == { 'uri': URI, 'diagnostics': [] }
+
+        messages = self.change(CORRECT.replace("numbers (List[int])", "numbers (List[str])"))
+        diagnostics = messages[0]['params']['diagnostics']
+        assert len(diagnostics) == 1
+        assert "Argument type differ" in diagnostics[0]['message']
+        # The docstring of total, from the opening to the closing quotes
+        assert diagnostics[0]['range'] == { 'start': { 'line': 17, 'character': 8 }, 'end': { 'line': 24, 'character': 11 } }
+
+        # Failures without a range, like unresolved signatures, are shown at the name of the function
+        messages = self.change(CORRECT.replace("def first(a: int)", "def first(a: Unknown)"))
+        diagnostics = messages[0]['params']['diagnostics']
+        assert "Unable to resolve signature" in diagnostics[0]['message']
+        assert diagnostics[0]['range'] == { 'start': { 'line': 3, 'character': 4 }, 'end': { 'line': 3, 'character': 9 } }
+
+    def test_unchanged_functions_are_reused(self) -> None:
+        self.change(CORRECT)
+        module = self.server.documents[URI].module
+
+        # Only the changed function is validated, in the same namespace
+        function_cache = self.server.documents[URI].function_cache
+        self.change(CORRECT.replace("The total.", "The sum."))
+        assert self.server.documents[URI].module is module
+        assert (function_cache.hits, function_cache.misses) == (1, 1)
+
+        # Changing imports creates a new namespace
+        self.change("import os\n" + CORRECT)
+        assert self.server.documents[URI].module is not module
+
+    def test_unresolved_types_are_reset(self) -> None:
+        text = CORRECT.replace("def first(a: int)", "def first(a: Unknown)")
+        self.change(text)
+        module = self.server.documents[URI].module
+        unresolved_types = list(module.__unresolved_types__)
+        assert len(unresolved_types) > 0
+        for i in range(3):
+            self.change(text.replace("Returns a.", f"Returns a {i}."))
+        assert self.server.documents[URI].module is module
+        assert module.__unresolved_types__ == unresolved_types
+
+    def test_failed_request_is_answered(self) -> None:
+        self.output.seek(0)
+        self.output.truncate()
+        self.server.handle_message({ 'jsonrpc': '2.0', 'id': 2, 'method': 'initialize', 'params': { 'rootUri': 42 } })
+        self.server.handle_message({ 'jsonrpc': '2.0', 'method': 'textDocument/didOpen', 'params': {} })
+        messages = get_messages(self.output)
+        assert len(messages) == 1
+        assert messages[0]['id'] == 2
+        assert messages[0]['error']['code'] == -32603
+
+        # The server keeps serving
+        assert self.change(CORRECT)[0]['params']['diagnostics'] == []
+
+    def test_syntax_errors_keep_diagnostics(self) -> None:
+        self.change(CORRECT)
+        assert self.change(CORRECT + "\ndef broken(:\n") == []
+
+    def test_fast(self) -> None:
+        text = CORRECT + "".join(CORRECT[CORRECT.index("def first"):].replace("first", f"first_{i}").replace("Numbers", f"Numbers{i}") for i in range(50))
+        self.change(text)
+        start = time.perf_counter()
+        self.change(text.replace("Returns a.", "Returns the number a.", 1))
+        assert time.perf_counter() - start < 0.1
+
+    def test_close(self) -> None:
+        self.change(CORRECT)
+        self.server.handle_message({ 'jsonrpc': '2.0', 'method': 'textDocument/didClose', 'params': { 'textDocument': { 'uri': URI } } })
+        assert URI not in self.server.documents
+
+    def test_serve(self) -> None:
+        requests = io.BytesIO()
+        write_message(requests, { 'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {} })
+        write_message(requests, { 'jsonrpc': '2.0', 'id': 2, 'method': 'textDocument/hover', 'params': {} })
+        write_message(requests, { 'jsonrpc': '2.0', 'id': 3, 'method': 'shutdown' })
+        write_message(requests, { 'jsonrpc': '2.0', 'method': 'exit' })
+        requests.seek(0)
+
+        output = io.BytesIO()
+        assert LanguageServer(requests, output, os.getcwd()).serve() == 0
+        messages = get_messages(output)
+        assert [m['id'] for m in messages] == [1, 2, 3]
+        assert messages[1]['error']['code'] == -32601
+        assert messages[2]['result'] is None
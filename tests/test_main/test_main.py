@@ -1,10 +1,20 @@
+import os
+import sys
+import shutil
+import weakref
+import tempfile
+
+from types import ModuleType
+from typing import List
+
 import pytest
 
 from pydoctest.reporters.text_reporter import TextReporter
 from pydoctest.reporters.json_reporter import JSONReporter
 from pydoctest.configuration import Configuration
-from pydoctest.validation import ResultType, validate_class, validate_function
+from pydoctest.validation import ModuleValidationResult, ResultType, ValidationResult, validate_class, validate_function
 from pydoctest.main import PyDoctestService, get_configuration, get_reporter
+from pydoctest.symbols import get_symbol_index
 
 
 class TestMain():
@@ -24,6 +34,150 @@ class TestMain():
         assert result.module_results[0].result == ResultType.NOT_RUN
         assert "Failed to load file from location" in result.module_results[0].fail_reason
 
+    def test_batch_parsing_matches(self) -> None:
+        for mode in [ 'import', 'static', 'hybrid' ]:
+            outputs = []
+            for batch_parse_threshold in [ 0, 1 ]:
+                config = Configuration.get_default_configuration("tests/test_class")
+                config.include_paths = [ "*.py" ]
+                config.exclude_paths = [ "__init__.py", "test_class.py" ]
+                config.verbosity = 2
+                config.cache = False
+                config.jobs = 1
+                config.mode = mode
+                config.batch_parse_threshold = batch_parse_threshold
+                ds = PyDoctestService(config)
+                outputs.append(TextReporter(config).get_output(ds.validate()))
+
+            assert outputs[0] == outputs[1]
+
+
+class TestModuleLoading():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        package = os.path.join(self.directory, 'loading_package')
+        os.mkdir(package)
+        self.write('loading_package/__init__.py', '')
+        self.write('loading_package/a.py', LOADING_MODULE_A)
+        self.write('loading_package/b.py', LOADING_MODULE_B)
+        sys.path.insert(0, self.directory)
+
+    def teardown_method(self) -> None:
+        sys.path.remove(self.directory)
+        for name in [ 'loading_package', 'loading_package.a', 'loading_package.b', 'loading_package.c' ]:
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.directory)
+
+    def write(self, path: str, content: str) -> None:
+        with open(os.path.join(self.directory, path), 'w') as f:
+            f.write(content)
+
+    def get_executions(self) -> List[str]:
+        with open(os.path.join(self.directory, 'executions.log')) as f:
+            return f.read().split()
+
+    def validate(self, isolate_modules: bool = False) -> ValidationResult:
+        config = Configuration.get_default_configuration(self.directory)
+        config.include_paths = [ "**/*.py" ]
+        config.cache = False
+        config.jobs = 1
+        config.isolate_modules = isolate_modules
+        return PyDoctestService(config).validate()
+
+    def test_module_executed_once(self) -> None:
+        result = self.validate()
+        assert result.result == ResultType.OK
+        assert len(result.module_results) == 2
+        assert sorted(self.get_executions()) == [ 'loading_package.a', 'loading_package.b' ]
+        assert sys.modules['loading_package.a'].__file__ == os.path.join(self.directory, 'loading_package', 'a.py')
+
+    def test_changed_module_executed_again(self) -> None:
+        self.validate()
+        self.write('loading_package/a.py', LOADING_MODULE_A + '\n')
+        os.utime(os.path.join(self.directory, 'loading_package', 'a.py'), ns=(0, 0))
+        self.validate()
+        assert sorted(self.get_executions()) == [ 'loading_package.a', 'loading_package.a', 'loading_package.b' ]
+
+    def test_isolated_modules_removed(self) -> None:
+        isolated = self.validate(isolate_modules=True)
+        assert isolated.result == ResultType.OK
+        # Module a is executed again when imported by module b, after being removed
+        assert sorted(self.get_executions()) == [ 'loading_package.a', 'loading_package.a', 'loading_package.b' ]
+        assert not any(name.startswith('loading_package') for name in sys.modules)
+
+        config = Configuration.get_default_configuration()
+        assert TextReporter(config).get_output(isolated) == TextReporter(config).get_output(self.validate())
+
+    def test_isolated_modules_collected(self) -> None:
+        # Item is not bound by module c, so it is resolved by indexing the modules c imports
+        self.write('loading_package/c.py', LOADING_MODULE_C)
+        modules: List['weakref.ReferenceType[ModuleType]'] = []
+
+        class RecordingService(PyDoctestService):
+            def validate_module(self, module_path: str) -> ModuleValidationResult:
+                result = super().validate_module(module_path)
+                modules.extend(weakref.ref(m) for name, m in sys.modules.items() if name.startswith('loading_package'))
+                return result
+
+        config = Configuration.get_default_configuration(self.directory)
+        config.include_paths = [ "**/c.py" ]
+        config.cache = False
+        config.jobs = 1
+        config.isolate_modules = True
+        result = RecordingService(config).validate()
+        assert result.result == ResultType.OK
+        assert get_symbol_index().statistics['index'] > 0
+
+        # Neither the symbol index nor the type cache keep the removed modules alive
+        assert len(modules) == 3
+        assert all(module() is None for module in modules)
+
+
+LOADING_MODULE_A = """
+import os
+
+with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'executions.log'), 'a') as f:
+    f.write(__name__ + '\\n')
+
+
+class Item():
+    pass
+"""
+
+LOADING_MODULE_B = """
+import os
+
+from loading_package.a import Item
+
+with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'executions.log'), 'a') as f:
+    f.write(__name__ + '\\n')
+
+
+def get_item(item: Item) -> Item:
+    \"\"\"Returns the item.
+
+    Args:
+        item (Item): The item.
+
+    Returns:
+        Item: The item.
+    \"\"\"
+    return item
+"""
+
+LOADING_MODULE_C = """
+from loading_package import a
+
+
+def get_item(item: a.Item) -> None:
+    \"\"\"Takes the item.
+
+    Args:
+        item (Item): The item.
+    \"\"\"
+    pass
+"""
+
 
 class TestGetConfiguration():
     def test_get_configuration_with_root_dir(self) -> None:
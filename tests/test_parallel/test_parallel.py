@@ -0,0 +1,237 @@
+import gc
+import os
+import sys
+import pickle
+import shutil
+import tempfile
+
+from pydoctest import logging
+from pydoctest.configuration import Configuration
+from pydoctest.main import PyDoctestService, get_output
+from pydoctest.parallel import get_estimated_costs, get_preload_modules, get_timings_path, load_observed_modules, load_timings
+from pydoctest.reporters.json_reporter import JSONReporter
+from pydoctest.reporters.text_reporter import TextReporter
+from pydoctest.validation import ResultType
+
+
+def get_config(jobs: int) -> Configuration:
+    config = Configuration.get_default_configuration("tests/test_class")
+    config.include_paths = [ "*.py" ]
+    config.exclude_paths = [ "__init__.py" ]
+    config.verbosity = 2
+    config.fail_on_missing_docstring = True
+    config.jobs = jobs
+    config.cache = False
+    return config
+
+
+class TestParallel():
+    def test_parallel_output_matches_serial(self) -> None:
+        serial_config = get_config(1)
+        serial = PyDoctestService(serial_config).validate()
+
+        parallel_config = get_config(2)
+        parallel = PyDoctestService(parallel_config).validate()
+
+        assert len(parallel.module_results) > 1
+        assert [m.module_path for m in parallel.module_results] == [m.module_path for m in serial.module_results]
+        assert get_output(TextReporter(parallel_config), parallel_config, parallel) == get_output(TextReporter(serial_config), serial_config, serial)
+        assert parallel.to_dict().keys() == serial.to_dict().keys()
+        assert parallel.result == serial.result == ResultType.FAILED
+
+    def test_parallel_results_are_detached(self) -> None:
+        config = get_config(2)
+        result = PyDoctestService(config).validate()
+
+        # Results from workers must be picklable, and serializable like serial results
+        pickle.loads(pickle.dumps(result))
+        JSONReporter(config).get_output(result)
+
+    def test_detach_keeps_names(self) -> None:
+        config = get_config(1)
+        result = PyDoctestService(config).validate()
+        function_result = result.module_results[0].class_results[0].function_results[0]
+        name, file = function_result.function.__name__, function_result.module.__file__
+
+        result.module_results[0].detach()
+        assert function_result.function.__name__ == name
+        assert function_result.module.__file__ == file
+
+
+class TestScheduling():
+    def test_estimate_by_size_without_timings(self) -> None:
+        paths = [ "tests/test_class/counts_class.py", "tests/test_class/correct_class.py" ]
+        costs = get_estimated_costs(paths, {}, "")
+        assert costs == [ os.path.getsize(p) for p in paths ]
+
+    def test_estimate_uses_timings(self) -> None:
+        paths = [ "tests/test_class/counts_class.py", "tests/test_class/correct_class.py" ]
+        sizes = [ os.path.getsize(p) for p in paths ]
+        timings = { os.path.relpath(paths[0]): 2.0 }
+
+        costs = get_estimated_costs(paths, timings, "")
+        assert costs[0] == 2.0
+        # Estimated using the seconds per byte of the module with a timing
+        assert costs[1] == sizes[1] * 2.0 / sizes[0]
+
+    def test_timings_are_recorded(self) -> None:
+        config = get_config(2)
+        config.cache = True
+        config.cache_directory = tempfile.mkdtemp()
+        try:
+            result = PyDoctestService(config).validate()
+
+            timings = load_timings(config)
+            assert get_timings_path(config) == os.path.join(config.cache_directory, 'timings.json')
+            assert sorted(timings.keys()) == sorted(os.path.basename(m.module_path) for m in result.module_results)
+            assert all(t >= 0 for t in timings.values())
+        finally:
+            shutil.rmtree(config.cache_directory)
+
+    def test_timings_not_recorded_without_cache(self) -> None:
+        config = get_config(2)
+        config.cache_directory = tempfile.mkdtemp()
+        try:
+            PyDoctestService(config).validate()
+            assert os.listdir(config.cache_directory) == []
+            assert load_timings(config) == {}
+        finally:
+            shutil.rmtree(config.cache_directory)
+
+
+class TestPreload():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.dependency_directory = tempfile.mkdtemp()
+        with open(os.path.join(self.dependency_directory, 'preloaded_dependency.py'), 'w') as f:
+            f.write("class Dependency():\n    pass\n")
+        for name in [ 'first', 'second' ]:
+            with open(os.path.join(self.directory, f'{name}.py'), 'w') as f:
+                f.write(PRELOAD_MODULE)
+        sys.path.insert(0, self.dependency_directory)
+
+    def teardown_method(self) -> None:
+        sys.path.remove(self.dependency_directory)
+        sys.modules.pop('preloaded_dependency', None)
+        shutil.rmtree(self.directory)
+        shutil.rmtree(self.dependency_directory)
+
+    def get_config(self) -> Configuration:
+        config = Configuration.get_default_configuration(self.directory)
+        config.cache = False
+        config.jobs = 2
+        return config
+
+    def test_preload_modules(self) -> None:
+        config = self.get_config()
+        config.preload_modules = [ 'preloaded_dependency', 'not_a_module_to_preload' ]
+        assert get_preload_modules(config) == [ 'preloaded_dependency', 'not_a_module_to_preload' ]
+
+        result = PyDoctestService(config).validate()
+        assert result.result == ResultType.OK
+        assert len(result.module_results) == 2
+        assert 'preloaded_dependency' in sys.modules
+        if hasattr(gc, 'get_freeze_count'):
+            assert gc.get_freeze_count() == 0
+
+    def test_preload_observed_modules(self) -> None:
+        config = self.get_config()
+        config.cache = True
+        config.preload_observed_modules = True
+        PyDoctestService(config).validate()
+        assert 'preloaded_dependency' in load_observed_modules(config)
+        assert not any(name in load_observed_modules(config) for name in [ 'first', 'second' ])
+        assert 'preloaded_dependency' not in sys.modules
+
+        # Changed, so they are validated again instead of replayed from the cache
+        for name in [ 'first', 'second' ]:
+            with open(os.path.join(self.directory, f'{name}.py'), 'a') as f:
+                f.write("\n")
+        result = PyDoctestService(config).validate()
+        assert result.result == ResultType.OK
+        assert 'preloaded_dependency' in sys.modules
+        # Preloaded modules are not imported by the workers, but are kept for the next run
+        assert 'preloaded_dependency' in load_observed_modules(config)
+
+
+PRELOAD_MODULE = """
+from preloaded_dependency import Dependency
+
+
+def get_dependency(dependency: Dependency) -> Dependency:
+    \"\"\"Returns the dependency.
+
+    Args:
+        dependency (Dependency): The dependency.
+
+    Returns:
+        Dependency: The dependency.
+    \"\"\"
+    return dependency
+"""
+
+
+class TestRecycling():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def teardown_method(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_recycled_output_matches_serial(self) -> None:
+        serial_config = get_config(1)
+        serial = PyDoctestService(serial_config).validate()
+
+        recycled_config = get_config(2)
+        recycled_config.worker_max_modules = 1
+        recycled = PyDoctestService(recycled_config).validate()
+
+        assert TextReporter(recycled_config).get_output(recycled) == TextReporter(serial_config).get_output(serial)
+
+    def test_memory_limit(self) -> None:
+        serial = PyDoctestService(get_config(1)).validate()
+
+        # Every worker exceeds the limit, so it is either recycled after a module, or killed and the module retried
+        config = get_config(2)
+        config.worker_max_memory_mb = 1
+        limited = PyDoctestService(config).validate()
+
+        assert [m.module_path for m in limited.module_results] == [m.module_path for m in serial.module_results]
+        for limited_result, serial_result in zip(limited.module_results, serial.module_results):
+            if limited_result.fail_reason != "":
+                assert "memory limit of 1 MB" in limited_result.fail_reason
+            else:
+                assert [f.result for c in limited_result.class_results for f in c.function_results] == \
+                    [f.result for c in serial_result.class_results for f in c.function_results]
+
+    def test_exited_worker_is_retried(self) -> None:
+        for name, content in [ ('exits', "import os\nos._exit(3)\n"), ('valid', "") ]:
+            with open(os.path.join(self.directory, f'{name}.py'), 'w') as f:
+                f.write(content)
+        config = Configuration.get_default_configuration(self.directory)
+        config.cache = False
+        config.jobs = 2
+
+        result = PyDoctestService(config).validate()
+        module_results = { os.path.basename(m.module_path): m for m in result.module_results }
+        assert module_results['exits.py'].result == ResultType.FAILED
+        assert "exit code 3" in module_results['exits.py'].fail_reason
+        assert module_results['valid.py'].fail_reason == ""
+
+    def test_worker_memory_collected_with_debug(self) -> None:
+        config = get_config(2)
+        config.worker_max_modules = 1
+        result = PyDoctestService(config).validate()
+        assert result.worker_memory == []
+        assert 'worker_memory' not in result.to_dict()
+
+        logging.set_verbose(True)
+        try:
+            result = PyDoctestService(config).validate()
+        finally:
+            logging.set_verbose(False)
+
+        # Every module is validated by a new worker
+        assert len(result.worker_memory) == len(result.module_results)
+        assert all(memory > 0 for memory in result.worker_memory)
+        assert result.to_dict()['worker_memory'] == result.worker_memory
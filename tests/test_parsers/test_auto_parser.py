@@ -0,0 +1,93 @@
+import pydoc
+
+from types import ModuleType
+from typing import Any, Callable, List
+
+from pydoctest.configuration import Configuration
+from pydoctest.main import PyDoctestService
+from pydoctest.parsers.auto_parser import AutoParser, get_docstring_style
+from pydoctest.parsers.google_parser import GoogleParser
+from pydoctest.parsers.numpy_parser import NumpyParser
+from pydoctest.parsers.parser import Parser
+from pydoctest.parsers.sphinx_parser import SphinxParser
+
+import tests.test_parsers.google_class
+import tests.test_parsers.numpy_class
+import tests.test_parsers.sphinx_class
+
+
+def get_docs(module: ModuleType) -> List[str]:
+    return [
+        pydoc.getdoc(fn) for cl in vars(module).values() if isinstance(cl, type) and cl.__module__ == module.__name__
+        for fn in vars(cl).values() if callable(fn)
+    ]
+
+
+def get_parsed(parser: Parser, doc: str, module: ModuleType) -> List[Any]:
+    def get(parse: Callable[[], Any]) -> Any:
+        try:
+            return parse()
+        except Exception as e:
+            return repr(e)
+
+    return [
+        get(lambda: parser.get_summary(doc, module)),
+        get(lambda: [(p.name, p.type, p.is_optional) for p in parser.get_parameters(doc, module)]),
+        get(lambda: parser.get_return_type(doc, module)),
+        get(lambda: parser.get_exceptions_raised(doc)),
+    ]
+
+
+class TestAutoParser():
+    def test_get_docstring_style(self) -> None:
+        assert get_docstring_style("Summary.\n\nArgs:\n    a (int): A.\n") == 'google'
+        assert get_docstring_style("Summary.\n\nParameters\n----------\na : int\n    A.\n") == 'numpy'
+        assert get_docstring_style("Summary.\n\n:param a: A.\n:type a: int\n") == 'sphinx'
+        assert get_docstring_style("Summary only.") == 'google'
+        assert get_docstring_style("Summary.\n\nNotes\n-----\nNot a numpy section pydoctest parses.\n") == 'google'
+
+    def test_auto_parser_matches_style_parser(self) -> None:
+        auto_parser = AutoParser()
+        fixtures = [
+            (tests.test_parsers.google_class, GoogleParser(), 'google'),
+            (tests.test_parsers.numpy_class, NumpyParser(), 'numpy'),
+            (tests.test_parsers.sphinx_class, SphinxParser(), 'sphinx'),
+        ]
+        for module, parser, style in fixtures:
+            # Docstrings without any markers, e.g. only a summary, are parsed as google
+            docs = [doc for doc in get_docs(module) if get_docstring_style(doc) == style]
+            assert len(docs) > 0
+            for doc in docs:
+                assert get_parsed(auto_parser, doc, module) == get_parsed(parser, doc, module)
+                assert isinstance(auto_parser.parse(doc, module).parser, type(parser))
+
+    def test_parse_batch(self) -> None:
+        auto_parser = AutoParser()
+        modules = [ tests.test_parsers.google_class, tests.test_parsers.numpy_class, tests.test_parsers.sphinx_class ]
+        for module in modules:
+            docs = get_docs(module)
+            parsed_docs = auto_parser.parse_batch(docs, module)
+            assert [parsed.doc for parsed in parsed_docs] == docs
+            assert [type(parsed.parser) for parsed in parsed_docs] == [type(auto_parser.get_docstring_parser(doc)) for doc in docs]
+
+    def test_parser_paths(self) -> None:
+        def get_config(parser: str) -> Configuration:
+            config = Configuration.get_default_configuration("tests/test_parsers")
+            config.include_paths = [ "*_class.py" ]
+            config.verbosity = 2
+            config.cache = False
+            config.jobs = 1
+            config.parser = parser
+            return config
+
+        config = get_config('google')
+        config.parser_paths = { "numpy_*.py": "numpy", "sphinx_*.py": "sphinx" }
+        mixed = PyDoctestService(config).validate()
+        assert len(mixed.module_results) == 3
+
+        for module_result in mixed.module_results:
+            style = module_result.module_path.split('/')[-1].split('_')[0]
+            style_config = get_config(style)
+            expected = PyDoctestService(style_config).validate([module_result.module_path])
+            assert [f.result for c in module_result.class_results for f in c.function_results] == \
+                [f.result for c in expected.module_results[0].class_results for f in c.function_results]
@@ -1,9 +1,11 @@
 import pydoc
 import sys
+from typing import Any
 from typing_extensions import Literal
 import pytest
 
-from pydoctest.parsers.google_parser import GoogleParser
+from pydoctest.parsers.google_parser import ARGUMENT_REGEX, GoogleParser, get_arguments_batch
+from pydoctest.parsers.parser import clear_parsed_docstrings
 from pydoctest.exceptions import ParseException
 
 import tests.test_class.incorrect_class
@@ -210,3 +212,39 @@ class TestGoogleParser():
         assert parameters[1].name == 'b'
         assert parameters[1].type == int
         assert parameters[1].is_optional is True
+
+    def test_get_arguments_batch(self) -> None:
+        sections = [
+            'Args:\n    a (int): A.\n    b (Optional[str], optional): B.\n',
+            '',
+            'Args:\n    c (int): no trailing newline',
+            'Args:\n',
+            'Args:\n    d (\n    int): split',
+            'Args:\n    e (int): E.',
+        ]
+        batch = [[m.group(0) for m in matches] for matches in get_arguments_batch(sections)]
+        assert batch == [[m.group(0) for m in ARGUMENT_REGEX.finditer(section)] for section in sections]
+        assert get_arguments_batch([]) == []
+
+    def test_parse_batch_matches_parse(self) -> None:
+        for module in [ tests.test_parsers.google_class, tests.test_class.incorrect_class ]:
+            docs = [
+                pydoc.getdoc(fn) for cl in vars(module).values() if isinstance(cl, type) and cl.__module__ == module.__name__
+                for fn in vars(cl).values() if callable(fn)
+            ]
+            assert len(docs) > 0
+
+            def get_parameters(doc: str) -> Any:
+                try:
+                    return [(p.name, p.type, p.is_optional) for p in GoogleParser().parse(doc, module).get_parameters()]
+                except ParseException as e:
+                    return str(e)
+
+            clear_parsed_docstrings()
+            expected = [get_parameters(doc) for doc in docs]
+            clear_parsed_docstrings()
+            parsed_docs = GoogleParser().parse_batch(docs, module)
+            assert [parsed.doc for parsed in parsed_docs] == docs
+            assert any(parsed.get_split().scanned for parsed in parsed_docs)
+            assert [get_parameters(doc) for doc in docs] == expected
+            clear_parsed_docstrings()
@@ -4,6 +4,7 @@ from typing import Any, Dict
 import pytest
 
 from pydoctest.parsers.numpy_parser import NumpyParser
+from pydoctest.parsers.parser import Section
 from pydoctest.exceptions import ParseException
 
 import tests.test_parsers.numpy_class
@@ -193,3 +194,12 @@ class TestNumpyParser():
         assert parameters[1].name == 'b'
         assert parameters[1].type == int
         assert parameters[1].is_optional is True
+
+    def test_split_docstring(self) -> None:
+        doc = "Summary.\n\nParameters\n----------\na : int\n    Description.\n\nReturns\n-------\nint\n    Description.\n"
+        sections = NumpyParser().split_docstring(doc)
+        assert sections.sections[Section.SUMMARY] == "Summary.\n\n"
+        assert sections.sections[Section.ARGUMENTS] == "a : int\n    Description.\n\n"
+        assert sections.sections[Section.RETURNS] == "int\n    Description.\n"
+        assert Section.RAISES not in sections.sections
+        assert sections.invalid == set()
@@ -0,0 +1,72 @@
+import pydoc
+
+import pytest
+
+from typing import Union
+
+from pydoctest.exceptions import ParseException
+from pydoctest.parsers.google_parser import GoogleParser
+from pydoctest.parsers.numpy_parser import NumpyParser
+from pydoctest.parsers.parser import clear_parsed_docstrings
+from pydoctest.utilities import StaticModule
+
+import tests.test_class.incorrect_class
+import tests.test_parsers.google_class
+
+
+class TestParser():
+    def test_parse(self) -> None:
+        doc = pydoc.getdoc(tests.test_parsers.google_class.GoogleClass.function_with_pipe)
+        parsed = GoogleParser().parse(doc, tests.test_parsers.google_class)
+        assert parsed.get_summary() == '_summary_'
+        assert [p.name for p in parsed.get_parameters()] == ['a']
+        assert parsed.get_return_type() == Union[int, float]
+        assert parsed.get_exceptions_raised() == []
+
+    def test_parse_memoized(self) -> None:
+        doc = pydoc.getdoc(tests.test_parsers.google_class.GoogleClass.function_with_pipe)
+        parsed = GoogleParser().parse(doc, tests.test_parsers.google_class)
+        assert GoogleParser().parse(doc, tests.test_parsers.google_class) is parsed
+
+        # Types depend on the module, and the format on the parser
+        assert GoogleParser().parse(doc, tests.test_class.incorrect_class) is not parsed
+        assert NumpyParser().parse(doc, tests.test_parsers.google_class) is not parsed
+
+        clear_parsed_docstrings()
+        assert GoogleParser().parse(doc, tests.test_parsers.google_class) is not parsed
+
+    def test_parse_static_module_not_memoized(self) -> None:
+        module = StaticModule('static_module', 'static_module.py')
+        assert GoogleParser().parse('Summary.', module) is not GoogleParser().parse('Summary.', module)
+
+    def test_parse_errors_deferred(self) -> None:
+        doc = pydoc.getdoc(tests.test_class.incorrect_class.IncorrectTestClass.func_parse_exception)
+        parsed = GoogleParser().parse(doc, tests.test_class.incorrect_class)
+
+        # Sections are parsed when used, and raise the same error every time
+        assert parsed.sections == {}
+        parsed.get_summary()
+        for _ in range(2):
+            with pytest.raises(ParseException):
+                parsed.get_parameters()
+        assert set(parsed.sections.keys()) == { 'summary', 'parameters' }
+
+    def test_parse_splits_once(self) -> None:
+        doc = pydoc.getdoc(tests.test_parsers.google_class.GoogleClass.function_with_pipe)
+        parser = GoogleParser()
+        parsed = parser.parse(doc, tests.test_parsers.google_class)
+        parsed.split = None
+        clear_parsed_docstrings()
+
+        splits = []
+        split_docstring = parser.split_docstring
+        parser.split_docstring = lambda d: splits.append(d) or split_docstring(d)  # type: ignore
+        parsed.parser = parser
+        parsed.sections = {}
+
+        # All sections are parsed from the same split
+        parsed.get_summary()
+        parsed.get_parameters()
+        parsed.get_return_type()
+        parsed.get_exceptions_raised()
+        assert splits == [doc]
@@ -0,0 +1,66 @@
+from typing import Any, Dict
+
+import pytest
+
+import pydoctest.parsers.registry
+from pydoctest.configuration import Configuration
+from pydoctest.parsers.google_parser import GoogleParser
+from pydoctest.parsers.numpy_parser import NumpyParser
+from pydoctest.parsers.registry import PARSERS, get_parser, get_parser_names, register_parser
+
+
+class CustomParser(GoogleParser):
+    pass
+
+
+class EntryPoint():
+    def __init__(self, name: str, value: Any) -> None:
+        self.name = name
+        self.value = value
+        self.loaded = 0
+
+    def load(self) -> Any:
+        self.loaded += 1
+        return self.value
+
+
+class TestRegistry():
+    def test_get_parser_shared(self) -> None:
+        parser = get_parser('numpy')
+        assert isinstance(parser, NumpyParser)
+        assert get_parser('numpy') is parser
+
+        config = Configuration.get_default_configuration()
+        config.parser = 'numpy'
+        assert config.get_parser() is parser
+
+    def test_get_parser_unknown(self) -> None:
+        with pytest.raises(Exception) as e:
+            get_parser('kldfgjndfgnjg')
+        assert 'google' in str(e.value)
+
+    def test_register_parser(self) -> None:
+        register_parser('custom_registered', CustomParser)
+        try:
+            assert isinstance(get_parser('custom_registered'), CustomParser)
+            assert 'custom_registered' in get_parser_names()
+        finally:
+            PARSERS.pop('custom_registered')
+
+    def test_entry_point_loaded_when_selected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        entry_points: Dict[str, Any] = {
+            'custom_entry_point': EntryPoint('custom_entry_point', CustomParser),
+            'not_a_parser': EntryPoint('not_a_parser', object),
+        }
+        monkeypatch.setattr(pydoctest.parsers.registry, 'get_entry_points', lambda: entry_points)
+
+        get_parser('google')
+        assert entry_points['custom_entry_point'].loaded == 0
+
+        parser = get_parser('custom_entry_point')
+        assert isinstance(parser, CustomParser)
+        assert get_parser('custom_entry_point') is parser
+        assert entry_points['custom_entry_point'].loaded == 1
+
+        with pytest.raises(Exception):
+            get_parser('not_a_parser')
@@ -4,6 +4,7 @@ from typing import Dict, Any
 import pytest
 
 from pydoctest.parsers.sphinx_parser import SphinxParser
+from pydoctest.parsers.parser import Section
 from pydoctest.exceptions import ParseException
 
 import tests.test_parsers.sphinx_class
@@ -186,3 +187,11 @@ Sed condimentum elit non metus sagittis tempor. Cras mollis lacus lacus, vitae p
         assert parameters[1].name == 'b'
         assert parameters[1].type == int
         assert parameters[1].is_optional is True
+
+    def test_split_docstring(self) -> None:
+        doc = "Summary.\n\n:param a: Description.\n:type a: int\n:return: Description.\n:rtype: int\n"
+        sections = SphinxParser().split_docstring(doc)
+        assert sections.sections[Section.SUMMARY] == "Summary."
+        assert sections.sections[Section.ARGUMENTS] == ":param a: Description.\n:type a: int"
+        assert sections.sections[Section.RETURNS] == ":rtype: int"
+        assert sections.sections[Section.RAISES] == ""
@@ -0,0 +1,13 @@
+class QuotesClass():
+    def func_single_quotes(self, a: int) -> int:
+        r'''[summary]
+
+        Args:
+            a (float): [description]
+
+        Returns:
+            int: [description]
+        '''
+        return a
+
+    def func_one_liner(self) -> int: 'Summary only, missing the return type.'
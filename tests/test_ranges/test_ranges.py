@@ -4,6 +4,7 @@ from pydoctest.configuration import Configuration
 from pydoctest.validation import validate_function, ResultType
 
 import tests.test_ranges.example_class
+import tests.test_ranges.quotes_class
 import tests.test_class.raises_class
 
 
@@ -90,3 +91,26 @@ class TestRanges():
         assert result.range is not None
         assert result.range.start_line == 113
         assert result.range.end_line == 123
+
+    def test_func_columns(self) -> None:
+        config = Configuration.get_default_configuration()
+        result = validate_function(tests.test_ranges.example_class.ExampleClass.func_parse_exception, config, tests.test_ranges.example_class)
+        assert result.range is not None
+        assert result.range.start_character == 8
+        assert result.range.end_character == 11
+
+    def test_func_single_quotes(self) -> None:
+        config = Configuration.get_default_configuration()
+        result = validate_function(tests.test_ranges.quotes_class.QuotesClass.func_single_quotes, config, tests.test_ranges.quotes_class)
+        assert result.result == ResultType.FAILED
+        assert result.range is not None
+        assert (result.range.start_line, result.range.end_line) == (3, 10)
+        assert (result.range.start_character, result.range.end_character) == (8, 11)
+
+    def test_func_one_liner(self) -> None:
+        config = Configuration.get_default_configuration()
+        result = validate_function(tests.test_ranges.quotes_class.QuotesClass.func_one_liner, config, tests.test_ranges.quotes_class)
+        assert result.result == ResultType.FAILED
+        assert result.range is not None
+        assert (result.range.start_line, result.range.end_line) == (13, 13)
+        assert (result.range.start_character, result.range.end_character) == (37, 77)
@@ -0,0 +1,50 @@
+import functools
+
+from typing import Any, Callable
+
+
+def decorator(fn: Callable) -> Callable:
+    """Wraps the function.
+
+    Args:
+        fn (Callable): The function.
+
+    Returns:
+        Callable: The wrapped function.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args: Any) -> Any:
+        return fn(*args)
+    return wrapper
+
+
+@decorator
+def decorated(a: int) -> int:
+    """Decorated function.
+
+    Args:
+        a (int): A.
+
+    Raises:
+        ValueError: If a is negative.
+
+    Returns:
+        int: A.
+    """
+    if a < 0:
+        raise ValueError()
+    return a
+
+
+class ExampleClass():
+    def method(self) -> None:
+        """Method."""
+        pass
+
+    async def async_method(self) -> None:
+        """Async method.
+
+        Raises:
+            RuntimeError: Always.
+        """
+        raise RuntimeError()
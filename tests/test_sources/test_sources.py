@@ -0,0 +1,70 @@
+import os
+import sys
+import shutil
+import importlib
+import tempfile
+
+from pydoctest.sources import get_module_source
+from pydoctest.validation import RuntimeFunctionDefinition
+
+import tests.test_sources.example_sources as example_sources
+
+
+class TestSources():
+    def test_get_module_source_once(self) -> None:
+        source = get_module_source(example_sources)
+        assert source is not None
+        assert source is get_module_source(example_sources)
+        assert source.path == os.path.abspath(example_sources.__file__)
+
+    def test_get_function_node(self) -> None:
+        source = get_module_source(example_sources)
+        assert source is not None
+
+        node = source.get_function_node(example_sources.decorated)
+        assert node is not None and node.name == 'decorated' and node.lineno == 22
+        assert source.get_function_node(example_sources.ExampleClass.method).name == 'method'  # type: ignore
+        assert source.get_function_node(example_sources.ExampleClass.async_method).name == 'async_method'  # type: ignore
+
+        # Functions of other modules are not found
+        assert source.get_function_node(os.path.join) is None  # type: ignore
+
+    def test_function_definition(self) -> None:
+        definition = RuntimeFunctionDefinition(example_sources.decorated, example_sources)  # type: ignore
+        assert definition.node is not None
+        assert definition.get_first_line() == 21
+        assert definition.get_source().startswith('@decorator\ndef decorated(a: int) -> int:')
+        assert definition.get_source().endswith('    return a\n')
+        assert definition.get_exceptions_raised() == ['ValueError']
+        docstring_range = definition.get_docstring_range()
+        assert docstring_range is not None
+        assert (docstring_range.start_line, docstring_range.end_line) == (23, 33)
+
+        definition = RuntimeFunctionDefinition(example_sources.ExampleClass.async_method, example_sources)  # type: ignore
+        assert definition.get_exceptions_raised() == ['RuntimeError']
+        docstring_range = definition.get_docstring_range()
+        assert docstring_range is not None
+        assert (docstring_range.start_line, docstring_range.end_line) == (45, 49)
+
+    def test_changed_module(self) -> None:
+        directory = tempfile.mkdtemp()
+        sys.path.insert(0, directory)
+        try:
+            path = os.path.join(directory, 'changing_module.py')
+            with open(path, 'w') as f:
+                f.write('def a() -> None:\n    pass\n')
+            module = importlib.import_module('changing_module')
+            assert get_module_source(module).get_function_node(module.a) is not None  # type: ignore
+
+            with open(path, 'w') as f:
+                f.write('\n\ndef b() -> None:\n    pass\n')
+            del sys.modules['changing_module']
+            importlib.invalidate_caches()
+            module = importlib.import_module('changing_module')
+            source = get_module_source(module)
+            assert source is not None
+            assert source.get_function_node(module.b).lineno == 3  # type: ignore
+        finally:
+            sys.path.remove(directory)
+            sys.modules.pop('changing_module', None)
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,28 @@
+import sys
+from typing import TYPE_CHECKING
+
+
+if sys.version_info >= (3, 0):
+    def get_name() -> str:
+        """Returns the name.
+
+        Returns:
+            str: The name.
+        """
+        pass
+else:
+    def get_name() -> str:
+        pass
+
+
+if TYPE_CHECKING:
+    def get_count() -> int:
+        pass
+else:
+    def get_count() -> int:
+        """Returns the count.
+
+        Returns:
+            int: The count.
+        """
+        pass
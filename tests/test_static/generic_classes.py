@@ -0,0 +1,28 @@
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class Box(Generic[T]):
+    pass
+
+
+def open_box(box: Box[int]) -> int:
+    """Opens the box.
+
+    Args:
+        box (Box[int]): The box.
+
+    Returns:
+        int: The content of the box.
+    """
+    pass
+
+
+def invalid_annotation(value: Optional[int, str]) -> None:
+    """Optional only takes a single type.
+
+    Args:
+        value (Optional[int]): The value.
+    """
+    pass
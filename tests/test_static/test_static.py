@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from pydoctest.configuration import Configuration
+from pydoctest.main import PyDoctestService
+from pydoctest.reporters.text_reporter import TextReporter
+from pydoctest.validation import ResultType
+
+
+class TestStatic():
+    def test_module_is_not_executed(self) -> None:
+        config = Configuration.get_configuration_from_path("tests/test_static/pydoctest.json")
+        ds = PyDoctestService(config)
+        result = ds.validate()
+
+        module_result = result.module_results[0]
+        assert module_result.fail_reason == ""
+        assert module_result.result == ResultType.FAILED
+        assert len(module_result.function_results) == 1
+        assert len(module_result.class_results) == 1
+
+    def test_unloaded_imports_are_compared_by_name(self) -> None:
+        config = Configuration.get_configuration_from_path("tests/test_static/pydoctest.json")
+        ds = PyDoctestService(config)
+        result = ds.validate()
+
+        convert, wrong_type = result.module_results[0].class_results[0].function_results
+        assert convert.result == ResultType.OK
+        assert wrong_type.result == ResultType.FAILED
+        assert wrong_type.fail_reason.startswith("Argument type differ. Argument 'models' was expected (from signature) to have type 'typing.List[definitely_not_installed_package.models.Model]'")
+
+    def test_unknown_docstring_type(self) -> None:
+        config = Configuration.get_configuration_from_path("tests/test_static/pydoctest.json")
+        ds = PyDoctestService(config)
+        result = ds.validate()
+
+        unknown_type = result.module_results[0].function_results[0]
+        assert unknown_type.result == ResultType.FAILED
+        assert "Unknown type 'NotImportedAnywhere'" in unknown_type.fail_reason
+
+    def test_static_output_matches_import(self) -> None:
+        outputs = []
+        for mode in [ 'import', 'static' ]:
+            config = Configuration.get_configuration_from_path("tests/test_class/pydoctest_incorrect_class.json")
+            config.mode = mode
+            config.fail_on_missing_docstring = True
+            ds = PyDoctestService(config)
+            outputs.append(TextReporter(config).get_output(ds.validate()))
+
+        assert outputs[0] == outputs[1]
+
+    def test_class_modules_static_matches_import(self) -> None:
+        results = []
+        for mode in [ 'import', 'static' ]:
+            config = Configuration.get_default_configuration("tests/test_class")
+            config.include_paths = [ "*.py" ]
+            config.exclude_paths = [ "__init__.py", "test_class.py" ]
+            config.mode = mode
+            ds = PyDoctestService(config)
+            result = ds.validate()
+            results.append(sorted(
+                (os.path.basename(module_result.module_path), function_result.function.__qualname__, function_result.result, function_result.fail_reason)
+                for module_result in result.module_results
+                for function_result in module_result.function_results + [ f for c in module_result.class_results for f in c.function_results ]
+            ))
+
+        assert len(results[0]) > 0
+        assert results[0] == results[1]
+
+    def test_generic_class_stand_in(self) -> None:
+        config = Configuration.get_default_configuration("tests/test_static")
+        config.include_paths = [ "generic_classes.py" ]
+        config.mode = "static"
+        ds = PyDoctestService(config)
+        result = ds.validate()
+
+        module_result = result.module_results[0]
+        assert module_result.fail_reason == ""
+        function_results = { f.function.__name__: f for f in module_result.function_results }
+        assert function_results['open_box'].result == ResultType.OK
+        assert function_results['invalid_annotation'].result == ResultType.FAILED
+        assert "Optional" in function_results['invalid_annotation'].fail_reason
+
+    def test_conditional_definitions(self) -> None:
+        results = []
+        for mode in [ 'import', 'static' ]:
+            config = Configuration.get_default_configuration("tests/test_static")
+            config.include_paths = [ "conditional_definitions.py" ]
+            config.mode = mode
+            config.fail_on_missing_docstring = True
+            ds = PyDoctestService(config)
+            result = ds.validate()
+            results.append(sorted((f.function.__name__, f.result) for f in result.module_results[0].function_results))
+
+        assert results[0] == [ ('get_count', ResultType.OK), ('get_name', ResultType.OK) ]
+        assert results[0] == results[1]
+
+    def test_unknown_mode(self) -> None:
+        config = Configuration.get_default_configuration()
+        config.mode = "doesnotexist"
+        with pytest.raises(Exception) as exn_info:
+            config.get_mode()
+        assert 'Unknown mode' in str(exn_info.value)
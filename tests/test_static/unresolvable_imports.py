@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+import definitely_not_installed_package as dnip
+from definitely_not_installed_package.models import Model
+
+
+class LocalModel():
+    def convert(self, model: Model, size: Optional[int] = None) -> dnip.Frame:
+        """Converts the model.
+
+        Args:
+            model (Model): [description]
+            size (Optional[int], optional): [description]. Defaults to None.
+
+        Returns:
+            dnip.Frame: [description]
+        """
+        pass
+
+    def wrong_type(self, models: List[Model]) -> 'LocalModel':
+        """Argument type in docs does not match.
+
+        Args:
+            models (List[dnip.Frame]): [description]
+
+        Returns:
+            'LocalModel': [description]
+        """
+        pass
+
+
+def unknown_type(a: int) -> None:
+    """Docstring mentions a name the module does not bind.
+
+    Args:
+        a (NotImportedAnywhere): [description]
+    """
+    pass
+
+
+# The module must never be executed when validating statically
+raise RuntimeError("Module was executed")
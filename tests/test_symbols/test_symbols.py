@@ -0,0 +1,179 @@
+import os
+import sys
+import shutil
+import tempfile
+
+from types import ModuleType
+from typing import List
+
+import pydoctest
+from pydoctest.configuration import Configuration
+from pydoctest.symbols import SymbolIndex, get_symbol_index, set_symbol_index
+from pydoctest.utilities import locate_type_in_module
+
+
+THIS = sys.modules[__name__]
+
+
+class TestSymbolIndex():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def teardown_method(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_index_module_once(self) -> None:
+        index = SymbolIndex()
+        index.index_module(THIS)
+        modules = len(index.modules)
+        assert modules > 1
+        assert index.get('Parser') is pydoctest.parsers.parser.Parser
+
+        index.index_module(THIS)
+        assert len(index.modules) == modules
+
+    def test_submodule_imported_after_indexing(self) -> None:
+        package = os.path.join(self.directory, 'late_package')
+        os.mkdir(package)
+        with open(os.path.join(package, '__init__.py'), 'w') as f:
+            f.write('')
+        with open(os.path.join(package, 'late_module.py'), 'w') as f:
+            f.write('class LateType():\n    pass\n')
+
+        sys.path.insert(0, self.directory)
+        previous = get_symbol_index()
+        try:
+            import late_package
+            root = ModuleType('late_root')
+            setattr(root, 'late_package', late_package)
+
+            index = SymbolIndex()
+            set_symbol_index(index)
+            assert index.index_module(root)
+            assert 'LateType' not in index.names
+            assert not index.index_module(root)
+
+            # Importing the submodule binds it in the package, which is indexed again
+            import late_package.late_module
+            assert locate_type_in_module('LateType', root).type is late_package.late_module.LateType
+            assert index.get('LateType') is late_package.late_module.LateType
+        finally:
+            set_symbol_index(previous)
+            sys.path.remove(self.directory)
+            for name in [ 'late_package', 'late_package.late_module' ]:
+                sys.modules.pop(name, None)
+
+    def test_remove_modules(self) -> None:
+        shared = ModuleType('shared_module')
+        setattr(shared, 'SharedType', type('SharedType', (), {}))
+        removed = ModuleType('removed_module')
+        setattr(removed, 'shared_module', shared)
+        setattr(removed, 'SharedType', shared.SharedType)
+        root = ModuleType('remove_root')
+        setattr(root, 'removed_module', removed)
+        setattr(root, 'shared_module', shared)
+
+        index = SymbolIndex()
+        index.index_module(root)
+        assert index.get('SharedType') is shared.SharedType
+
+        index.remove_modules([ removed ])
+        assert id(removed) not in index.modules
+        assert 'removed_module.SharedType' not in index.qualified_names
+        assert all(removed not in indexed_module.children for indexed_module in index.modules.values())
+        assert 'removed_module' not in index.names
+
+        # The name is added again by the remaining module binding it
+        delattr(root, 'removed_module')
+        assert index.index_module(root)
+        assert index.get('SharedType') is shared.SharedType
+
+    def test_ambiguous_names_resolve_to_nearest(self) -> None:
+        first = ModuleType('first_items')
+        setattr(first, 'Item', type('Item', (), {}))
+        second = ModuleType('second_items')
+        setattr(second, 'Item', type('Item', (), {}))
+        wrapper = ModuleType('wrapper_module')
+        setattr(wrapper, 'second_items', second)
+        first_root = ModuleType('first_root')
+        setattr(first_root, 'first_items', first)
+        second_root = ModuleType('second_root')
+        setattr(second_root, 'second_items', second)
+        both_root = ModuleType('both_root')
+        setattr(both_root, 'wrapper_module', wrapper)
+        setattr(both_root, 'first_items', first)
+
+        # The result does not depend on which module was searched first
+        for roots in [ [ first_root, second_root, both_root ], [ both_root, second_root, first_root ] ]:
+            index = SymbolIndex()
+            for root in roots:
+                index.index_module(root)
+            assert 'Item' in index.ambiguous_names
+            assert index.evaluate('Item', first_root) is first.Item
+            assert index.evaluate('Item', second_root) is second.Item
+            assert index.evaluate('Item', both_root) is first.Item
+            assert 'Item' not in index.get_references()
+
+        # The module is indexed when it is first looked up from, so the other binding is known
+        index = SymbolIndex()
+        index.index_module(first_root)
+        assert index.evaluate('Item', second_root) is second.Item
+
+    def test_get_unknown(self) -> None:
+        index = SymbolIndex()
+        index.index_module(THIS)
+        try:
+            index.get('NotAName')
+            assert False, 'Expected KeyError'
+        except KeyError:
+            pass
+
+    def test_search_limit(self) -> None:
+        index = SymbolIndex(search_limit=1)
+        index.index_module(THIS)
+        assert len(index.modules) == 1
+        assert 'Parser' not in index.names
+
+    def test_evaluate(self) -> None:
+        index = SymbolIndex()
+        index.index_module(THIS)
+        assert index.evaluate('pydoctest.parsers.parser.Parser', THIS) is pydoctest.parsers.parser.Parser
+        assert index.evaluate('List[Parser]', THIS) == List[pydoctest.parsers.parser.Parser]
+
+        # Names bound by the module take precedence over the index
+        assert index.evaluate('Configuration', THIS) is Configuration
+
+    def test_save_load(self) -> None:
+        path = os.path.join(self.directory, 'cache', 'symbols.json')
+        index = SymbolIndex()
+        index.index_module(THIS)
+        index.get('GoogleParser')
+        index.save(path)
+
+        loaded = SymbolIndex()
+        loaded.load(path)
+        assert loaded.references == { 'GoogleParser': ('pydoctest.parsers.google_parser', 'GoogleParser') }
+        assert len(loaded.modules) == 0
+        assert loaded.get('GoogleParser') is pydoctest.parsers.google_parser.GoogleParser
+
+    def test_load_invalid(self) -> None:
+        path = os.path.join(self.directory, 'symbols.json')
+        with open(path, 'w') as f:
+            f.write('{ invalid')
+        index = SymbolIndex()
+        index.load(path)
+        assert index.references == {}
+
+    def test_statistics(self) -> None:
+        previous = get_symbol_index()
+        index = SymbolIndex()
+        set_symbol_index(index)
+        try:
+            locate_type_in_module('int', THIS)
+            locate_type_in_module('Configuration', THIS)
+            locate_type_in_module('Parser', THIS)
+            locate_type_in_module('Parser', THIS)
+            assert index.statistics == { 'locate': 1, 'eval': 1, 'index': 2, 'unknown': 0 }
+            assert 'index: 2' in index.get_statistics()
+        finally:
+            set_symbol_index(previous)
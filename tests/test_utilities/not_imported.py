@@ -0,0 +1,5 @@
+# Only imported by test_get_type_from_module_import_types, which checks whether it is imported
+
+
+class NotImported():
+    pass
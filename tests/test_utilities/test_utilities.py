@@ -1,11 +1,17 @@
+import os
 import sys
 
+from types import ModuleType
+from typing import List, Optional
+
 # These two imports are necessary for test_get_type_from_module_bfs
 import pydoctest
 from pydoctest.configuration import Configuration
+from pydoctest.exceptions import UnknownTypeException
 
 from pydoctest.validation import validate_function
-from pydoctest.utilities import dedent_from_first, get_exceptions_raised, get_type_from_module, is_excluded_path, parse_cli_list, is_excluded_function, is_excluded_class
+from pydoctest.symbols import SymbolIndex, get_symbol_index, set_symbol_index
+from pydoctest.utilities import TypeCache, get_module_name, get_type_cache, locate_loaded, get_exceptions_raised, get_type_from_module, get_type_paths, is_excluded_path, is_shared_module, restore_modules, parse_cli_list, is_excluded_function, is_excluded_class
 import tests.test_utilities.example_class
 
 
@@ -35,13 +41,94 @@ class TestUtilities():
         # Parser is not found in this module, but it is imported by Configuration which we do import.
         result = get_type_from_module('Parser', THIS)
         assert result.type == pydoctest.parsers.parser.Parser
-        assert result.method == 'deque'
+        assert result.method == 'index'
 
     def test_get_type_from_module_raises(self) -> None:
         config = Configuration.get_default_configuration()
         result = validate_function(tests.test_utilities.example_class.ExampleClass.func_raises, config, tests.test_utilities.example_class)
         assert "Unable to parse docstring: Unknown type 'DEFINITELYNOTACLASS' in 'a (DEFINITELYNOTACLASS): [description]'" in result.fail_reason
 
+    def test_type_cache_global(self) -> None:
+        cache = TypeCache()
+        assert cache.get_global_names('Optional[List[int]]') == { 'Optional': Optional, 'List': List, 'int': int }
+        assert cache.get_global_names('typing.Dict[str, int]') is not None
+        assert cache.get_global_names('DataObject') is None
+        assert cache.get_global_names('Optional[') is None
+
+        result = get_type_from_module('Optional[int]', THIS)
+        cache.store('Optional[int]', THIS, result)
+        assert 'Optional[int]' in cache.global_types
+        assert cache.get('Optional[int]', THIS) is result
+        other = ModuleType('other')
+        other.Optional = Optional  # type: ignore
+        assert cache.get('Optional[int]', other) is result
+
+        # Modules binding the names to something else, or not at all, do not use the global result
+        shadowing = ModuleType('shadowing')
+        shadowing.Optional = List  # type: ignore
+        assert cache.get('Optional[int]', shadowing) is None
+        assert cache.get('Optional[int]', ModuleType('empty')) is None
+        assert cache.statistics == { 'global': 2, 'module': 0, 'miss': 2 }
+
+    def test_type_cache_module(self) -> None:
+        cache = TypeCache()
+        result = get_type_from_module('DataObject', THIS)
+        cache.store('DataObject', THIS, result)
+        cache.store('NotAClass', THIS, 'Unknown')
+        assert cache.get('DataObject', THIS) is result
+        assert cache.get('NotAClass', THIS) == 'Unknown'
+        assert cache.get('DataObject', tests.test_utilities.example_class) is None
+
+        cache.clear_modules()
+        assert cache.get('DataObject', THIS) is None
+        assert 'module: 2 (50%)' in cache.get_statistics()
+
+    def test_get_type_from_module_cached(self) -> None:
+        cached = get_type_from_module('Optional[DataObject]', THIS)
+        assert get_type_from_module('Optional[DataObject]', THIS) is cached
+
+        for _ in range(2):
+            try:
+                get_type_from_module('DEFINITELYNOTACLASS', THIS)
+                assert False, 'Expected UnknownTypeException'
+            except UnknownTypeException as e:
+                assert 'DEFINITELYNOTACLASS' in str(e)
+
+    def test_locate_loaded(self) -> None:
+        assert locate_loaded('int') is int
+        assert locate_loaded('os.path.join') is os.path.join
+        assert locate_loaded(f'{__name__}.DataObject') is DataObject
+        assert locate_loaded('os.path.not_a_function') is None
+        assert locate_loaded('Optional[int]') is None
+
+    def test_get_type_from_module_import_types(self) -> None:
+        type_string = 'tests.test_utilities.not_imported.NotImported'
+        assert 'tests.test_utilities.not_imported' not in sys.modules
+
+        previous = get_symbol_index()
+        set_symbol_index(SymbolIndex(import_modules=False))
+        get_type_cache().clear_modules()
+        try:
+            get_type_from_module(type_string, THIS)
+            assert False, 'Expected UnknownTypeException'
+        except UnknownTypeException as e:
+            assert 'without importing modules' in str(e)
+        finally:
+            set_symbol_index(previous)
+            get_type_cache().clear_modules()
+        assert 'tests.test_utilities.not_imported' not in sys.modules
+
+        result = get_type_from_module(type_string, THIS)
+        assert result.type is sys.modules['tests.test_utilities.not_imported'].NotImported
+        assert result.method == 'locate'
+
+    def test_get_module_name(self) -> None:
+        assert get_module_name('pydoctest/parsers/parser.py') == 'pydoctest.parsers.parser'
+        assert get_module_name('tests/test_parsers/google_class.py') == 'tests.test_parsers.google_class'
+        assert get_module_name('tests/test_utilities/example_class.py') == 'example_class'
+        assert get_module_name('pydoctest/parsers/__init__.py') == 'pydoctest.parsers'
+        assert get_module_name('setup.py') == 'setup'
+
     def test_get_exceptions_raised(self) -> None:
         actual_exceptions = get_exceptions_raised(tests.test_utilities.example_class.ExampleClass.func_with_raise, tests.test_utilities.example_class)
         expected_exceptions = [ 'RuntimeError', 'ValueError', 'IndexError' ]
@@ -54,6 +141,11 @@ class TestUtilities():
         actual_exceptions = get_exceptions_raised(tests.test_utilities.example_class.ExampleClass.func_locate, tests.test_utilities.example_class)
         assert len(actual_exceptions) == 0
 
+    def test_raises_without_source(self) -> None:
+        namespace: dict = {}
+        exec("def no_source():\n    raise ValueError()\n", namespace)
+        assert get_exceptions_raised(namespace['no_source'], tests.test_utilities.example_class) == []
+
     def test_global_func_raises(self) -> None:
         actual_exceptions = get_exceptions_raised(tests.test_utilities.example_class.global_func_raises, tests.test_utilities.example_class)
         expected_exceptions = [ 'RuntimeError', 'ValueError', 'IndexError' ]
@@ -104,19 +196,43 @@ class TestUtilities():
         assert is_excluded_function("test_functionTestClass", ["*st_fu*"])
         assert not is_excluded_function("TestClass", ["CrestClass"])
 
-    def test_dedent_from_first(self) -> None:
-        """
-        Tests the dedent_from_first function with different inputs.
-        """
-        assert "def test():\n    print('hello')" == dedent_from_first("    def test():\n        print('hello')")
-        assert "def test():\n    print('hello')" == dedent_from_first("            def test():\n                print('hello')")
-        assert "def test():\n\tprint('hello')" == dedent_from_first("\tdef test():\n\t\tprint('hello')")
-        assert "def test():\n\tprint('hello')" == dedent_from_first("\t\t\tdef test():\n\t\t\t\tprint('hello')")
-
-        # If already indented, should return input
-        assert "def test():\n\tprint('hello')" == dedent_from_first("def test():\n\tprint('hello')")
-
-        # Check single-line functions
-        assert "def test(): print('hello')" == dedent_from_first("def test(): print('hello')")
-        assert "def test(): print('hello')" == dedent_from_first("    def test(): print('hello')")
-        assert "def test(): print('hello')" == dedent_from_first("\tdef test(): print('hello')")
+    def test_get_type_paths(self) -> None:
+        from typing import Dict, List, Optional
+        example_path = tests.test_utilities.example_class.__file__
+        assert get_type_paths([int, str, type(None)]) == []
+        assert get_type_paths([tests.test_utilities.example_class.ExampleClass]) == [example_path]
+        # Union is defined in typing, so only check the types are found
+        assert example_path in get_type_paths([Optional[List[Dict[str, tests.test_utilities.example_class.ExampleClass]]]])
+
+    def test_restore_modules(self) -> None:
+        import json
+        assert is_shared_module(sys)
+        assert is_shared_module(json)
+        assert not is_shared_module(tests.test_utilities.example_class)
+
+        snapshot = set(sys.modules.keys())
+        for name in [ 'restored_package', 'restored_package.child', 'kept_package', 'kept_package.child' ]:
+            module = ModuleType(name)
+            module.__file__ = os.path.join('restored', name.replace('.', os.sep) + '.py')
+            sys.modules[name] = module
+        restored_package = sys.modules['restored_package']
+        kept_package = sys.modules['kept_package']
+        setattr(kept_package, 'child', sys.modules['kept_package.child'])
+        try:
+            assert sorted(restore_modules(snapshot, { 'kept_package' })) == [ 'restored_package', 'restored_package.child' ]
+            assert 'restored_package' not in sys.modules
+            assert sys.modules['kept_package'] is kept_package
+            assert 'kept_package.child' in sys.modules
+
+            # Removed submodules are unbound from packages that are kept
+            snapshot = set(sys.modules.keys()) | { 'restored_package' }
+            sys.modules['restored_package'] = restored_package
+            child = ModuleType('restored_package.child')
+            child.__file__ = os.path.join('restored', 'restored_package', 'child.py')
+            sys.modules['restored_package.child'] = child
+            setattr(restored_package, 'child', child)
+            assert restore_modules(snapshot, set()) == [ 'restored_package.child' ]
+            assert not hasattr(restored_package, 'child')
+        finally:
+            for name in [ 'restored_package', 'restored_package.child', 'kept_package', 'kept_package.child' ]:
+                sys.modules.pop(name, None)
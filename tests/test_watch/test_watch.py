@@ -0,0 +1,146 @@
+import os
+import sys
+import shutil
+import tempfile
+
+from typing import List, Optional, Set
+
+import pytest
+
+import pydoctest.main
+from pydoctest.configuration import Configuration
+from pydoctest.main import PyDoctestService
+from pydoctest.validation import ResultType, ValidationResult
+from pydoctest.watch import FileWatcher, InotifyFileWatcher, PollingFileWatcher, WatchSession, wait_for_changes
+
+
+class RecordingService(PyDoctestService):
+    def __init__(self, config: Configuration) -> None:
+        super().__init__(config)
+        self.validated: List[List[str]] = []
+
+    def validate(self, modules: Optional[List[str]] = None) -> ValidationResult:
+        self.validated.append(sorted(os.path.basename(m) for m in modules or []))
+        return super().validate(modules)
+
+
+class FakeWatcher(FileWatcher):
+    def __init__(self, bursts: List[Set[str]]) -> None:
+        self.bursts = bursts
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        return self.bursts.pop(0) if self.bursts else set()
+
+
+def write(path: str, content: str) -> None:
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+FUNCTION = "from payload import Payload\n\n\ndef consume(payload: Payload) -> None:\n    \"\"\"Consumes the payload.\n\n    Args:\n        payload (Payload): The payload.\n    \"\"\"\n    pass\n"
+
+
+class TestWatchSession():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        write(os.path.join(self.directory, "payload.py"), "class Payload():\n    pass\n")
+        write(os.path.join(self.directory, "consumer.py"), FUNCTION)
+        write(os.path.join(self.directory, "other.py"), "def other() -> None:\n    \"\"\"Does nothing.\n    \"\"\"\n    pass\n")
+        sys.path.insert(0, self.directory)
+
+    def teardown_method(self) -> None:
+        sys.path.remove(self.directory)
+        sys.modules.pop("payload", None)
+        shutil.rmtree(self.directory)
+
+    def get_session(self) -> WatchSession:
+        config = Configuration.get_default_configuration(self.directory)
+        config.cache = False
+        self.service = RecordingService(config)
+        return WatchSession(self.service)
+
+    def test_changed_module_and_dependents_are_validated(self) -> None:
+        session = self.get_session()
+        result = session.validate()
+        assert result is not None and result.result == ResultType.OK
+        assert self.service.validated == [["consumer.py", "other.py", "payload.py"]]
+
+        # The consumer imports the payload, so it is validated again
+        payload_path = os.path.join(self.directory, "payload.py")
+        write(payload_path, "class Other():\n    pass\n")
+        result = session.validate({ payload_path })
+        assert self.service.validated[-1] == ["consumer.py", "payload.py"]
+        assert result is not None and result.result == ResultType.FAILED
+        assert len(result.module_results) == 3
+
+    def test_validated_serially(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def validate_modules_in_parallel(*args: object) -> None:
+            raise AssertionError("Validated in parallel")
+
+        monkeypatch.setattr(pydoctest.main, 'validate_modules_in_parallel', validate_modules_in_parallel)
+        config = Configuration.get_default_configuration(self.directory)
+        config.cache = False
+        config.jobs = 4
+        result = WatchSession(PyDoctestService(config)).validate()
+        assert result is not None and result.result == ResultType.OK
+
+    def test_unrelated_changes_are_ignored(self) -> None:
+        session = self.get_session()
+        session.validate()
+        assert session.validate({ os.path.join(self.directory, "not_a_module.txt") }) is None
+        assert len(self.service.validated) == 1
+
+    def test_created_and_removed_modules(self) -> None:
+        session = self.get_session()
+        session.validate()
+
+        created_path = os.path.join(self.directory, "created.py")
+        write(created_path, "def created() -> None:\n    pass\n")
+        os.remove(os.path.join(self.directory, "other.py"))
+        result = session.validate({ created_path, os.path.join(self.directory, "other.py") })
+        assert self.service.validated[-1] == ["created.py"]
+        assert result is not None
+        assert sorted(os.path.basename(r.module_path) for r in result.module_results) == ["consumer.py", "created.py", "payload.py"]
+
+
+class TestFileWatchers():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.module_path = os.path.join(self.directory, "module.py")
+        write(self.module_path, "")
+
+    def teardown_method(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_polling(self) -> None:
+        watcher = PollingFileWatcher(self.directory, interval=0.01)
+        assert watcher.wait(0.02) == set()
+
+        write(self.module_path, "x = 1\n")
+        write(os.path.join(self.directory, "notes.txt"), "")
+        assert watcher.wait(1) == { self.module_path }
+
+        os.remove(self.module_path)
+        assert watcher.wait(1) == { self.module_path }
+
+    @pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify is only available on Linux")
+    def test_inotify(self) -> None:
+        watcher = InotifyFileWatcher(self.directory)
+        try:
+            assert watcher.wait(0.01) == set()
+
+            write(self.module_path, "x = 1\n")
+            assert watcher.wait(1) == { self.module_path }
+
+            # Files in created directories are watched too
+            os.makedirs(os.path.join(self.directory, "package"))
+            nested_path = os.path.join(self.directory, "package", "nested.py")
+            write(nested_path, "")
+            changed = wait_for_changes(watcher, debounce=0.1)
+            assert changed == { nested_path }
+        finally:
+            watcher.close()
+
+    def test_debounce(self) -> None:
+        watcher = FakeWatcher([{ "a.py" }, { "b.py" }, { "a.py", "c.py" }])
+        assert wait_for_changes(watcher, debounce=0) == { "a.py", "b.py", "c.py" }
@@ -0,0 +1,92 @@
+import os
+import sys
+import shutil
+import signal
+import tempfile
+import threading
+
+from typing import List
+
+from pydoctest.configuration import Configuration
+from pydoctest.main import PyDoctestService
+from pydoctest.validation import ModuleValidationResult, ResultType
+from pydoctest.watchdog import can_interrupt, run_with_timeout
+
+
+class TestModuleTimeout():
+    def setup_method(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        for name, content in [ ('blocking', BLOCKING_MODULE), ('valid', VALID_MODULE) ]:
+            with open(os.path.join(self.directory, f'{name}.py'), 'w') as f:
+                f.write(content)
+
+    def teardown_method(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def get_config(self, jobs: int) -> Configuration:
+        config = Configuration.get_default_configuration(self.directory)
+        config.cache = False
+        config.jobs = jobs
+        config.module_timeout = 0.5
+        return config
+
+    def validate(self, jobs: int) -> List[ModuleValidationResult]:
+        result = PyDoctestService(self.get_config(jobs)).validate()
+        return sorted(result.module_results, key=lambda m: m.module_path)
+
+    def test_serial_timeout(self) -> None:
+        blocking, valid = self.validate(1)
+        assert blocking.result == ResultType.FAILED
+        assert "Timed out after 0.5" in blocking.fail_reason
+        assert "module timeout of 0.5 seconds" in blocking.fail_reason
+        assert valid.function_results[0].result == ResultType.OK
+        # The partially executed module is not kept, and the timer is stopped
+        assert 'blocking' not in sys.modules
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+    def test_parallel_timeout(self) -> None:
+        blocking, valid = self.validate(2)
+        assert blocking.result == ResultType.FAILED
+        assert "module timeout of 0.5 seconds" in blocking.fail_reason
+        assert valid.function_results[0].result == ResultType.OK
+
+    def test_timer_stopped_after_validating(self) -> None:
+        previous_handler = signal.getsignal(signal.SIGALRM)
+        result = ModuleValidationResult('module.py')
+        assert run_with_timeout('module.py', 5, lambda: result) is result
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        assert signal.getsignal(signal.SIGALRM) is previous_handler
+
+    def test_timeout_not_enforced_outside_main_thread(self) -> None:
+        results: List[ModuleValidationResult] = []
+        result = ModuleValidationResult('module.py')
+
+        def run() -> None:
+            assert not can_interrupt()
+            results.append(run_with_timeout('module.py', 0.1, lambda: result))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        assert results == [ result ]
+
+
+BLOCKING_MODULE = """
+import time
+
+while True:
+    time.sleep(0.05)
+"""
+
+VALID_MODULE = """
+def get_value(value: int) -> int:
+    \"\"\"Returns the value.
+
+    Args:
+        value (int): The value.
+
+    Returns:
+        int: The value.
+    \"\"\"
+    return value
+"""